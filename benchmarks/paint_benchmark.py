@@ -0,0 +1,373 @@
+"""
+PixelBox
+Copyright (C) 2025 Travis L. Seymour, PhD
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+Paint-path benchmarks for the overlay, run under the offscreen Qt platform (no display needed).
+
+    python benchmarks/paint_benchmark.py --out results.json
+    python benchmarks/paint_benchmark.py --quick --compare results.json
+
+Each device pixel ratio runs in its own process, since a screen's ratio is fixed once QApplication exists.
+Every (workload, box count, DPR) combination reports paintEvent time percentiles from a timing pass, and
+Python allocations per frame (tracemalloc) from a separate, shorter pass so tracing never skews the timings.
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+# Run from a checkout without installing: make the repo's pixelbox package importable.
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+SCHEMA_VERSION = 1
+DEFAULT_BOX_COUNTS = [1, 100, 1_000, 10_000, 100_000]
+QUICK_BOX_COUNTS = [1, 1_000, 10_000]
+DEFAULT_DPRS = [1.0, 1.5, 2.0]
+DEFAULT_FRAMES = 240
+ALLOCATION_FRAMES = 30
+FULL_FRAME_REPEATS = 3
+# Logical size of the benchmark screen.
+SCREEN_WIDTH, SCREEN_HEIGHT = 1920, 1080
+# A p95 this much slower than the baseline is reported as a regression.
+DEFAULT_REGRESSION_RATIO = 1.15
+
+WORKLOADS = {
+    "populate": "add_box for every box (one sample: total ms, not a paint)",
+    "full_frame": "rebuild the retained box layer and paint the whole overlay",
+    "drag": "continuous drag of a live box across the finalized boxes",
+    "drag_top_edge": "drag along the top edge, over boxes near the top, so labels take the below-box branch",
+}
+
+
+def percentiles(samples: List[float]) -> Dict[str, float]:
+    ordered = sorted(samples)
+
+    def rank(p: float) -> float:
+        return ordered[min(len(ordered) - 1, int(len(ordered) * p))]
+
+    return {
+        "count": len(ordered),
+        "mean": sum(ordered) / len(ordered),
+        "p50": rank(0.50),
+        "p90": rank(0.90),
+        "p95": rank(0.95),
+        "p99": rank(0.99),
+        "max": ordered[-1],
+    }
+
+
+class FrameRecorder:
+    """Installed as OverlayWindow.paint_timer; records how long each paintEvent takes, in ms."""
+
+    def __init__(self):
+        self.samples: List[float] = []
+        self._started: float = 0.0
+
+    def __enter__(self):
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.samples.append((time.perf_counter() - self._started) * 1000.0)
+        return False
+
+
+def random_boxes(count: int, seed: int, top_edge: bool = False) -> List[Tuple[int, int, int, int]]:
+    rng = random.Random(seed)
+    boxes = []
+    for _ in range(count):
+        width, height = rng.randint(8, 160), rng.randint(8, 120)
+        x = rng.randint(0, SCREEN_WIDTH - width - 1)
+        # Boxes starting within a label's height of the top put their labels below instead of above.
+        y = rng.randint(0, 12) if top_edge else rng.randint(0, SCREEN_HEIGHT - height - 1)
+        boxes.append((x, y, width, height))
+    return boxes
+
+
+def drag_path(frames: int, top_edge: bool) -> List[Tuple[int, int]]:
+    """Pointer positions for a drag that sweeps right and down (or right along the top edge) and back."""
+    points = []
+    for i in range(frames):
+        t = i / max(1, frames - 1)
+        sweep = 1.0 - abs(2.0 * t - 1.0)  # out and back
+        x = 40 + int(sweep * (SCREEN_WIDTH - 120))
+        y = 30 if top_edge else 40 + int(sweep * (SCREEN_HEIGHT - 120))
+        points.append((x, y))
+    return points
+
+
+def run_child(dpr: float, box_counts: List[int], frames: int) -> List[Dict]:
+    """Runs every workload at one device pixel ratio. Must be the only QApplication in this process."""
+    import pixelbox.main as pixelbox_main
+
+    # pixelbox.main selects the xcb platform when imported on Linux; the benchmark always runs offscreen.
+    os.environ["QT_QPA_PLATFORM"] = os.environ["PIXELBOX_BENCH_PLATFORM"]
+    from PySide6.QtCore import QPoint, QRect
+    from PySide6.QtGui import QColor, QFont, QImage
+    from PySide6.QtWidgets import QApplication
+
+    app = QApplication(["pixelbox-benchmark"])
+    app.setFont(QFont("sans-serif", 14))
+    tool_window = pixelbox_main.ToolWindow()
+    overlay = tool_window.overlay_window
+    # Screen captures (for snapping) aren't part of the paint path; give the loupe a fixed capture instead.
+    overlay.set_snap_to_edges(False)
+    capture = QImage(int(SCREEN_WIDTH * dpr), int(SCREEN_HEIGHT * dpr), QImage.Format.Format_RGB32)
+    capture.fill(QColor(40, 80, 120))
+    capture.setDevicePixelRatio(dpr)
+    app.processEvents()
+    overlay.loupe.set_image(capture)
+
+    results = []
+
+    def record(workload: str, boxes: int, samples: List[float], allocations: Optional[Dict] = None):
+        results.append(
+            {
+                "workload": workload,
+                "boxes": boxes,
+                "dpr": dpr,
+                "paint_ms": percentiles(samples),
+                "python_allocations": allocations,
+            }
+        )
+
+    def paint_full_frame():
+        overlay.box_layer = None
+        overlay.repaint()
+
+    def drag(points: List[Tuple[int, int]]):
+        overlay.drawing = True
+        overlay.start_point = QPoint(*points[0])
+        for x, y in points:
+            overlay.current_point = QPoint(x, y)
+            overlay.update_live_box()
+            app.processEvents()
+        overlay.drawing = False
+        overlay.start_point = overlay.current_point = None
+        overlay.update_live_box()
+        app.processEvents()
+
+    def measure(frame_count: int, run_frames) -> Tuple[List[float], Dict]:
+        recorder = FrameRecorder()
+        overlay.paint_timer = recorder
+        run_frames(frame_count)
+        samples = recorder.samples
+
+        # Separate pass for allocations: tracemalloc makes every Python allocation slower.
+        recorder = FrameRecorder()
+        overlay.paint_timer = recorder
+        tracemalloc.start()
+        before = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+        run_frames(min(frame_count, ALLOCATION_FRAMES))
+        current, peak = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot()
+        tracemalloc.stop()
+        overlay.paint_timer = None
+        painted = max(1, len(recorder.samples))
+        stats = after.compare_to(before, "filename")
+        allocations = {
+            "frames": len(recorder.samples),
+            "net_bytes_per_frame": sum(stat.size_diff for stat in stats) / painted,
+            "net_blocks_per_frame": sum(stat.count_diff for stat in stats) / painted,
+            "peak_bytes": peak,
+        }
+        return samples, allocations
+
+    for count in box_counts:
+        for workload in ("drag", "drag_top_edge"):
+            top_edge = workload == "drag_top_edge"
+            overlay.clear_all_boxes()
+            app.processEvents()
+
+            started = time.perf_counter()
+            for x, y, w, h in random_boxes(count, seed=count, top_edge=top_edge):
+                overlay.add_box(QRect(x, y, w, h))
+            if not top_edge:
+                record("populate", count, [(time.perf_counter() - started) * 1000.0])
+                samples, allocations = measure(FULL_FRAME_REPEATS, lambda n: [paint_full_frame() for _ in range(n)])
+                record("full_frame", count, samples, allocations)
+            else:
+                paint_full_frame()
+
+            samples, allocations = measure(frames, lambda n: drag(drag_path(n, top_edge)))
+            record(workload, count, samples, allocations)
+            p50 = results[-1]["paint_ms"]["p50"]
+            print(f"  dpr {dpr:g}, {count} boxes, {workload}: p50 {p50:.3f} ms", file=sys.stderr)
+
+    tool_window.close()
+    return results
+
+
+def offscreen_platform(dpr: float, directory: str) -> str:
+    """QT_QPA_PLATFORM value for a single offscreen screen of the benchmark size at the given ratio."""
+    config = Path(directory) / f"screen-{dpr:g}.json"
+    screen = {
+        "name": "benchmark",
+        "x": 0,
+        "y": 0,
+        "width": SCREEN_WIDTH,
+        "height": SCREEN_HEIGHT,
+        "logicalDpi": 96,
+        "logicalBaseDpi": 96,
+        "dpr": dpr,
+    }
+    config.write_text(json.dumps({"synchronousWindowSystemEvents": True, "screens": [screen]}))
+    return f"offscreen:configfile={config}"
+
+
+def environment() -> Dict[str, object]:
+    import PySide6
+    from PySide6.QtCore import qVersion
+
+    from pixelbox.version import get_version
+
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=Path(__file__).resolve().parent,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = ""
+    return {
+        "pixelbox": get_version(),
+        "git_commit": commit,
+        "python": platform.python_version(),
+        "pyside6": PySide6.__version__,
+        "qt": qVersion(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def run_all(dprs: List[float], box_counts: List[int], frames: int) -> Dict[str, object]:
+    results = []
+    processes = []
+    with tempfile.TemporaryDirectory() as directory:
+        for dpr in dprs:
+            env = dict(os.environ, PIXELBOX_BENCH_PLATFORM=offscreen_platform(dpr, directory))
+            command = [sys.executable, __file__, "--child", "--dpr", str(dpr), "--frames", str(frames), "--boxes"]
+            child = subprocess.run(
+                command + [str(count) for count in box_counts], env=env, capture_output=True, text=True
+            )
+            sys.stderr.write(child.stderr)
+            if child.returncode != 0:
+                raise SystemExit(f"Benchmark at DPR {dpr:g} failed (exit code {child.returncode}).")
+            output = json.loads(child.stdout)
+            results.extend(output["results"])
+            processes.append({"dpr": dpr, "max_rss_kib": output["max_rss_kib"]})
+    return {
+        "schema": SCHEMA_VERSION,
+        "created": datetime.now(timezone.utc).isoformat(),
+        "environment": environment(),
+        "settings": {
+            "screen": [SCREEN_WIDTH, SCREEN_HEIGHT],
+            "frames": frames,
+            "allocation_frames": ALLOCATION_FRAMES,
+            "full_frame_repeats": FULL_FRAME_REPEATS,
+        },
+        "workloads": WORKLOADS,
+        "processes": processes,
+        "results": results,
+    }
+
+
+def result_key(result: Dict) -> Tuple[str, int, float]:
+    return result["workload"], result["boxes"], result["dpr"]
+
+
+def format_results(run: Dict, baseline: Optional[Dict] = None, regression_ratio: float = DEFAULT_REGRESSION_RATIO):
+    """A table of p50/p95/max per result, with the p95 ratio to the baseline's matching result if given."""
+    previous = {result_key(result): result for result in (baseline or {}).get("results", [])}
+    header = f"{'workload':<15}{'boxes':>8}{'dpr':>6}{'p50 ms':>10}{'p95 ms':>10}{'max ms':>10}{'KiB/frame':>11}"
+    lines = [header + (f"{'p95 vs base':>13}" if baseline else "")]
+    regressions = 0
+    for result in run["results"]:
+        paint = result["paint_ms"]
+        allocations = result.get("python_allocations") or {}
+        kib = allocations.get("net_bytes_per_frame")
+        line = (
+            f"{result['workload']:<15}{result['boxes']:>8}{result['dpr']:>6g}{paint['p50']:>10.3f}"
+            f"{paint['p95']:>10.3f}{paint['max']:>10.3f}{'' if kib is None else f'{kib / 1024:.2f}':>11}"
+        )
+        old = previous.get(result_key(result))
+        if old is not None and old["paint_ms"]["p95"] > 0:
+            ratio = paint["p95"] / old["paint_ms"]["p95"]
+            flag = " slower" if ratio > regression_ratio else ""
+            regressions += bool(flag)
+            line += f"{ratio:>12.2f}x{flag}"
+        lines.append(line)
+    return "\n".join(lines), regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the PixelBox overlay paint path (offscreen).")
+    parser.add_argument("--boxes", type=int, nargs="+", help=f"finalized box counts (default {DEFAULT_BOX_COUNTS})")
+    parser.add_argument("--dpr", type=float, nargs="+", default=DEFAULT_DPRS, help="device pixel ratios")
+    parser.add_argument("--frames", type=int, default=DEFAULT_FRAMES, help="frames per drag workload")
+    parser.add_argument("--quick", action="store_true", help=f"fewer boxes {QUICK_BOX_COUNTS} and frames")
+    parser.add_argument("--out", help="write results as JSON to this file")
+    parser.add_argument("--compare", metavar="BASELINE", help="JSON results of an earlier run to compare against")
+    parser.add_argument(
+        "--fail-above",
+        type=float,
+        metavar="RATIO",
+        help="exit with status 1 if any p95 is more than RATIO times the baseline's",
+    )
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    box_counts = args.boxes or (QUICK_BOX_COUNTS if args.quick else DEFAULT_BOX_COUNTS)
+    frames = min(args.frames, 60) if args.quick else args.frames
+
+    if args.child:
+        results = run_child(args.dpr[0], box_counts, frames)
+        try:
+            import resource
+
+            max_rss_kib = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        except ImportError:  # Windows
+            max_rss_kib = None
+        json.dump({"results": results, "max_rss_kib": max_rss_kib}, sys.stdout)
+        sys.stdout.flush()
+        os._exit(0)  # Skip Qt teardown; nothing is left to clean up.
+
+    run = run_all(args.dpr, box_counts, frames)
+    if args.out:
+        Path(args.out).write_text(json.dumps(run, indent=2))
+    baseline = json.loads(Path(args.compare).read_text()) if args.compare else None
+    table, regressions = format_results(run, baseline, args.fail_above or DEFAULT_REGRESSION_RATIO)
+    print(table)
+    if args.fail_above and regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""
+PixelBox
+Copyright (C) 2025 Travis L. Seymour, PhD
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import glob
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# (x, y, width, height) in image pixels
+Box = Tuple[int, int, int, int]
+
+# Same font the overlay uses (main() sets it as the application font).
+ANNOTATION_FONT = ("sans-serif", 14)
+
+# Set in each worker process by _init_worker.
+_app = None
+_renderer = None
+
+
+def expand_inputs(patterns: Sequence[str]) -> List[Path]:
+    """Input files, expanding any glob patterns the shell didn't (e.g. quoted, or on Windows)."""
+    paths: List[Path] = []
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern)) if glob.has_magic(pattern) else [pattern]
+        paths.extend(Path(match) for match in matches)
+    return paths
+
+
+def box_from_record(record) -> Box:
+    """A box from a [x, y, w, h] list or a measurement export record, preferring its device-pixel geometry."""
+    if isinstance(record, (list, tuple)):
+        x, y, w, h = record
+        return int(x), int(y), int(w), int(h)
+    if "device_x" in record:
+        return record["device_x"], record["device_y"], record["device_width"], record["device_height"]
+    return record["x"], record["y"], record["width"], record["height"]
+
+
+def load_rects(rects_file: str) -> Tuple[List[Box], Dict[str, List[Box]]]:
+    """
+    Reads the boxes to draw. Either a list (drawn on every image; a JSON measurement export works as is), or an
+    object mapping image file names to their own lists, with an optional "*" entry drawn on every image.
+    """
+    with open(rects_file, encoding="utf-8") as stream:
+        data = json.load(stream)
+    if isinstance(data, list):
+        return [box_from_record(record) for record in data], {}
+    shared = [box_from_record(record) for record in data.get("*", [])]
+    per_image = {name: [box_from_record(record) for record in records] for name, records in data.items() if name != "*"}
+    return shared, per_image
+
+
+def _init_worker():
+    global _app, _renderer
+    # Importing pixelbox.main (which spawn does when it is the parent's entry point) selects xcb; undo that.
+    os.environ["QT_QPA_PLATFORM"] = "offscreen"
+    from PySide6.QtGui import QFont, QGuiApplication
+
+    from pixelbox.render import BoxRenderer
+
+    _app = QGuiApplication.instance() or QGuiApplication(["pixelbox-annotate"])
+    _renderer = BoxRenderer(QFont(*ANNOTATION_FONT))
+
+
+def annotate_file(in_path: str, out_path: str, boxes: List[Box]) -> Tuple[str, str]:
+    """Draws boxes onto one image and saves it. Returns (in_path, error message or "")."""
+    from PySide6.QtCore import QRect
+    from PySide6.QtGui import QImage
+
+    image = QImage(in_path)
+    if image.isNull():
+        return in_path, "unreadable image"
+    if image.format() not in (QImage.Format.Format_ARGB32_Premultiplied, QImage.Format.Format_RGB32):
+        # QPainter can't paint on indexed or grayscale images; these two are also its fastest targets.
+        image = image.convertToFormat(
+            QImage.Format.Format_ARGB32_Premultiplied if image.hasAlphaChannel() else QImage.Format.Format_RGB32
+        )
+    painter = _renderer.painter(image)
+    for x, y, w, h in boxes:
+        _renderer.draw_box(painter, QRect(x, y, w, h))
+    painter.end()
+    if not image.save(out_path):
+        return in_path, f"unable to write '{out_path}'"
+    return in_path, ""
+
+
+def _annotate_job(job: Tuple[str, str, List[Box]]) -> Tuple[str, str]:
+    try:
+        return annotate_file(*job)
+    except Exception as e:
+        return job[0], str(e) or e.__class__.__name__
+
+
+def annotate_images(inputs: Sequence[str], rects_file: str, out_dir: str, workers: Optional[int] = None) -> int:
+    """
+    Annotates every input image with the boxes from rects_file, writing same-named files to out_dir.
+    Files are spread over a pool of worker processes, each with its own offscreen QGuiApplication, and
+    handed out in chunks so thousands of small images don't cost one round trip each.
+    Returns the number of images that failed.
+    """
+    paths = expand_inputs(inputs)
+    shared, per_image = load_rects(rects_file)
+    out = Path(out_dir)
+    out.mkdir(parents=True, exist_ok=True)
+    jobs = [(str(path), str(out / path.name), shared + per_image.get(path.name, [])) for path in paths]
+    if not jobs:
+        print("No input images.")
+        return 0
+
+    workers = max(1, min(workers or os.cpu_count() or 1, len(jobs)))
+    chunk_size = max(1, len(jobs) // (workers * 4))
+    # Workers are started fresh rather than forked from a process that has loaded Qt.
+    started = time.perf_counter()
+    failures = 0
+    with ProcessPoolExecutor(
+        max_workers=workers, mp_context=multiprocessing.get_context("spawn"), initializer=_init_worker
+    ) as pool:
+        for in_path, error in pool.map(_annotate_job, jobs, chunksize=chunk_size):
+            if error:
+                failures += 1
+                print(f"{in_path}: {error}")
+    elapsed = time.perf_counter() - started
+    print(f"Annotated {len(jobs) - failures} of {len(jobs)} images into '{out}' ({workers} workers, {elapsed:.2f}s).")
+    return failures
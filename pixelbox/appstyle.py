@@ -16,11 +16,9 @@ You should have received a copy of the GNU General Public License
 along with this program.  If not, see <https://www.gnu.org/licenses/>.
 """
 
-import qdarkstyle
 from PySide6.QtCore import QSize
-from PySide6.QtGui import QPalette, QColor, QGuiApplication
+from PySide6.QtGui import QPalette, QColor, QGuiApplication, QFont
 from typing import Literal
-from qtpy.QtGui import QFont
 
 
 def set_light_style(app_instance):
@@ -42,6 +40,9 @@ def set_light_style(app_instance):
 
 
 def set_dark_style(app_instance):
+    # qdarkstyle (and the qtpy shim it loads) is only imported when the dark style is actually used.
+    import qdarkstyle
+
     app_instance.setStyleSheet(qdarkstyle.load_stylesheet())
 
 
@@ -0,0 +1,183 @@
+"""
+PixelBox
+Copyright (C) 2025 Travis L. Seymour, PhD
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import struct
+from array import array
+from typing import BinaryIO, Iterator, Optional, Tuple
+
+from PySide6.QtCore import QRect
+
+# Box changes, as the session journal records them (journal record types; 1 is the journal's SCREEN).
+ADD, UNDO, REDO, CLEAR = range(2, 6)
+
+# Undo/redo stack entry for an appended box; a clear is recorded as the first key that was live before it (>= 0).
+ADDED = -1
+
+# Serialized layout (see write_to): start, end, column length, undo depth, redo depth; then the five columns and
+#  the two stacks, as raw arrays in native byte order.
+_STATE = struct.Struct("<5q")
+
+
+class BoxStore:
+    """
+    The finalized boxes of one overlay, stored column-wise: four int arrays for the logical geometry and a
+    double array of creation times (seconds since the epoch): 24 bytes per box, plus 8 for its undo entry.
+
+    Boxes are identified by stable integer keys (their position in the arrays). The live boxes are always
+    the contiguous key range [start, end); everything else in the arrays is kept only for undo or redo:
+      - undoing an append moves end back one, leaving the box in place for redo;
+      - clearing moves start up to end, leaving the old boxes in place for undo.
+    So append, undo, redo and clear are all O(1). A new append drops whatever was waiting to be redone.
+    """
+
+    def __init__(self):
+        self.x = array("i")
+        self.y = array("i")
+        self.w = array("i")
+        self.h = array("i")
+        self.created = array("d")
+        self.start: int = 0
+        self.end: int = 0
+        self._undo = array("q")
+        self._redo = array("q")
+
+    def __len__(self) -> int:
+        return self.end - self.start
+
+    def __contains__(self, key: int) -> bool:
+        return self.start <= key < self.end
+
+    def keys(self) -> range:
+        return range(self.start, self.end)
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes used by the columns and undo/redo stacks, including boxes kept for undo/redo."""
+        columns = (self.x, self.y, self.w, self.h, self.created, self._undo, self._redo)
+        return sum(len(column) * column.itemsize for column in columns)
+
+    def append(self, rect: QRect, created: float) -> int:
+        """Adds a box and returns its key."""
+        return self.append_geometry(rect.x(), rect.y(), rect.width(), rect.height(), created)
+
+    def append_geometry(self, x: int, y: int, w: int, h: int, created: float) -> int:
+        if len(self.x) > self.end:
+            # Boxes waiting to be redone are abandoned once something new is drawn.
+            for column in (self.x, self.y, self.w, self.h, self.created):
+                del column[self.end :]
+        del self._redo[:]
+        self.x.append(x)
+        self.y.append(y)
+        self.w.append(w)
+        self.h.append(h)
+        self.created.append(created)
+        self.end += 1
+        self._undo.append(ADDED)
+        return self.end - 1
+
+    def clear(self) -> range:
+        """Removes every box, undoably. Returns the keys that were removed."""
+        removed = self.keys()
+        if removed:
+            del self._redo[:]
+            self._undo.append(self.start)
+            self.start = self.end
+        return removed
+
+    @property
+    def can_undo(self) -> bool:
+        return bool(self._undo)
+
+    @property
+    def can_redo(self) -> bool:
+        return bool(self._redo)
+
+    def undo(self) -> Optional[Tuple[range, range]]:
+        """Reverts the last append or clear. Returns (keys removed, keys restored), or None if there's nothing."""
+        if not self._undo:
+            return None
+        operation = self._undo.pop()
+        self._redo.append(operation)
+        if operation == ADDED:
+            self.end -= 1
+            return range(self.end, self.end + 1), range(0)
+        self.start = operation
+        return range(0), self.keys()
+
+    def redo(self) -> Optional[Tuple[range, range]]:
+        """Re-applies the last undone append or clear. Returns (keys removed, keys restored), or None."""
+        if not self._redo:
+            return None
+        operation = self._redo.pop()
+        self._undo.append(operation)
+        if operation == ADDED:
+            self.end += 1
+            return range(0), range(self.end - 1, self.end)
+        removed = self.keys()
+        self.start = self.end
+        return removed, range(0)
+
+    def geometry(self, key: int) -> Tuple[int, int, int, int]:
+        return self.x[key], self.y[key], self.w[key], self.h[key]
+
+    def rect(self, key: int) -> QRect:
+        return QRect(self.x[key], self.y[key], self.w[key], self.h[key])
+
+    def last_key(self) -> Optional[int]:
+        return self.end - 1 if self.end > self.start else None
+
+    def items(self) -> Iterator[Tuple[int, int, int, int, int, float]]:
+        """(key, x, y, w, h, created) for every live box, in the order they were drawn; no QRects are made."""
+        x, y, w, h, created = self.x, self.y, self.w, self.h, self.created
+        for key in range(self.start, self.end):
+            yield key, x[key], y[key], w[key], h[key], created[key]
+
+    def live_columns(self) -> Tuple[array, array, array, array, array]:
+        """Copies of the x, y, w, h and created columns of the live boxes (one memcpy each)."""
+        return tuple(column[self.start : self.end] for column in (self.x, self.y, self.w, self.h, self.created))
+
+    def rects(self, keys: Optional[range] = None) -> Iterator[QRect]:
+        for key in self.keys() if keys is None else keys:
+            yield self.rect(key)
+
+    def copy(self) -> "BoxStore":
+        """An independent copy, history included (the columns are copied with one memcpy each)."""
+        store = BoxStore()
+        for name in ("x", "y", "w", "h", "created", "_undo", "_redo"):
+            setattr(store, name, getattr(self, name)[:])
+        store.start, store.end = self.start, self.end
+        return store
+
+    def write_to(self, stream: BinaryIO):
+        """Writes the whole store, history included, in the layout read_from expects."""
+        stream.write(_STATE.pack(self.start, self.end, len(self.x), len(self._undo), len(self._redo)))
+        for column in (self.x, self.y, self.w, self.h, self.created, self._undo, self._redo):
+            stream.write(column)
+
+    @classmethod
+    def read_from(cls, buffer: memoryview, offset: int = 0) -> Tuple["BoxStore", int]:
+        """Reads a store written by write_to at offset in buffer. Returns it and the offset just past it."""
+        store = cls()
+        store.start, store.end, length, undo_depth, redo_depth = _STATE.unpack_from(buffer, offset)
+        offset += _STATE.size
+        columns = (store.x, store.y, store.w, store.h, store.created, store._undo, store._redo)
+        for column, count in zip(columns, (length,) * 5 + (undo_depth, redo_depth)):
+            size = count * column.itemsize
+            column.frombytes(buffer[offset : offset + size])
+            offset += size
+        return store, offset
@@ -0,0 +1,111 @@
+"""
+PixelBox
+Copyright (C) 2025 Travis L. Seymour, PhD
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import hashlib
+from typing import Callable, Optional
+
+from PySide6.QtCore import QObject, QTimer, Qt, Signal
+from PySide6.QtGui import QImage, QScreen
+
+# Captures are fingerprinted from a thumbnail this size to tell whether the screen content changed.
+FINGERPRINT_SIZE = (96, 54)
+# Coalesces capture requests that arrive in bursts (enter, release, activation...).
+CAPTURE_DELAY_MS = 150
+# After PixelBox's own windows are concealed for a capture, how long to wait for the compositor to show the screen
+#  without them. Long enough for a frame or two; they reappear right after the grab.
+CONCEAL_DELAY_MS = 50
+
+
+def capture_screen(screen: QScreen) -> QImage:
+    """The current contents of screen, in device pixels (the image's devicePixelRatio is the screen's)."""
+    return screen.grabWindow(0).toImage()
+
+
+def image_fingerprint(image: QImage) -> bytes:
+    thumbnail = image.scaled(*FINGERPRINT_SIZE, Qt.AspectRatioMode.IgnoreAspectRatio).convertToFormat(
+        QImage.Format.Format_Grayscale8
+    )
+    return hashlib.blake2b(bytes(thumbnail.constBits()), digest_size=16).digest()
+
+
+class ScreenCapture(QObject):
+    """
+    The retained capture of the screen under one overlay. request() schedules a fresh grab (coalescing
+    bursts of requests into one); each grab replaces self.image and is announced through captured.
+    Consumers read sub-regions of self.image directly instead of grabbing the screen themselves.
+
+    A grab would include PixelBox's own boxes, labels and windows, so with conceal given, capture() calls
+    conceal(True) first, grabs CONCEAL_DELAY_MS later, then calls conceal(False). Owners only request a capture
+    when the screen may have changed (not after every box), and pause() captures while the user is drawing, so
+    nothing vanishes mid-drag.
+    """
+
+    captured = Signal(QImage)
+
+    def __init__(
+        self, screen: QScreen, parent: Optional[QObject] = None, conceal: Optional[Callable[[bool], None]] = None
+    ):
+        super().__init__(parent)
+        self.screen: QScreen = screen
+        self.image: Optional[QImage] = None
+        self.conceal: Optional[Callable[[bool], None]] = conceal
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(CAPTURE_DELAY_MS)
+        self.timer.timeout.connect(self.capture)
+        self.grab_timer = QTimer(self)
+        self.grab_timer.setSingleShot(True)
+        self.grab_timer.setInterval(CONCEAL_DELAY_MS)
+        self.grab_timer.timeout.connect(self.grab)
+        self.paused: bool = False
+        self.deferred: bool = False  # a capture came due while paused
+
+    def request(self):
+        self.timer.start()
+
+    def pause(self):
+        """Holds captures back until resume(); a grab already under way is abandoned and the windows shown again."""
+        self.paused = True
+        if self.grab_timer.isActive():
+            self.grab_timer.stop()
+            self.conceal(False)
+            self.deferred = True
+
+    def resume(self):
+        self.paused = False
+        if self.deferred:
+            self.deferred = False
+            self.request()
+
+    def capture(self):
+        if self.paused:
+            self.deferred = True
+        elif self.conceal is None:
+            self.grab()
+        elif not self.grab_timer.isActive():
+            self.conceal(True)
+            self.grab_timer.start()
+
+    def grab(self):
+        image = capture_screen(self.screen)
+        if self.conceal is not None:
+            self.conceal(False)
+        if image.isNull():
+            return
+        self.image = image
+        self.captured.emit(image)
@@ -0,0 +1,298 @@
+"""
+PixelBox
+Copyright (C) 2025 Travis L. Seymour, PhD
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import json
+import time
+from collections import deque
+from pathlib import Path
+from typing import Deque, Dict, Iterator, Optional, Tuple
+
+from PySide6.QtCore import QObject, QRect, QTimer
+from PySide6.QtNetwork import QLocalServer, QLocalSocket
+from PySide6.QtWidgets import QApplication
+
+from pixelbox.export import ImageExportJob
+from pixelbox.measurements import MEASUREMENT_WRITERS, MeasurementExportJob, MeasurementSnapshot
+from pixelbox.resident import encode_message, socket_path
+
+# A connection stops producing output while this much is still waiting to be sent, and resumes as the client
+#  reads it, so a slow client costs buffered bytes rather than GUI-thread time.
+HIGH_WATER_BYTES = 1 << 20
+# Measurement records encoded per step of a streamed reply.
+STREAM_CHUNK = 256
+# Commands that reply later or stream, which a batch can't contain.
+UNBATCHABLE = ("measurements", "export", "stop", "batch")
+# How long listen() waits for an instance already on the socket to accept a connection.
+PROBE_TIMEOUT_MS = 500
+
+
+class ControlConnection(QObject):
+    """One client. Requests are read as they arrive; replies are queued and written as the socket drains."""
+
+    def __init__(self, socket: QLocalSocket, server: "ControlServer"):
+        super().__init__(server)
+        self.socket: QLocalSocket = socket
+        self.server: "ControlServer" = server
+        # Replies not yet fully written, each an iterator of byte chunks.
+        self.outgoing: Deque[Iterator[bytes]] = deque()
+        socket.readyRead.connect(self.on_ready_read)
+        socket.bytesWritten.connect(self.pump)
+        socket.disconnected.connect(self.on_disconnected)
+
+    def on_ready_read(self):
+        while self.socket.canReadLine():
+            line = bytes(self.socket.readLine().data()).strip()
+            if not line:
+                continue
+            try:
+                request = json.loads(line)
+            except ValueError:
+                self.send({"ok": False, "error": "malformed request"})
+                continue
+            if not isinstance(request, dict):
+                self.send({"ok": False, "error": "a request must be a JSON object"})
+                continue
+            reply = self.server.handle(self, request)
+            if reply is not None:
+                self.send(reply)
+
+    def on_disconnected(self):
+        self.outgoing.clear()
+        self.socket.deleteLater()
+        self.deleteLater()
+
+    def send(self, message: Dict):
+        self.stream(iter((encode_message(message),)))
+
+    def stream(self, chunks: Iterator[bytes]):
+        self.outgoing.append(chunks)
+        self.pump()
+
+    def pump(self, *_):
+        try:
+            while self.outgoing and self.socket.bytesToWrite() < HIGH_WATER_BYTES:
+                if self.socket.state() != QLocalSocket.LocalSocketState.ConnectedState:
+                    self.outgoing.clear()
+                    return
+                chunk = next(self.outgoing[0], None)
+                if chunk is None:
+                    self.outgoing.popleft()
+                else:
+                    self.socket.write(chunk)
+        except RuntimeError:
+            self.outgoing.clear()  # The socket was deleted under us (client gone).
+
+
+def parse_box(box) -> QRect:
+    if len(box) != 4:
+        raise ValueError(f"a box is [x, y, width, height], not {box!r}")
+    x, y, w, h = (int(value) for value in box)
+    # Like a drag on the overlay, which only keeps boxes with some area.
+    if w <= 0 or h <= 0:
+        raise ValueError(f"a box needs a positive width and height, not {box!r}")
+    return QRect(x, y, w, h)
+
+
+def measurement_stream(request_id, snapshot: MeasurementSnapshot) -> Iterator[bytes]:
+    """One line per box ({"id", "record"}), then a final {"id", "ok", "count"} line, a chunk at a time."""
+    lines = []
+    for record in snapshot.records():
+        lines.append(encode_message({"id": request_id, "record": record}))
+        if len(lines) >= STREAM_CHUNK:
+            yield b"".join(lines)
+            lines = []
+    lines.append(encode_message({"id": request_id, "ok": True, "count": len(snapshot)}))
+    yield b"".join(lines)
+
+
+class ControlServer(QObject):
+    """
+    Line-delimited JSON control channel on socket_path(), used by `pixelbox --resident` launches and by
+    `pixelbox --control` for scripting (see the README for the commands). Each request is handled on the GUI
+    thread as it arrives. A batch runs all its commands in one pass, so the overlays repaint once afterwards.
+    Replies carry the request's "id". Measurements are streamed and exports answered once written.
+    """
+
+    def __init__(self, tool_window):
+        super().__init__(tool_window)
+        self.tool_window = tool_window
+        self.server = QLocalServer(self)
+        self.server.setSocketOptions(QLocalServer.SocketOption.UserAccessOption)
+        self.server.newConnection.connect(self.on_new_connection)
+        # Export job id -> (connection, request id) waiting for it.
+        self.exports: Dict[int, Tuple[ControlConnection, object]] = {}
+        tool_window.export_queue.signals.finished.connect(self.on_export_finished)
+
+    def listen(self) -> bool:
+        path = socket_path()
+        # Another instance (resident, or started with --control) may own the socket; don't take it over.
+        probe = QLocalSocket()
+        probe.connectToServer(path)
+        if probe.waitForConnected(PROBE_TIMEOUT_MS):
+            probe.disconnectFromServer()
+            print(f"Unable to listen on '{path}': another PixelBox instance is already listening there.")
+            return False
+        # Nothing answered, so any file there is left over from a crash.
+        QLocalServer.removeServer(path)
+        if not self.server.listen(path):
+            print(f"Unable to listen on '{path}': {self.server.errorString()}")
+            return False
+        return True
+
+    def close(self):
+        self.server.close()
+
+    def on_new_connection(self):
+        while self.server.hasPendingConnections():
+            ControlConnection(self.server.nextPendingConnection(), self)
+
+    def overlay(self, request: Dict):
+        """The overlay a request targets: by "screen" name, or the primary screen's (ToolWindow.overlay_window)."""
+        name = request.get("screen")
+        if name is None:
+            return self.tool_window.overlay_window
+        for screen, overlay in self.tool_window.overlays.items():
+            if screen.name() == name:
+                return overlay
+        raise ValueError(f"no screen named {name!r}")
+
+    def handle(self, connection: ControlConnection, request: Dict) -> Optional[Dict]:
+        """Runs one request. Returns its reply, or None if the reply is sent later or streamed."""
+        request_id = request.get("id")
+        try:
+            if "batch" in request:
+                reply = self.run_batch(request["batch"])
+            else:
+                reply = self.run(connection, request)
+        except (KeyError, TypeError, ValueError) as e:
+            reply = {"ok": False, "error": f"{e.__class__.__name__}: {e}"}
+        if reply is not None and request_id is not None:
+            reply["id"] = request_id
+        return reply
+
+    def run_batch(self, commands) -> Dict:
+        if not isinstance(commands, list):
+            raise TypeError("a batch is a list of commands")
+        results = []
+        for command in commands:
+            if not isinstance(command, dict):
+                raise TypeError(f"a batched command must be a JSON object, not {command!r}")
+            if command.get("command") in UNBATCHABLE:
+                raise ValueError(f"{command.get('command')!r} can't be batched")
+        for command in commands:
+            try:
+                results.append(self.run(None, command))
+            except (KeyError, TypeError, ValueError) as e:
+                results.append({"ok": False, "error": f"{e.__class__.__name__}: {e}"})
+        return {"ok": all(result["ok"] for result in results), "results": results}
+
+    def run(self, connection: Optional[ControlConnection], request: Dict) -> Optional[Dict]:
+        command = request.get("command")
+        if command == "add":
+            overlay = self.overlay(request)
+            boxes = [parse_box(box) for box in request["boxes"]]
+            overlay.update(overlay.add_boxes(boxes))
+            return {"ok": True, "added": len(boxes), "boxes": len(overlay.boxes)}
+        if command in ("clear", "undo", "redo"):
+            overlay = self.overlay(request)
+            {"clear": overlay.clear_all_boxes, "undo": overlay.undo, "redo": overlay.redo}[command]()
+            return {"ok": True, "boxes": len(overlay.boxes)}
+        if command == "status":
+            return {
+                "ok": True,
+                "resident": self.tool_window.resident,
+                "screens": [
+                    {
+                        "name": screen.name(),
+                        "boxes": len(overlay.boxes),
+                        "width": overlay.width(),
+                        "height": overlay.height(),
+                        "device_pixel_ratio": overlay.device_pixel_ratio,
+                    }
+                    for screen, overlay in self.tool_window.overlays.items()
+                ],
+            }
+        if command == "measurements":
+            # The snapshot is a copy, so boxes added while it streams don't affect it.
+            snapshot = self.overlay(request).measurement_snapshot()
+            connection.stream(measurement_stream(request.get("id"), snapshot))
+            return None
+        if command == "export":
+            return self.export(connection, request)
+        if command in ("show", "reset"):
+            return self.show(connection, request, reset=command == "reset")
+        if command == "stop":
+            QTimer.singleShot(0, QApplication.quit)
+            return {"ok": True}
+        raise ValueError(f"unknown command {command!r}")
+
+    def show(self, connection: Optional[ControlConnection], request: Dict, reset: bool) -> Optional[Dict]:
+        """Shows PixelBox; from a connection, replies once the overlay under the cursor has painted."""
+        received = time.perf_counter()
+        overlay = self.tool_window.overlay_at_cursor()
+        if reset:
+            overlay.clear_all_boxes()
+        self.tool_window.set_dormant(False)
+        if connection is None:
+            return {"ok": True}
+        request_id = request.get("id")
+
+        def shown():
+            reply = {"ok": True, "server_ms": (time.perf_counter() - received) * 1000.0}
+            if request_id is not None:
+                reply["id"] = request_id
+            connection.send(reply)
+
+        if overlay.surfaces is None:
+            overlay.after_paint(shown)
+            overlay.update()
+        else:
+            # Low-memory mode has no full-screen window to wait for.
+            QTimer.singleShot(0, shown)
+        return None
+
+    def export(self, connection: ControlConnection, request: Dict) -> None:
+        """Queues a PNG of the overlay or a measurement export (format from the path); replies when written."""
+        overlay = self.overlay(request)
+        path = str(Path(request["path"]).expanduser())
+        suffix = Path(path).suffix.lower().lstrip(".")
+        if suffix == "png":
+            job = ImageExportJob(
+                overlay.grab().toImage(), path, int(request.get("compression", overlay.png_compression_level()))
+            )
+        elif suffix in MEASUREMENT_WRITERS:
+            job = MeasurementExportJob(overlay.measurement_snapshot(), path)
+        else:
+            raise ValueError(f"unsupported export format {suffix!r}")
+        job_id = self.tool_window.export_queue.submit(job)
+        self.tool_window.scripted_exports.add(job_id)
+        self.exports[job_id] = (connection, request.get("id"))
+        return None
+
+    def on_export_finished(self, job_id: int, file_name: str, error: str):
+        waiting = self.exports.pop(job_id, None)
+        self.tool_window.scripted_exports.discard(job_id)
+        if waiting is None:
+            return
+        connection, request_id = waiting
+        reply = {"ok": not error, "path": file_name}
+        if error:
+            reply["error"] = error
+        if request_id is not None:
+            reply["id"] = request_id
+        connection.send(reply)
@@ -0,0 +1,198 @@
+"""
+PixelBox
+Copyright (C) 2025 Travis L. Seymour, PhD
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import nullcontext
+from typing import Deque, Dict, List, Optional, Tuple
+
+# Beyond this many spans a trace stops recording (and says so), so a forgotten --trace can't eat all memory.
+MAX_TRACE_EVENTS = 2_000_000
+# Paint times kept for the HUD's percentiles.
+PAINT_HISTORY = 240
+
+_NO_SPAN = nullcontext()
+
+
+class Span:
+    __slots__ = ("tracer", "name", "category", "args", "started")
+
+    def __init__(self, tracer: "Tracer", name: str, category: str, args: Optional[Dict]):
+        self.tracer = tracer
+        self.name = name
+        self.category = category
+        self.args = args
+
+    def __enter__(self):
+        self.started = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.tracer.add(self.name, self.category, self.started, time.perf_counter_ns(), self.args)
+        return False
+
+
+class Tracer:
+    """
+    Records timestamped spans (pixelbox --trace FILE) and saves them as Chrome trace-event JSON, which
+    chrome://tracing and ui.perfetto.dev can open. When not recording, span() returns a shared no-op
+    context manager, so instrumented code pays for one attribute check.
+    """
+
+    def __init__(self):
+        self.path: Optional[str] = None
+        self.events: List[Tuple[str, str, int, int, int, Optional[Dict]]] = []
+        self.dropped: int = 0
+        self.origin: int = time.perf_counter_ns()
+        self.gui_thread: int = threading.get_ident()
+
+    @property
+    def enabled(self) -> bool:
+        return self.path is not None
+
+    def start(self, path: str):
+        self.path = path
+        self.events.clear()
+        self.dropped = 0
+        self.origin = time.perf_counter_ns()
+        self.gui_thread = threading.get_ident()
+
+    def span(self, name: str, category: str = "app", args: Optional[Dict] = None):
+        if self.path is None:
+            return _NO_SPAN
+        return Span(self, name, category, args)
+
+    def add(self, name: str, category: str, started: int, finished: int, args: Optional[Dict] = None):
+        # list.append is atomic under the GIL, so export threads can record spans too.
+        if len(self.events) < MAX_TRACE_EVENTS:
+            self.events.append((name, category, started, finished, threading.get_ident(), args))
+        else:
+            self.dropped += 1
+
+    def trace_events(self) -> List[Dict]:
+        pid = os.getpid()
+        events = [
+            {"name": "process_name", "ph": "M", "pid": pid, "tid": 0, "args": {"name": "PixelBox"}},
+            {"name": "thread_name", "ph": "M", "pid": pid, "tid": self.gui_thread, "args": {"name": "GUI thread"}},
+        ]
+        for name, category, started, finished, tid, args in list(self.events):
+            event = {
+                "name": name,
+                "cat": category,
+                "ph": "X",
+                "ts": (started - self.origin) / 1000.0,
+                "dur": (finished - started) / 1000.0,
+                "pid": pid,
+                "tid": tid,
+            }
+            if args:
+                event["args"] = args
+            events.append(event)
+        return events
+
+    def save(self):
+        """Writes the trace, if recording. Safe to call more than once; each call rewrites the whole file."""
+        if self.path is None:
+            return
+        trace = {"traceEvents": self.trace_events(), "displayTimeUnit": "ms", "otherData": {"dropped": self.dropped}}
+        try:
+            with open(self.path, "w", encoding="utf-8") as stream:
+                json.dump(trace, stream)
+        except OSError as e:
+            print(f"Unable to write trace '{self.path}': {e}")
+            return
+        print(f"Wrote {len(trace['traceEvents'])} trace events to '{self.path}'.")
+
+
+def process_rss_bytes() -> Optional[int]:
+    """Current resident set size, or None where it can't be read cheaply."""
+    try:
+        with open("/proc/self/statm", "rb") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    try:
+        import resource
+
+        # Peak rather than current, but the best available without /proc (kilobytes on Linux, bytes on macOS).
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if os.uname().sysname == "Darwin" else peak * 1024
+    except (ImportError, AttributeError):
+        return None
+
+
+class Diagnostics:
+    """Running counters behind the diagnostics HUD: paint times, repaints and input events per second."""
+
+    def __init__(self):
+        self.paint_ms: Deque[float] = deque(maxlen=PAINT_HISTORY)
+        self.paint_times: Deque[float] = deque(maxlen=10_000)
+        self.input_times: Deque[float] = deque(maxlen=10_000)
+
+    def record_paint(self, milliseconds: float):
+        self.paint_ms.append(milliseconds)
+        self.paint_times.append(time.monotonic())
+
+    def record_input(self):
+        self.input_times.append(time.monotonic())
+
+    @staticmethod
+    def _per_second(times: Deque[float], now: float) -> int:
+        while times and now - times[0] > 1.0:
+            times.popleft()
+        return len(times)
+
+    def summary(self, box_count: int, frame_requests: int = 0, frames: int = 0) -> str:
+        """The HUD text. frame_requests and frames are the overlays' FrameScheduler counters."""
+        now = time.monotonic()
+        lines = []
+        if self.paint_ms:
+            ordered = sorted(self.paint_ms)
+            p50 = ordered[len(ordered) // 2]
+            p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+            lines.append(f"paint: {self.paint_ms[-1]:.2f} ms  (p50 {p50:.2f}, p95 {p95:.2f}, max {ordered[-1]:.2f})")
+        else:
+            lines.append("paint: -")
+        lines.append(f"repaints/s: {self._per_second(self.paint_times, now)}")
+        lines.append(f"input events/s: {self._per_second(self.input_times, now)}")
+        lines.append(f"frames: {frames} painted, {frame_requests - frames} coalesced")
+        lines.append(f"boxes: {box_count}")
+        rss = process_rss_bytes()
+        lines.append(f"RSS: {'-' if rss is None else f'{rss / 2**20:.1f} MiB'}")
+        return "\n".join(lines)
+
+
+def input_handler(handler):
+    """Counts an event handler's calls as input events for the HUD and records them as trace spans."""
+    name = handler.__name__
+
+    @functools.wraps(handler)
+    def wrapper(self, event):
+        DIAGNOSTICS.record_input()
+        with TRACE.span(name, "input"):
+            return handler(self, event)
+
+    return wrapper
+
+
+TRACE = Tracer()
+DIAGNOSTICS = Diagnostics()
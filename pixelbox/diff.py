@@ -0,0 +1,107 @@
+"""
+PixelBox
+Copyright (C) 2025 Travis L. Seymour, PhD
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import math
+from typing import Iterable, List
+
+from PySide6.QtCore import QObject, QRect, QRunnable, QThreadPool, Signal
+from PySide6.QtGui import QImage
+
+from pixelbox.diagnostics import TRACE
+from pixelbox.imageops import component_boxes, pixel_array
+
+# Changed pixels are grouped on a grid of cells this size (device pixels), so changes this close together
+#  (e.g. the glyphs of one edited line of text) end up in one box rather than one box each.
+DIFF_CELL = 8
+
+
+def changed_regions(before: QImage, after: QImage, ignore: Iterable[QRect] = ()) -> List[QRect]:
+    """
+    Logical, screen-local boxes around every region that differs between two captures of the same screen,
+    each fitted tightly to its changed pixels. Changes inside ignore (logical rects) don't count.
+    """
+    import numpy as np
+
+    if before.size() != after.size():
+        raise ValueError("the screen changed size between the two captures")
+    before = before.convertToFormat(QImage.Format.Format_RGB32)
+    after = after.convertToFormat(QImage.Format.Format_RGB32)
+    changed = pixel_array(before) != pixel_array(after)
+    dpr = before.devicePixelRatio() or 1.0
+    for rect in ignore:
+        changed[
+            max(0, math.floor(rect.top() * dpr)) : max(0, math.ceil((rect.bottom() + 1) * dpr)),
+            max(0, math.floor(rect.left() * dpr)) : max(0, math.ceil((rect.right() + 1) * dpr)),
+        ] = False
+
+    height, width = changed.shape
+    cells = np.logical_or.reduceat(changed, np.arange(0, height, DIFF_CELL), axis=0)
+    cells = np.logical_or.reduceat(cells, np.arange(0, width, DIFF_CELL), axis=1)
+    regions = []
+    for x, y, w, h in component_boxes(cells) * DIFF_CELL:
+        # Trim the cell-aligned box to the changed pixels inside it.
+        block = changed[y : y + h, x : x + w]
+        columns = np.flatnonzero(block.any(axis=0))
+        rows = np.flatnonzero(block.any(axis=1))
+        left, right = x + columns[0], x + columns[-1] + 1
+        top, bottom = y + rows[0], y + rows[-1] + 1
+        # Round outward, so the logical box covers every changed device pixel.
+        logical_left, logical_top = math.floor(left / dpr), math.floor(top / dpr)
+        regions.append(
+            QRect(
+                logical_left,
+                logical_top,
+                math.ceil(right / dpr) - logical_left,
+                math.ceil(bottom / dpr) - logical_top,
+            )
+        )
+    return regions
+
+
+class DiffSignals(QObject):
+    # list of QRect (empty if nothing changed), error message ("" on success)
+    finished = Signal(object, str)
+
+
+class DiffJob(QRunnable):
+    def __init__(self, before: QImage, after: QImage, ignore: List[QRect], signals: DiffSignals):
+        super().__init__()
+        # Both captures are implicitly shared copies that nothing paints into, so reading them here is safe.
+        self.before: QImage = before
+        self.after: QImage = after
+        self.ignore: List[QRect] = ignore
+        self.signals: DiffSignals = signals
+        self.setAutoDelete(True)
+
+    def run(self):
+        try:
+            with TRACE.span("diff", "diff"):
+                regions = changed_regions(self.before, self.after, self.ignore)
+        except Exception as e:
+            regions, error = [], str(e) or e.__class__.__name__
+        else:
+            error = ""
+        try:
+            self.signals.finished.emit(regions, error)
+        except RuntimeError:
+            pass  # The overlay closed while the captures were being compared.
+
+
+def compare_captures(before: QImage, after: QImage, ignore: List[QRect], signals: DiffSignals):
+    """Compares the captures on a pool thread; the result arrives through signals.finished on the GUI thread."""
+    QThreadPool.globalInstance().start(DiffJob(before, after, ignore, signals))
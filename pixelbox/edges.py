@@ -0,0 +1,153 @@
+"""
+PixelBox
+Copyright (C) 2025 Travis L. Seymour, PhD
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+from typing import Optional
+
+from PySide6.QtCore import QObject, QPoint, QRunnable, QThreadPool, Signal
+from PySide6.QtGui import QImage
+
+from pixelbox.capture import image_fingerprint
+from pixelbox.imageops import pixel_array
+
+# Brightness step (0-255) between neighbouring pixels that counts as an edge.
+EDGE_THRESHOLD = 24
+# How far (logical pixels) a dragged corner may jump to reach an edge.
+SNAP_DISTANCE = 6
+
+
+class EdgeMap:
+    """
+    Edges found in one screen capture, indexed for snapping. Vertical edges (a brightness step between
+    columns x-1 and x) are stored per row, horizontal edges per column, each as a CSR-style pair: a sorted
+    array of positions and an offsets array, so one row's edges are positions[offsets[y]:offsets[y + 1]].
+    Coordinates are device pixels; a lookup is a binary search within one row or column.
+    """
+
+    def __init__(self, image: QImage, threshold: int = EDGE_THRESHOLD):
+        import numpy as np
+
+        self.device_pixel_ratio: float = image.devicePixelRatio() or 1.0
+        gray = image.convertToFormat(QImage.Format.Format_Grayscale8)
+        height, width = gray.height(), gray.width()
+        pixels = pixel_array(gray).astype(np.int16)
+        self.width: int = width
+        self.height: int = height
+
+        # Boundaries between columns x-1 and x, found row by row (np.nonzero is row-major, so already sorted).
+        rows, cols = np.nonzero(np.abs(np.diff(pixels, axis=1)) > threshold)
+        self.row_edges = (cols + 1).astype(np.int32)
+        self.row_offsets = np.searchsorted(rows, np.arange(height + 1)).astype(np.int32)
+
+        # Boundaries between rows y-1 and y, column by column (transpose so nonzero walks columns).
+        cols, rows = np.nonzero(np.abs(np.diff(pixels, axis=0)).T > threshold)
+        self.column_edges = (rows + 1).astype(np.int32)
+        self.column_offsets = np.searchsorted(cols, np.arange(width + 1)).astype(np.int32)
+
+    def __len__(self) -> int:
+        return len(self.row_edges) + len(self.column_edges)
+
+    @staticmethod
+    def _nearest(edges, start: int, end: int, value: int, tolerance: int) -> Optional[int]:
+        import numpy as np
+
+        if start == end:
+            return None
+        line = edges[start:end]
+        i = int(np.searchsorted(line, value))
+        best = None
+        for j in (i - 1, i):
+            if 0 <= j < len(line) and abs(int(line[j]) - value) <= tolerance:
+                if best is None or abs(int(line[j]) - value) < abs(best - value):
+                    best = int(line[j])
+        return best
+
+    def snap(self, point: QPoint, distance: int = SNAP_DISTANCE) -> QPoint:
+        """point (logical, screen-local) moved onto the nearest edge in its row and column, if one is close."""
+        dpr = self.device_pixel_ratio
+        x, y = round(point.x() * dpr), round(point.y() * dpr)
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return point
+        tolerance = round(distance * dpr)
+        snapped_x = self._nearest(self.row_edges, self.row_offsets[y], self.row_offsets[y + 1], x, tolerance)
+        snapped_y = self._nearest(self.column_edges, self.column_offsets[x], self.column_offsets[x + 1], y, tolerance)
+        return QPoint(
+            point.x() if snapped_x is None else round(snapped_x / dpr),
+            point.y() if snapped_y is None else round(snapped_y / dpr),
+        )
+
+
+class EdgeMapSignals(QObject):
+    # fingerprint, EdgeMap (or None if building it failed)
+    ready = Signal(bytes, object)
+
+
+class EdgeMapJob(QRunnable):
+    def __init__(self, image: QImage, fingerprint: bytes, signals: EdgeMapSignals):
+        super().__init__()
+        self.image: QImage = image
+        self.fingerprint: bytes = fingerprint
+        self.signals: EdgeMapSignals = signals
+        self.setAutoDelete(True)
+
+    def run(self):
+        try:
+            edge_map = EdgeMap(self.image)
+        except Exception as e:
+            print(f"Unable to build the edge map: {e}")
+            edge_map = None
+        try:
+            self.signals.ready.emit(self.fingerprint, edge_map)
+        except RuntimeError:
+            pass  # The overlay (and its snapper) closed while the map was being built.
+
+
+class EdgeSnapper(QObject):
+    """
+    Keeps an EdgeMap for one screen. Each capture passed to submit() is compared with the last one by
+    fingerprint and, only if the content changed, a new map is built on a background thread.
+    Until it arrives, snap() keeps using the previous map (or leaves points alone if there is none).
+    """
+
+    def __init__(self, parent: Optional[QObject] = None):
+        super().__init__(parent)
+        self.edge_map: Optional[EdgeMap] = None
+        self.fingerprint: bytes = b""
+        self.pending: bytes = b""  # fingerprint of the map being built, if any
+        self.signals = EdgeMapSignals(self)
+        self.signals.ready.connect(self._on_ready)
+
+    def invalidate(self):
+        self.edge_map = None
+        self.fingerprint = b""
+
+    def submit(self, image: QImage):
+        fingerprint = image_fingerprint(image)
+        if fingerprint in (self.fingerprint, self.pending):
+            return
+        self.pending = fingerprint
+        QThreadPool.globalInstance().start(EdgeMapJob(image, fingerprint, self.signals))
+
+    def _on_ready(self, fingerprint: bytes, edge_map: Optional[EdgeMap]):
+        if fingerprint != self.pending:
+            return  # superseded by a newer capture
+        self.pending = b""
+        self.fingerprint = fingerprint
+        self.edge_map = edge_map
+
+    def snap(self, point: QPoint) -> QPoint:
+        return point if self.edge_map is None else self.edge_map.snap(point)
@@ -0,0 +1,137 @@
+"""
+PixelBox
+Copyright (C) 2025 Travis L. Seymour, PhD
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import math
+from typing import List, Optional
+
+from PySide6.QtCore import QObject, QPoint, QRect, Signal
+from PySide6.QtGui import QImage
+
+from pixelbox.capture import image_fingerprint
+from pixelbox.imageops import pixel_array, segment_elements
+from pixelbox.spatial import GridIndex
+
+# Worker processes segmenting captures, shared by every overlay. Started on first use.
+SEGMENTATION_WORKERS = 2
+
+_pool = None  # concurrent.futures.ProcessPoolExecutor
+
+
+def segmentation_pool():
+    global _pool
+    if _pool is None:
+        # Imported here, so startup doesn't pay for multiprocessing unless element detection is used.
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+
+        # Spawned rather than forked: forking a process with a running Qt event loop and threads isn't safe.
+        _pool = ProcessPoolExecutor(SEGMENTATION_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+    return _pool
+
+
+def shutdown_segmentation_pool():
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+class ElementMap:
+    """
+    The UI elements detected in one capture, as logical, screen-local rects in a grid index. Keys are assigned
+    smallest element first, and queries return keys in ascending order, so the first hit under a point is the
+    innermost element there.
+    """
+
+    def __init__(self, boxes, device_pixel_ratio: float):
+        self.elements: List[QRect] = []
+        self.index: GridIndex = GridIndex()
+        dpr = device_pixel_ratio or 1.0
+        for x, y, w, h in boxes.tolist():
+            # Round outward, so the logical rect covers the whole element.
+            left, top = math.floor(x / dpr), math.floor(y / dpr)
+            rect = QRect(left, top, math.ceil((x + w) / dpr) - left, math.ceil((y + h) / dpr) - top)
+            self.index.insert(len(self.elements), rect)
+            self.elements.append(rect)
+
+    def __len__(self) -> int:
+        return len(self.elements)
+
+    def element_at(self, point: QPoint) -> Optional[QRect]:
+        keys = self.index.query_point(point)
+        return QRect(self.elements[keys[0]]) if keys else None
+
+
+class ElementMapSignals(QObject):
+    # fingerprint, (boxes, device pixel ratio), or None if segmenting failed
+    ready = Signal(bytes, object)
+
+
+class ElementFinder(QObject):
+    """
+    Keeps an ElementMap for one screen, for hover-to-detect. Like EdgeSnapper, a capture is only analysed if
+    its fingerprint changed, but the segmentation runs in a worker process (see segmentation_pool), so even a
+    4K capture never competes with the GUI thread. The map is indexed on the GUI thread when the result
+    arrives; after that, element_at() is one grid lookup, and moving the mouse never touches the image.
+    """
+
+    def __init__(self, parent: Optional[QObject] = None):
+        super().__init__(parent)
+        self.element_map: Optional[ElementMap] = None
+        self.fingerprint: bytes = b""
+        self.pending: bytes = b""  # fingerprint of the capture being segmented, if any
+        self.signals = ElementMapSignals(self)
+        self.signals.ready.connect(self._on_ready)
+
+    def invalidate(self):
+        self.element_map = None
+        self.fingerprint = b""
+
+    def submit(self, image: QImage):
+        fingerprint = image_fingerprint(image)
+        if fingerprint in (self.fingerprint, self.pending):
+            return
+        self.pending = fingerprint
+        gray = image.convertToFormat(QImage.Format.Format_Grayscale8)
+        # A copy the worker can be sent (pickled); the view alone points into gray.
+        pixels = pixel_array(gray).copy()
+        device_pixel_ratio = image.devicePixelRatio() or 1.0
+        signals = self.signals
+
+        def segmented(future):
+            try:
+                result = (future.result(), device_pixel_ratio)
+            except Exception as e:
+                print(f"Unable to detect UI elements: {e}")
+                result = None
+            try:
+                signals.ready.emit(fingerprint, result)
+            except RuntimeError:
+                pass  # The overlay (and its finder) closed while the capture was being segmented.
+
+        segmentation_pool().submit(segment_elements, pixels, device_pixel_ratio).add_done_callback(segmented)
+
+    def _on_ready(self, fingerprint: bytes, result):
+        if fingerprint != self.pending:
+            return  # superseded by a newer capture
+        self.pending = b""
+        self.fingerprint = fingerprint
+        self.element_map = None if result is None else ElementMap(*result)
+
+    def element_at(self, point: QPoint) -> Optional[QRect]:
+        return None if self.element_map is None else self.element_map.element_at(point)
@@ -0,0 +1,113 @@
+"""
+PixelBox
+Copyright (C) 2025 Travis L. Seymour, PhD
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import math
+from typing import Optional
+
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal
+from PySide6.QtGui import QImage, QImageWriter
+
+from pixelbox.diagnostics import TRACE
+
+# zlib compression levels offered for PNG export (0 = none/fastest ... 9 = smallest/slowest).
+PNG_COMPRESSION_LEVELS = {"Fast": 1, "Balanced": 6, "Smallest": 9}
+DEFAULT_PNG_COMPRESSION = 6
+
+
+def png_quality(compression_level: int) -> int:
+    """Qt's PNG writer takes a 0-100 'quality' and maps it onto zlib level (100 - quality) * 9 / 91."""
+    compression_level = max(0, min(9, compression_level))
+    return 100 - math.ceil(compression_level * 91 / 9)
+
+
+class ExportSignals(QObject):
+    # job id, file name
+    queued = Signal(int, str)
+    started = Signal(int, str)
+    # job id, file name, error message ("" on success)
+    finished = Signal(int, str, str)
+
+
+class ExportJob(QRunnable):
+    """A unit of export work run on the export thread. Subclasses implement write() and raise on failure."""
+
+    def __init__(self, file_name: str):
+        super().__init__()
+        self.job_id: int = 0
+        self.file_name: str = file_name
+        self.signals: Optional[ExportSignals] = None
+        self.setAutoDelete(True)
+
+    def write(self):
+        raise NotImplementedError
+
+    def run(self):
+        self.signals.started.emit(self.job_id, self.file_name)
+        try:
+            with TRACE.span("export", "export", {"file": self.file_name, "job": self.job_id}):
+                self.write()
+        except Exception as e:
+            self.signals.finished.emit(self.job_id, self.file_name, str(e) or e.__class__.__name__)
+        else:
+            self.signals.finished.emit(self.job_id, self.file_name, "")
+
+
+class ImageExportJob(ExportJob):
+    def __init__(self, image: QImage, file_name: str, compression_level: int = DEFAULT_PNG_COMPRESSION):
+        super().__init__(file_name)
+        # QImage is implicitly shared; the GUI thread never paints into this copy, so reading it here is safe.
+        self.image: QImage = image
+        self.compression_level: int = compression_level
+
+    def write(self):
+        writer = QImageWriter(self.file_name, b"png")
+        writer.setQuality(png_quality(self.compression_level))
+        if not writer.write(self.image):
+            raise OSError(writer.errorString())
+
+
+class ExportQueue(QObject):
+    """
+    Runs exports on a single background thread, in the order they were submitted, so encoding a large
+    image never blocks the GUI thread and back-to-back exports queue up instead of competing.
+    Progress is reported through self.signals, which are delivered on the GUI thread.
+    """
+
+    def __init__(self, parent: Optional[QObject] = None):
+        super().__init__(parent)
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(1)
+        self.signals = ExportSignals(self)
+        self.signals.finished.connect(self._on_finished)
+        self.pending: int = 0  # submitted but not finished, including the one running
+        self._next_id: int = 0
+
+    def submit(self, job: ExportJob) -> int:
+        self._next_id += 1
+        job.job_id = self._next_id
+        job.signals = self.signals
+        self.pending += 1
+        self.signals.queued.emit(job.job_id, job.file_name)
+        self.pool.start(job)
+        return job.job_id
+
+    def _on_finished(self, job_id: int, file_name: str, error: str):
+        self.pending -= 1
+
+    def wait(self, msecs: int = -1) -> bool:
+        return self.pool.waitForDone(msecs)
@@ -0,0 +1,95 @@
+"""
+PixelBox
+Copyright (C) 2025 Travis L. Seymour, PhD
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+from typing import Callable, Optional
+
+from PySide6.QtCore import QObject, Qt, QTimer
+from PySide6.QtGui import QScreen
+
+DEFAULT_REFRESH_RATE = 60.0
+
+
+class FrameScheduler(QObject):
+    """
+    Coalesces input-driven repaints to the display refresh rate.
+
+    Input handlers only record their latest state and call request_frame(). A timer ticking at the
+    screen's refresh rate then runs the frame callback at most once per tick, no matter how many
+    requests arrived in between. A request arriving while idle is served immediately. The timer
+    stops itself when a tick finds nothing to do, so an idle overlay does not wake up.
+    """
+
+    def __init__(self, frame_callback: Callable[[], None], parent: Optional[QObject] = None):
+        super().__init__(parent)
+        self.frame_callback: Callable[[], None] = frame_callback
+        self.refresh_rate: float = DEFAULT_REFRESH_RATE
+        self.requests: int = 0  # input events that asked for a frame
+        self.frames: int = 0  # frames actually produced
+        self._pending: bool = False
+        self._screen: Optional[QScreen] = None
+        self._timer = QTimer(self)
+        self._timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self._timer.timeout.connect(self._tick)
+        self.set_refresh_rate(DEFAULT_REFRESH_RATE)
+
+    @property
+    def coalesced(self) -> int:
+        """Requests that were folded into a frame produced for an earlier request."""
+        return self.requests - self.frames
+
+    def set_refresh_rate(self, refresh_rate: float):
+        self.refresh_rate = refresh_rate if refresh_rate > 0 else DEFAULT_REFRESH_RATE
+        self._timer.setInterval(max(1, round(1000.0 / self.refresh_rate)))
+
+    def follow_screen(self, screen: Optional[QScreen]):
+        """Ticks at screen's refresh rate from now on, including when that rate changes."""
+        if screen is self._screen:
+            return
+        if self._screen is not None:
+            try:
+                self._screen.refreshRateChanged.disconnect(self.set_refresh_rate)
+            except (RuntimeError, TypeError):
+                pass  # the old screen is already gone
+        self._screen = screen
+        if screen is not None:
+            screen.refreshRateChanged.connect(self.set_refresh_rate)
+            self.set_refresh_rate(screen.refreshRate())
+
+    def request_frame(self):
+        self.requests += 1
+        if self._timer.isActive():
+            self._pending = True
+            return
+        # Idle: produce this frame right away, then hold further requests until the next tick.
+        self._produce_frame()
+        self._timer.start()
+
+    def cancel(self):
+        self._pending = False
+        self._timer.stop()
+
+    def _tick(self):
+        if not self._pending:
+            self._timer.stop()
+            return
+        self._produce_frame()
+
+    def _produce_frame(self):
+        self._pending = False
+        self.frames += 1
+        self.frame_callback()
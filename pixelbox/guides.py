@@ -0,0 +1,112 @@
+"""
+PixelBox
+Copyright (C) 2025 Travis L. Seymour, PhD
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+from bisect import bisect_left, insort
+from typing import Iterable, List, Optional, Tuple
+
+# How close (in logical pixels) a corner must come to an existing edge or center to snap onto its guide.
+GUIDE_TOLERANCE = 4
+# Restoring more boxes than this at once re-sorts each axis instead of inserting one by one.
+BULK_INSERT = 64
+
+
+class AxisIndex:
+    """Sorted coordinates on one axis, duplicates allowed. Insert and remove are a bisect plus a list memmove."""
+
+    def __init__(self):
+        self.values: List[int] = []
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def add(self, value: int):
+        insort(self.values, value)
+
+    def extend(self, values: Iterable[int]):
+        self.values.extend(values)
+        self.values.sort()
+
+    def remove(self, value: int):
+        i = bisect_left(self.values, value)
+        if i < len(self.values) and self.values[i] == value:
+            del self.values[i]
+
+    def clear(self):
+        self.values.clear()
+
+    def nearest(self, value: int, tolerance: int) -> Optional[int]:
+        """The stored coordinate closest to value, if it's within tolerance. Ties go to the smaller one."""
+        values = self.values
+        i = bisect_left(values, value)
+        best: Optional[int] = None
+        if i < len(values) and values[i] - value <= tolerance:
+            best = values[i]
+        if i > 0 and value - values[i - 1] <= tolerance and (best is None or value - values[i - 1] <= best - value):
+            best = values[i - 1]
+        return best
+
+
+class AlignmentGuides:
+    """
+    The left, center and right x, and top, center and bottom y, of every finalized box, so a corner being dragged
+    can be matched against all of them with two bisects per axis. Coordinates follow QRect: right() and bottom()
+    are the last pixel inside the box, and center() rounds down.
+    """
+
+    def __init__(self):
+        self.columns = AxisIndex()
+        self.rows = AxisIndex()
+
+    @staticmethod
+    def edges(start: int, length: int) -> Tuple[int, int, int]:
+        return start, start + (length - 1) // 2, start + length - 1
+
+    def add(self, x: int, y: int, w: int, h: int):
+        for value in self.edges(x, w):
+            self.columns.add(value)
+        for value in self.edges(y, h):
+            self.rows.add(value)
+
+    def add_many(self, boxes: Iterable[Tuple[int, int, int, int]]):
+        columns: List[int] = []
+        rows: List[int] = []
+        for x, y, w, h in boxes:
+            columns.extend(self.edges(x, w))
+            rows.extend(self.edges(y, h))
+        if len(columns) > BULK_INSERT * 3:
+            self.columns.extend(columns)
+            self.rows.extend(rows)
+        else:
+            for value in columns:
+                self.columns.add(value)
+            for value in rows:
+                self.rows.add(value)
+
+    def remove(self, x: int, y: int, w: int, h: int):
+        for value in self.edges(x, w):
+            self.columns.remove(value)
+        for value in self.edges(y, h):
+            self.rows.remove(value)
+
+    def clear(self):
+        self.columns.clear()
+        self.rows.clear()
+
+    def align(self, x: int, y: int, tolerance: int) -> Tuple[Optional[int], Optional[int]]:
+        """The guide x and guide y nearest to (x, y) within tolerance; None on an axis with nothing close enough."""
+        return self.columns.nearest(x, tolerance), self.rows.nearest(y, tolerance)
@@ -0,0 +1,139 @@
+"""
+PixelBox
+Copyright (C) 2025 Travis L. Seymour, PhD
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+# NumPy helpers shared by the image analyses (edge snapping, capture diffs, element detection). Callers check
+#  numpy_available() first. Element detection runs these in worker processes, so this module doesn't import Qt.
+
+import importlib.util
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from PySide6.QtGui import QImage
+
+# Brightness step (0-255) between neighbouring pixels that separates one UI element from the next.
+ELEMENT_EDGE_THRESHOLD = 12
+# Detected elements narrower or shorter than this (logical pixels) are ignored: glyph counters, icons' insides...
+ELEMENT_MIN_SIZE = 12
+
+
+def numpy_available() -> bool:
+    return importlib.util.find_spec("numpy") is not None
+
+
+def pixel_array(image: "QImage"):
+    """
+    A (height, width) NumPy view of an 8-bit (e.g. Grayscale8) or 32-bit (e.g. RGB32) image's pixels, one
+    element per pixel. It shares the image's buffer, so the image must outlive it (and not be painted into).
+    """
+    import numpy as np
+
+    dtype = {8: np.uint8, 32: np.uint32}[image.depth()]
+    stride = image.bytesPerLine() // np.dtype(dtype).itemsize
+    # Rows are padded to bytesPerLine; view the buffer with that stride and drop the padding.
+    return np.frombuffer(image.constBits(), dtype=dtype).reshape(image.height(), stride)[:, : image.width()]
+
+
+def component_boxes(mask, diagonal: bool = True):
+    """
+    Bounding boxes of the connected regions of True in a 2D bool array, as an (n, 4) int array of
+    x, y, width, height, ordered by each region's first pixel (top to bottom, then left to right).
+    Pixels touching only at a corner are connected if diagonal (8-connectivity), otherwise not (4-connectivity).
+
+    Works on horizontal runs rather than pixels: the runs come from one vectorized diff, each run is linked
+    to the runs touching it in the row above with two searchsorted calls, and the links are merged with
+    vectorized union-find (hook roots onto the smaller root, then pointer-jump), which takes a handful of
+    rounds even for long, winding regions.
+    """
+    import numpy as np
+
+    height, width = mask.shape
+    padded = np.zeros((height, width + 2), dtype=np.int8)
+    padded[:, 1:-1] = mask
+    steps = np.diff(padded, axis=1)
+    # nonzero walks row-major, so the k-th start and k-th end belong to the same run.
+    rows, starts = np.nonzero(steps == 1)
+    ends = np.nonzero(steps == -1)[1]  # exclusive
+    count = len(starts)
+    if not count:
+        return np.zeros((0, 4), dtype=np.int64)
+
+    # Runs sorted by (row, column) keys; a row's keys never reach the next row's, so the runs of row r - 1
+    #  touching a run in row r (sharing a column, or for 8-connectivity a corner) form one contiguous range.
+    stride = width + 2
+    start_keys = rows * stride + starts
+    end_keys = rows * stride + ends
+    above = (rows - 1) * stride
+    first = np.searchsorted(end_keys, above + starts, side="left" if diagonal else "right")
+    last = np.searchsorted(start_keys, above + ends, side="right" if diagonal else "left")
+    links = np.where(rows > 0, np.maximum(last - first, 0), 0)
+    run = np.repeat(np.arange(count), links)
+    offsets = np.repeat(np.cumsum(links) - links, links)
+    touching = np.arange(len(run)) - offsets + np.repeat(first, links)
+
+    parent = np.arange(count)
+    while True:
+        # Pointer-jump until every run points straight at its root.
+        while True:
+            grandparent = parent[parent]
+            if np.array_equal(grandparent, parent):
+                break
+            parent = grandparent
+        a, b = parent[run], parent[touching]
+        split = a != b
+        if not split.any():
+            break
+        np.minimum.at(parent, np.maximum(a[split], b[split]), np.minimum(a[split], b[split]))
+
+    # Roots are each region's first run, so sorting by root orders regions by their first pixel.
+    order = np.argsort(parent, kind="stable")
+    roots = parent[order]
+    heads = np.flatnonzero(np.r_[True, roots[1:] != roots[:-1]])
+    x0 = np.minimum.reduceat(starts[order], heads)
+    x1 = np.maximum.reduceat(ends[order], heads)
+    y0 = np.minimum.reduceat(rows[order], heads)
+    y1 = np.maximum.reduceat(rows[order], heads) + 1
+    return np.stack([x0, y0, x1 - x0, y1 - y0], axis=1).astype(np.int64)
+
+
+def segment_elements(gray, device_pixel_ratio: float = 1.0):
+    """
+    Candidate UI elements (buttons, fields, panels...) in a Grayscale8 pixel array, as an (n, 4) array of
+    x, y, width, height in device pixels, smallest area first.
+
+    Pixels where the brightness steps by more than ELEMENT_EDGE_THRESHOLD from the pixel to the left or above
+    are edges; every 4-connected region of flat pixels between edges is an element. A button's fill is one
+    region (its label's glyphs are holes in it), and a panel's background another that contains the button.
+    Regions smaller than ELEMENT_MIN_SIZE logical pixels and the screen background are dropped.
+    """
+    import numpy as np
+
+    pixels = gray.astype(np.int16)
+    edges = np.zeros(pixels.shape, dtype=bool)
+    edges[:, 1:] = np.abs(np.diff(pixels, axis=1)) > ELEMENT_EDGE_THRESHOLD
+    edges[1:, :] |= np.abs(np.diff(pixels, axis=0)) > ELEMENT_EDGE_THRESHOLD
+    boxes = component_boxes(~edges, diagonal=False)
+    # A step is marked on the pixel after it, which is a region's own first column or row; give it back.
+    grow = boxes[:, :2] > 0
+    boxes[:, :2] -= grow
+    boxes[:, 2:] += grow
+    height, width = pixels.shape
+    w, h = boxes[:, 2], boxes[:, 3]
+    min_size = round(ELEMENT_MIN_SIZE * device_pixel_ratio)
+    keep = (w >= min_size) & (h >= min_size) & ((w < width) | (h < height))
+    boxes = np.unique(boxes[keep], axis=0)
+    return boxes[np.argsort(boxes[:, 2] * boxes[:, 3], kind="stable")]
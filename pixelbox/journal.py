@@ -0,0 +1,324 @@
+"""
+PixelBox
+Copyright (C) 2025 Travis L. Seymour, PhD
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import mmap
+import os
+import queue
+import struct
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from pixelbox.boxstore import ADD, CLEAR, REDO, UNDO, BoxStore
+
+JOURNAL_FILE = "session.journal"
+SNAPSHOT_FILE = "session.snapshot"
+# Appended records reach the disk (fsync) at most this long after they're written.
+FSYNC_INTERVAL = 0.5
+# After this many records the session is compacted into a new snapshot, which bounds replay time on resume.
+COMPACT_RECORDS = 20_000
+
+# File headers: magic, format version, generation, and (journal only) the snapshot generation it continues from.
+_JOURNAL_HEADER = struct.Struct("<4sIQQ")
+_SNAPSHOT_HEADER = struct.Struct("<4sIQI")
+JOURNAL_MAGIC = b"PBJ1"
+SNAPSHOT_MAGIC = b"PBS1"
+FORMAT_VERSION = 2
+
+# Journal records are fixed-size: operation, screen slot, then x, y, w, h and creation time. A SCREEN record
+#  instead holds the screen name's length and then the whole name (UTF-8), padded out to a whole number of records.
+RECORD = struct.Struct("<BB2x4id")
+_SCREEN_RECORD = struct.Struct("<BBH")
+# The other operations are BoxStore's (see pixelbox.boxstore).
+SCREEN = 1
+
+# One screen's boxes, by screen name.
+Session = List[Tuple[str, BoxStore]]
+
+
+def read_header(path: Path, header: struct.Struct, magic: bytes) -> Optional[tuple]:
+    """The header fields after magic and version, or None if the file is missing or not ours."""
+    try:
+        with open(path, "rb") as stream:
+            fields = header.unpack(stream.read(header.size))
+    except (OSError, struct.error):
+        return None
+    if fields[0] != magic or fields[1] != FORMAT_VERSION:
+        return None
+    return fields[2:]
+
+
+def read_snapshot(path: Path) -> Tuple[int, Session]:
+    """Memory-maps a snapshot and copies each screen's columns out in one piece. Returns (generation, session)."""
+    with open(path, "rb") as stream, mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        with memoryview(mapped) as buffer:
+            _, _, generation, slot_count = _SNAPSHOT_HEADER.unpack_from(buffer)
+            offset = _SNAPSHOT_HEADER.size
+            session: Session = []
+            for _ in range(slot_count):
+                (name_length,) = struct.unpack_from("<H", buffer, offset)
+                name = bytes(buffer[offset + 2 : offset + 2 + name_length]).decode("utf-8")
+                store, offset = BoxStore.read_from(buffer, offset + 2 + name_length)
+                session.append((name, store))
+    return generation, session
+
+
+def screen_record_size(name_length: int) -> int:
+    """Bytes taken by a SCREEN record whose name is name_length bytes: always a whole number of records."""
+    return -(-(_SCREEN_RECORD.size + name_length) // RECORD.size) * RECORD.size
+
+
+def replay_journal(path: Path, session: Session):
+    """Applies a journal's records to session, adding screens as they're declared. A torn last record is ignored."""
+    with open(path, "rb") as stream, mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        with memoryview(mapped) as buffer, buffer[_JOURNAL_HEADER.size :] as body:
+            whole = len(body) - len(body) % RECORD.size
+            stores: Dict[int, BoxStore] = {slot: store for slot, (_, store) in enumerate(session)}
+            records = enumerate(RECORD.iter_unpack(body[:whole]))
+            try:
+                for index, (op, slot, x, y, w, h, created) in records:
+                    if op == ADD:
+                        stores[slot].append_geometry(x, y, w, h, created)
+                    elif op == UNDO:
+                        stores[slot].undo()
+                    elif op == REDO:
+                        stores[slot].redo()
+                    elif op == CLEAR:
+                        stores[slot].clear()
+                    elif op == SCREEN:
+                        start = index * RECORD.size
+                        length = _SCREEN_RECORD.unpack_from(body, start)[2]
+                        if start + screen_record_size(length) > whole:
+                            break  # torn while its name was being written
+                        name = bytes(body[start + _SCREEN_RECORD.size : start + _SCREEN_RECORD.size + length])
+                        # The name takes up the records that follow; skip them.
+                        for _ in range(screen_record_size(length) // RECORD.size - 1):
+                            next(records)
+                        while len(session) <= slot:
+                            session.append(("", BoxStore()))
+                        session[slot] = (name.decode("utf-8"), session[slot][1])
+                        stores[slot] = session[slot][1]
+            finally:
+                # Until it's gone, the unfinished iterator keeps the file mapped, and closing the mapping would fail.
+                del records
+
+
+class SessionJournal:
+    """
+    Crash-safe record of every box added, undone, redone or cleared, kept in state_dir() so `pixelbox --resume`
+    can bring a session back.
+
+    The GUI thread only packs a 28-byte record and queues it. A writer thread appends queued records in batches
+    and fsyncs at most every FSYNC_INTERVAL seconds. Every COMPACT_RECORDS records (and on a clean exit) the
+    session is folded into a snapshot: each screen's BoxStore columns and undo history written as raw arrays,
+    so resuming is an mmap and a few memcpys plus the replay of a short journal.
+
+    A new session doesn't touch the files until its first box, so launching without --resume by mistake
+    doesn't lose the previous session until something is drawn.
+    """
+
+    def __init__(self, directory: Path, state: Callable[[], Session]):
+        self.directory: Path = directory
+        # Returns a copy of every screen's boxes, for compaction.
+        self.state: Callable[[], Session] = state
+        # Screen name -> slot number used in records. Slots are never reused within a session.
+        self.slots: Dict[str, int] = {}
+        self.records: int = 0  # since the last compaction
+        self.queue: queue.SimpleQueue = queue.SimpleQueue()
+        self.thread: Optional[threading.Thread] = None
+        self.failed: bool = False
+        self.stream = None
+        self.generation: int = 0  # of the journal file being written
+
+    @property
+    def journal_path(self) -> Path:
+        return self.directory / JOURNAL_FILE
+
+    @property
+    def snapshot_path(self) -> Path:
+        return self.directory / SNAPSHOT_FILE
+
+    def load(self) -> Session:
+        """
+        Reads the last session: the snapshot, plus the journal written after it (if the journal continues from
+        this snapshot, or starts from nothing). Journal records appended from now on continue this session.
+        """
+        session: Session = []
+        snapshot_generation = 0
+        snapshot = read_header(self.snapshot_path, _SNAPSHOT_HEADER, SNAPSHOT_MAGIC)
+        journal = read_header(self.journal_path, _JOURNAL_HEADER, JOURNAL_MAGIC)
+        try:
+            if snapshot is not None:
+                snapshot_generation, session = read_snapshot(self.snapshot_path)
+            if journal is not None and journal[0] > snapshot_generation:
+                if journal[1] != snapshot_generation:
+                    # A fresh session was started after the snapshot was written; it replaces it.
+                    session = []
+                replay_journal(self.journal_path, session)
+        except (OSError, ValueError, IndexError, KeyError, struct.error) as e:
+            print(f"Unable to read the saved session in '{self.directory}': {e}")
+            return []
+        self.slots = {name: slot for slot, (name, _) in enumerate(session)}
+        return session
+
+    def slot(self, screen_name: str) -> int:
+        slot = self.slots.get(screen_name)
+        if slot is None:
+            slot = self.slots[screen_name] = len(self.slots)
+            encoded = screen_name.encode("utf-8")
+            record = _SCREEN_RECORD.pack(SCREEN, slot, len(encoded)) + encoded
+            self._put(record.ljust(screen_record_size(len(encoded)), b"\0"))
+        return slot
+
+    def add(self, screen_name: str, x: int, y: int, w: int, h: int, created: float):
+        self.record(ADD, screen_name, x, y, w, h, created)
+
+    def record(self, op: int, screen_name: str, x: int = 0, y: int = 0, w: int = 0, h: int = 0, created: float = 0):
+        if self.failed:
+            return
+        self._put(RECORD.pack(op, self.slot(screen_name), x, y, w, h, created))
+        self.records += 1
+        if self.records >= COMPACT_RECORDS:
+            self.compact()
+
+    def compact(self):
+        """Queues a snapshot of the current session; records queued after it go to a new journal."""
+        if self.failed:
+            return
+        self.records = 0
+        state = dict(self.state())
+        # Snapshot slots keep their numbers; a screen that has gone away is saved empty. A screen that hasn't
+        #  journaled anything yet (e.g. one that took over a missing screen's boxes on resume) gets a new slot,
+        #  which the snapshot itself declares.
+        for name in state:
+            self.slots.setdefault(name, len(self.slots))
+        session = [
+            (name, state[name] if name in state else BoxStore()) for name in sorted(self.slots, key=self.slots.get)
+        ]
+        self._put(session)
+
+    def close(self):
+        """Compacts (if anything was journaled) and waits for the writer to finish."""
+        if self.thread is None:
+            return
+        self.compact()
+        self.queue.put(None)
+        self.thread.join()
+        self.thread = None
+
+    def _put(self, item):
+        if self.thread is None:
+            self.thread = threading.Thread(target=self._run, name="pixelbox-journal", daemon=True)
+            self.thread.start()
+        self.queue.put(item)
+
+    # Everything below runs on the writer thread.
+
+    def _run(self):
+        last_sync = time.monotonic()
+        unsynced = False
+        while True:
+            timeout = max(0.0, FSYNC_INTERVAL - (time.monotonic() - last_sync)) if unsynced else None
+            try:
+                items = [self.queue.get(timeout=timeout)]
+            except queue.Empty:
+                items = []
+            # Drain whatever else is waiting, so a burst of boxes becomes one write.
+            while True:
+                try:
+                    items.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = None in items
+            batch: List[bytes] = []
+            try:
+                for item in items:
+                    if isinstance(item, bytes):
+                        batch.append(item)
+                    elif item is not None:
+                        self._append(batch)
+                        batch = []
+                        self._write_snapshot(item)
+                self._append(batch)
+                unsynced = unsynced or bool(batch)
+                if unsynced and (stop or time.monotonic() - last_sync >= FSYNC_INTERVAL):
+                    self.stream.flush()
+                    os.fsync(self.stream.fileno())
+                    last_sync = time.monotonic()
+                    unsynced = False
+            except OSError as e:
+                print(f"Session journal disabled; unable to write to '{self.directory}': {e}")
+                self.failed = True
+                stop = True
+            if stop:
+                if self.stream is not None:
+                    self.stream.close()
+                    self.stream = None
+                return
+
+    def _append(self, batch: List[bytes]):
+        if not batch:
+            return
+        if self.stream is None:
+            # First write of a fresh session: start a journal that doesn't build on the old snapshot.
+            self._open_journal(base=0)
+        self.stream.write(b"".join(batch))
+
+    def _next_generation(self) -> int:
+        """Generations only grow, across sessions too, so resume can tell which file is newer."""
+        if not self.generation:
+            generations = [0]
+            for path, header, magic in (
+                (self.journal_path, _JOURNAL_HEADER, JOURNAL_MAGIC),
+                (self.snapshot_path, _SNAPSHOT_HEADER, SNAPSHOT_MAGIC),
+            ):
+                fields = read_header(path, header, magic)
+                if fields is not None:
+                    generations.append(fields[0])
+            self.generation = max(generations)
+        self.generation += 1
+        return self.generation
+
+    def _open_journal(self, base: int):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        generation = self._next_generation()
+        if self.stream is not None:
+            self.stream.close()
+        self.stream = open(self.journal_path, "wb")
+        self.stream.write(_JOURNAL_HEADER.pack(JOURNAL_MAGIC, FORMAT_VERSION, generation, base))
+        self.stream.flush()
+        os.fsync(self.stream.fileno())
+
+    def _write_snapshot(self, session: Session):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        generation = self._next_generation()
+        temporary = self.snapshot_path.with_suffix(".tmp")
+        with open(temporary, "wb") as stream:
+            stream.write(_SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, FORMAT_VERSION, generation, len(session)))
+            for name, store in session:
+                encoded = name.encode("utf-8")
+                stream.write(struct.pack("<H", len(encoded)))
+                stream.write(encoded)
+                store.write_to(stream)
+            stream.flush()
+            os.fsync(stream.fileno())
+        # Once the snapshot is in place its generation is the newest, so resume ignores the old journal; the new
+        #  one continues from it.
+        os.replace(temporary, self.snapshot_path)
+        self._open_journal(base=generation)
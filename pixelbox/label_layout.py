@@ -0,0 +1,136 @@
+"""
+PixelBox
+Copyright (C) 2025 Travis L. Seymour, PhD
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+from typing import Dict, Iterator, Optional
+
+from PySide6.QtCore import QRect
+
+from pixelbox.render import OUTLINE_MARGIN, BoxRenderer
+from pixelbox.spatial import GridIndex
+
+# Extra rows tried above and below a box once the spots next to its corners are taken.
+STACK_DEPTH = 3
+# Grid cell size for the placed labels; finer than the box index's, since labels are only about 50 x 16.
+LABEL_CELL_SIZE = 32
+# A spot whose grid cells already hold more labels than this isn't searched: it's all but certainly taken, and
+#  on a saturated screen those cells hold thousands of stacked labels, which would make every query linear.
+CROWDED_LABELS = 24
+# Only this many labels are laid out; later ones take the usual spot, unindexed. Well before this many boxes a
+#  screen is too full for a layout to keep labels apart, and it keeps resuming, undoing a Clear, and re-laying out
+#  after a resize about as fast for 100k boxes as without any layout.
+MAX_LAID_OUT = 1000
+
+
+class LabelLayout:
+    """
+    Where each finalized box's "W x H" label goes, keyed like the overlay's boxes.
+
+    Labels are placed greedily in the order boxes were drawn: a new label takes the first candidate spot (the
+    usual one above the box first) that stays on screen and doesn't overlap an earlier label, found through a
+    grid index of the placed labels. Earlier labels never move for later ones, so adding a box lays out one
+    label, and undoing one (always the newest) frees its spot without disturbing anything else.
+    If every spot is taken, the one overlapping the least label area wins. Spots in crowded cells (see
+    CROWDED_LABELS) are skipped without a query, so placing a label costs at most a dozen small queries no
+    matter how many boxes there are; on a saturated screen, labels simply fall back to the usual spot.
+    Past MAX_LAID_OUT labels, that's where every new one goes without searching.
+    """
+
+    def __init__(self, renderer: BoxRenderer):
+        self.renderer: BoxRenderer = renderer
+        self.bounds: QRect = QRect()  # the overlay's rect; labels are kept inside it
+        self.labels: Dict[int, QRect] = {}
+        self.index: GridIndex = GridIndex(LABEL_CELL_SIZE)
+
+    def __contains__(self, key: int) -> bool:
+        return key in self.labels
+
+    def label(self, key: int) -> QRect:
+        return self.labels[key]
+
+    def clear(self):
+        self.labels.clear()
+        self.index.clear()
+
+    def add(self, key: int, rect: QRect) -> QRect:
+        if len(self.labels) >= MAX_LAID_OUT:
+            # Nothing is placed against these, so they aren't indexed (remove() tolerates that).
+            label = self.labels[key] = self.renderer.label_rect(rect)
+            return label
+        label = self.place(rect)
+        self.labels[key] = label
+        self.index.insert(key, label)
+        return label
+
+    def remove(self, key: int):
+        if self.labels.pop(key, None) is not None:
+            self.index.remove(key)
+
+    def candidates(self, rect: QRect) -> Iterator[QRect]:
+        """Spots for rect's label, most preferred first, shifted sideways to stay on screen."""
+        default = self.renderer.label_rect(rect)
+        width, height = default.width(), default.height()
+        left = default.left()
+        right = rect.right() + 3 - width + 1
+        above = rect.top() - OUTLINE_MARGIN - height
+        below = rect.bottom() + OUTLINE_MARGIN + 1
+        # The spot the fixed rule picks (above, or just below the top edge near the top of the screen) comes first.
+        yield default
+        for y in (above, below):
+            yield QRect(left, y, width, height)
+            yield QRect(right, y, width, height)
+        # Inside the box's top-left corner, when it's big enough to hold the label.
+        inside = QRect(rect.left() + OUTLINE_MARGIN, rect.top() + OUTLINE_MARGIN, width, height)
+        if rect.adjusted(OUTLINE_MARGIN, OUTLINE_MARGIN, -OUTLINE_MARGIN, -OUTLINE_MARGIN).contains(inside):
+            yield inside
+        for row in range(1, STACK_DEPTH + 1):
+            yield QRect(left, above - row * height, width, height)
+            yield QRect(left, below + row * height, width, height)
+
+    def fit(self, label: QRect) -> Optional[QRect]:
+        """label moved sideways onto the screen, or None if it sticks out at the top or bottom."""
+        if self.bounds.isEmpty():
+            return label
+        if label.top() < self.bounds.top() or label.bottom() > self.bounds.bottom():
+            return None
+        dx = max(self.bounds.left() - label.left(), min(0, self.bounds.right() - label.right()))
+        return label.translated(dx, 0)
+
+    def overlap(self, label: QRect) -> int:
+        """Area of label covered by already placed labels."""
+        area = 0
+        for key in self.index.query(label):
+            covered = label.intersected(self.labels[key])
+            area += covered.width() * covered.height()
+        return area
+
+    def place(self, rect: QRect) -> QRect:
+        """Where rect's label would go now; nothing is stored (the live box uses this on every frame)."""
+        if len(self.labels) >= MAX_LAID_OUT:
+            return self.renderer.label_rect(rect)
+        best: Optional[QRect] = None
+        best_overlap = 0
+        for candidate in self.candidates(rect):
+            label = self.fit(candidate)
+            if label is None or self.index.crowded(label, CROWDED_LABELS):
+                continue
+            overlap = self.overlap(label)
+            if overlap == 0:
+                return label
+            if best is None or overlap < best_overlap:
+                best, best_overlap = label, overlap
+        return best if best is not None else self.renderer.label_rect(rect)
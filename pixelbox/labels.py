@@ -0,0 +1,95 @@
+"""
+PixelBox
+Copyright (C) 2025 Travis L. Seymour, PhD
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, Tuple
+
+from PySide6.QtGui import QColor, QFont, QFontMetrics, QPainter, QPixmap
+
+
+@lru_cache(maxsize=4096)
+def dimension_text(width: int, height: int, device_pixel_ratio: float) -> str:
+    """The "W x H" label for a box of the given logical size, in device pixels."""
+    return f"{int(width * device_pixel_ratio)} x {int(height * device_pixel_ratio)}"
+
+
+class LabelCache:
+    """
+    Pre-rendered dimension labels (yellow background box with black text), keyed by (text, font, DPR)
+    and evicted least-recently-used. Drawing a cached label is a single pixmap blit.
+    Font metrics are computed once per font and shared by every label in that font.
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries: int = max_entries
+        self._labels: OrderedDict[Tuple[str, str, float], QPixmap] = OrderedDict()
+        self._metrics: Dict[str, QFontMetrics] = {}
+        self.hits: int = 0
+        self.misses: int = 0
+
+    def __len__(self) -> int:
+        return len(self._labels)
+
+    def metrics(self, font: QFont) -> QFontMetrics:
+        key = font.key()
+        metrics = self._metrics.get(key)
+        if metrics is None:
+            metrics = QFontMetrics(font)
+            self._metrics[key] = metrics
+        return metrics
+
+    def label(self, text: str, font: QFont, device_pixel_ratio: float) -> QPixmap:
+        key = (text, font.key(), device_pixel_ratio)
+        pixmap = self._labels.get(key)
+        if pixmap is not None:
+            self.hits += 1
+            self._labels.move_to_end(key)
+            return pixmap
+
+        self.misses += 1
+        pixmap = self._render(text, font, device_pixel_ratio)
+        self._labels[key] = pixmap
+        if len(self._labels) > self.max_entries:
+            self._labels.popitem(last=False)
+        return pixmap
+
+    def _render(self, text: str, font: QFont, device_pixel_ratio: float) -> QPixmap:
+        font_metrics = self.metrics(font)
+        width = font_metrics.horizontalAdvance(text) + 6  # Add padding
+        height = font_metrics.height() + 2
+        pixmap = QPixmap(round(width * device_pixel_ratio), round(height * device_pixel_ratio))
+        pixmap.setDevicePixelRatio(device_pixel_ratio)
+        # Yellow background for text
+        pixmap.fill(QColor("yellow"))
+
+        # Black text on top
+        painter = QPainter(pixmap)
+        painter.setFont(font)
+        painter.setPen(QColor("black"))
+        painter.drawText(3, font_metrics.ascent(), text)
+        painter.end()
+        return pixmap
+
+    def clear(self):
+        self._labels.clear()
+        self._metrics.clear()
+
+
+# Shared by all overlays so identical labels are only rendered once per process.
+LABEL_CACHE = LabelCache()
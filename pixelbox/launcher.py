@@ -0,0 +1,131 @@
+"""
+PixelBox
+Copyright (C) 2025 Travis L. Seymour, PhD
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import json
+import os
+import platform
+import threading
+from pathlib import Path
+from typing import Dict, Optional
+
+from PySide6.QtCore import QTimer
+
+from pixelbox.version import get_version
+
+# How long after the windows are shown before (re)registering the launcher, so it never delays the first frame.
+LAUNCHER_CHECK_DELAY_MS = 1000
+
+
+def state_dir() -> Path:
+    """Per-user directory for PixelBox state files ($XDG_STATE_HOME/pixelbox, or ~/.local/state/pixelbox)."""
+    base = os.environ.get("XDG_STATE_HOME") or str(Path.home() / ".local" / "state")
+    return Path(base) / "pixelbox"
+
+
+def launcher_stamp_path(app_name: str) -> Path:
+    return state_dir() / f"{app_name}-launcher.json"
+
+
+def launcher_stamp(app_name: str) -> Dict[str, str]:
+    """What a launcher registration is valid for: this install location and version, on this OS."""
+    return {
+        "app_name": app_name,
+        "install_path": str(Path(__file__).resolve().parent),
+        "version": get_version(),
+        "platform": platform.system(),
+    }
+
+
+def launcher_is_current(app_name: str) -> bool:
+    """True if the launcher was registered by this same install and version. Touches only the stamp file."""
+    try:
+        return json.loads(launcher_stamp_path(app_name).read_text()) == launcher_stamp(app_name)
+    except (OSError, ValueError):
+        return False
+
+
+def write_launcher_stamp(app_name: str):
+    stamp_path = launcher_stamp_path(app_name)
+    try:
+        stamp_path.parent.mkdir(parents=True, exist_ok=True)
+        stamp_path.write_text(json.dumps(launcher_stamp(app_name)))
+    except OSError as e:
+        print(f"Unable to write launcher stamp '{stamp_path}': {e}")
+
+
+def ensure_launcher(app_name: str, app_title: Optional[str] = ""):
+    """Creates the OS launcher if it's missing, then records the stamp. This is the slow path."""
+    system = platform.system()
+    if system == "Linux":
+        from pixelbox.linux_launcher import create_linux_desktop_entry, linux_desktop_entry_exists
+
+        if not linux_desktop_entry_exists(app_name):
+            create_linux_desktop_entry(app_name, app_title)
+        if not linux_desktop_entry_exists(app_name):
+            return  # Not installed as a uv tool (e.g. running from source); try again next launch.
+    elif system == "Darwin":
+        from pixelbox.macos_launcher import create_macos_app_launcher, macos_launcher_exists
+
+        if not macos_launcher_exists(app_name):
+            create_macos_app_launcher(app_name, app_title)
+    elif system == "Windows":
+        from pixelbox.windows_launcher import create_windows_shortcut, windows_shortcut_exists
+
+        if not windows_shortcut_exists(app_name):
+            create_windows_shortcut(app_name, app_title)
+    else:
+        return
+    write_launcher_stamp(app_name)
+
+
+def schedule_launcher_check(app_name: str, app_title: Optional[str] = ""):
+    """
+    Makes sure the OS launcher exists without slowing startup. If the stamp matches this install, nothing
+    else is touched. Otherwise registration runs once the windows are up: on a background thread on Linux,
+    and on the GUI thread elsewhere (the macOS path shows a message box, the Windows path uses COM).
+    """
+    if launcher_is_current(app_name):
+        return
+
+    def start():
+        if platform.system() == "Linux":
+            threading.Thread(target=ensure_launcher, args=(app_name, app_title), daemon=True).start()
+        else:
+            ensure_launcher(app_name, app_title)
+
+    QTimer.singleShot(LAUNCHER_CHECK_DELAY_MS, start)
+
+
+def remove_launcher(app_name: str):
+    system = platform.system()
+    if system == "Linux":
+        from pixelbox.linux_launcher import linux_desktop_entry_exists, remove_linux_desktop_entry
+
+        if linux_desktop_entry_exists(app_name):
+            remove_linux_desktop_entry(app_name)
+    elif system == "Darwin":
+        from pixelbox.macos_launcher import macos_launcher_exists, remove_macos_app_launcher
+
+        if macos_launcher_exists(app_name):
+            remove_macos_app_launcher(app_name)
+    elif system == "Windows":
+        from pixelbox.windows_launcher import remove_windows_shortcut, windows_shortcut_exists
+
+        if windows_shortcut_exists(app_name):
+            remove_windows_shortcut(app_name)
+    launcher_stamp_path(app_name).unlink(missing_ok=True)
@@ -0,0 +1,98 @@
+"""
+PixelBox
+Copyright (C) 2025 Travis L. Seymour, PhD
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import math
+from typing import Optional
+
+from PySide6.QtCore import QPoint, QRect, Qt
+from PySide6.QtGui import QColor, QImage, QPainter, QPen
+
+# Each sampled screen pixel is drawn as a ZOOM x ZOOM block.
+LOUPE_ZOOM = 8
+# Pixels sampled on each side of the one under the pointer (so a 15 x 15 pixel sample).
+LOUPE_RADIUS = 7
+# Height of the coordinate strip under the zoomed pixels.
+LOUPE_LABEL_HEIGHT = 20
+# Gap between the pointer and the loupe.
+LOUPE_OFFSET = 24
+
+
+class Loupe:
+    """
+    Nearest-neighbour magnifier drawn next to the pointer from a retained screen capture. Drawing passes a
+    source sub-rectangle of that capture to QPainter.drawImage, so no pixels are copied per move.
+    """
+
+    def __init__(self):
+        self.image: Optional[QImage] = None
+        self.side: int = (2 * LOUPE_RADIUS + 1) * LOUPE_ZOOM
+
+    def set_image(self, image: QImage):
+        self.image = image
+
+    def place(self, point: QPoint, bounds: QRect) -> QRect:
+        """The loupe's rect for a pointer at point: below-right of it, flipped to stay inside bounds."""
+        width, height = self.side, self.side + LOUPE_LABEL_HEIGHT
+        x, y = point.x() + LOUPE_OFFSET, point.y() + LOUPE_OFFSET
+        if x + width > bounds.right():
+            x = point.x() - LOUPE_OFFSET - width
+        if y + height > bounds.bottom():
+            y = point.y() - LOUPE_OFFSET - height
+        return QRect(x, y, width, height)
+
+    def draw(self, painter: QPainter, point: QPoint, rect: QRect):
+        dpr = self.image.devicePixelRatio() or 1.0
+        # The device pixel whose top-left corner is at point, i.e. the pixel right/below a snapped edge.
+        center_x, center_y = math.floor(point.x() * dpr), math.floor(point.y() * dpr)
+        sample = QRect(center_x - LOUPE_RADIUS, center_y - LOUPE_RADIUS, 2 * LOUPE_RADIUS + 1, 2 * LOUPE_RADIUS + 1)
+        zoom_rect = QRect(rect.x(), rect.y(), self.side, self.side)
+
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform, False)
+        painter.fillRect(rect, Qt.GlobalColor.black)
+        # Near the screen edge only part of the sample exists; draw that part where it belongs.
+        source = sample.intersected(self.image.rect())
+        if not source.isEmpty():
+            target = QRect(
+                zoom_rect.x() + (source.x() - sample.x()) * LOUPE_ZOOM,
+                zoom_rect.y() + (source.y() - sample.y()) * LOUPE_ZOOM,
+                source.width() * LOUPE_ZOOM,
+                source.height() * LOUPE_ZOOM,
+            )
+            painter.drawImage(target, self.image, source)
+
+        # Crosshair through the pixel under the pointer, outlined in black and yellow to show on any colour.
+        cell = QRect(
+            zoom_rect.x() + LOUPE_RADIUS * LOUPE_ZOOM, zoom_rect.y() + LOUPE_RADIUS * LOUPE_ZOOM, LOUPE_ZOOM, LOUPE_ZOOM
+        )
+        for color, width in ((QColor("black"), 3), (QColor("yellow"), 1)):
+            painter.setPen(QPen(color, width))
+            painter.drawLine(zoom_rect.left(), cell.center().y(), cell.left() - 1, cell.center().y())
+            painter.drawLine(cell.right() + 1, cell.center().y(), zoom_rect.right(), cell.center().y())
+            painter.drawLine(cell.center().x(), zoom_rect.top(), cell.center().x(), cell.top() - 1)
+            painter.drawLine(cell.center().x(), cell.bottom() + 1, cell.center().x(), zoom_rect.bottom())
+            painter.drawRect(cell)
+
+        # Coordinate of that pixel, in device pixels to match the box labels.
+        label_rect = QRect(rect.x(), zoom_rect.bottom() + 1, rect.width(), LOUPE_LABEL_HEIGHT)
+        painter.setPen(QColor("yellow"))
+        painter.drawText(label_rect, Qt.AlignmentFlag.AlignCenter, f"{center_x}, {center_y}")
+        painter.setPen(QPen(QColor("yellow"), 1))
+        painter.setBrush(Qt.BrushStyle.NoBrush)
+        painter.drawRect(rect.adjusted(0, 0, -1, -1))
+        painter.restore()
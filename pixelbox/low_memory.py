@@ -0,0 +1,198 @@
+"""
+PixelBox
+Copyright (C) 2025 Travis L. Seymour, PhD
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import random
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from PySide6.QtCore import QRect, Qt
+from PySide6.QtGui import QKeyEvent, QMouseEvent, QPaintEvent, QRegion, QWindow
+from PySide6.QtWidgets import QWidget
+
+# Beyond this many boxes, one window per box costs more than it saves; the overlay falls back to full mode.
+MAX_BOX_SURFACES = 256
+
+# Bytes per pixel of an ARGB32 backing store / pixmap.
+BYTES_PER_PIXEL = 4
+
+
+class InputLayer(QWindow):
+    """
+    Full-screen window that captures input for an overlay in low-memory mode, forwarding mouse and key events
+    (in the same screen-local coordinates the overlay uses) to the overlay's normal handlers. It never paints,
+    so PixelBox allocates no backing store for it, but it is still an ordinary window: a compositor blends it
+    over the whole screen (at 1% opacity, so it's practically invisible), and without one it shows as opaque.
+    Qt has no input-only window type, and a window only receives input inside its mask, so it has to cover
+    the screen to take clicks anywhere on it.
+    """
+
+    def __init__(self, overlay):
+        super().__init__(overlay.current_screen)
+        self.overlay = overlay
+        self.setFlags(Qt.WindowType.FramelessWindowHint | Qt.WindowType.WindowStaysOnTopHint | Qt.WindowType.Tool)
+        self.setOpacity(0.01)
+        self.setGeometry(overlay.current_screen.geometry())
+
+    def mousePressEvent(self, event: QMouseEvent):
+        if event.button() == Qt.MouseButton.RightButton:
+            self.overlay.show_context_menu(event.globalPosition().toPoint())
+        else:
+            self.overlay.mousePressEvent(event)
+
+    def mouseMoveEvent(self, event: QMouseEvent):
+        self.overlay.mouseMoveEvent(event)
+
+    def mouseReleaseEvent(self, event: QMouseEvent):
+        self.overlay.mouseReleaseEvent(event)
+
+    def keyPressEvent(self, event: QKeyEvent):
+        self.overlay.keyPressEvent(event)
+
+
+class BoxSurface(QWidget):
+    """
+    Small translucent top-level window showing a single box. It is sized to the box's paint bounds and
+    masked to its outline strips and label, so only those pixels are allocated and composited.
+    """
+
+    def __init__(self, overlay):
+        super().__init__(
+            None,
+            Qt.WindowType.FramelessWindowHint
+            | Qt.WindowType.WindowStaysOnTopHint
+            | Qt.WindowType.Tool
+            | Qt.WindowType.WindowTransparentForInput
+            | Qt.WindowType.WindowDoesNotAcceptFocus,
+        )
+        self.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground)
+        self.setAttribute(Qt.WidgetAttribute.WA_ShowWithoutActivating)
+        self.overlay = overlay
+        self.box: QRect = QRect()
+        self.label: Optional[QRect] = None
+        self.bounds: QRect = QRect()
+
+    def show_box(self, rect: QRect, label: Optional[QRect] = None):
+        self.box = QRect(rect)
+        self.label = label
+        self.bounds = self.overlay.renderer.box_bounds(rect, label)
+        self.setGeometry(self.bounds.translated(self.overlay.current_screen.geometry().topLeft()))
+        self.setMask(self.overlay.renderer.box_region(rect, label).translated(-self.bounds.topLeft()))
+        self.show()
+        self.update()
+
+    def paintEvent(self, event: QPaintEvent):
+        painter = self.overlay.renderer.painter(self)
+        painter.translate(-self.bounds.topLeft())
+        self.overlay.renderer.draw_box(painter, self.box, self.label)
+
+
+class BoxSurfaces:
+    """The low-memory presentation of one overlay: a full-screen input layer plus one BoxSurface per box."""
+
+    def __init__(self, overlay):
+        self.overlay = overlay
+        self.input_layer = InputLayer(overlay)
+        self.boxes: List[BoxSurface] = []
+        self.live = BoxSurface(overlay)
+        self.input_layer.show()
+        self.input_layer.requestActivate()
+
+    def add(self, rect: QRect, label: Optional[QRect] = None):
+        surface = BoxSurface(self.overlay)
+        surface.show_box(rect, label)
+        self.boxes.append(surface)
+
+    def pop(self):
+        if self.boxes:
+            self.boxes.pop().deleteLater()
+
+    def clear(self):
+        for surface in self.boxes:
+            surface.deleteLater()
+        self.boxes.clear()
+
+    def refresh(self, boxes: Iterable[Tuple[QRect, Optional[QRect]]]):
+        """Re-shows each surface for its (box, label) pair, in order."""
+        for surface, (rect, label) in zip(self.boxes, boxes):
+            surface.show_box(rect, label)
+
+    def set_opacity(self, opacity: float):
+        """Sets every box window's opacity (the input layer is left alone; it's practically invisible anyway)."""
+        for surface in [*self.boxes, self.live]:
+            surface.setWindowOpacity(opacity)
+
+    def set_live(self, rect: Optional[QRect], label: Optional[QRect] = None):
+        if rect is None:
+            self.live.hide()
+        else:
+            self.live.show_box(rect, label)
+
+    def close(self):
+        self.clear()
+        self.live.deleteLater()
+        self.input_layer.destroy()
+        self.input_layer.deleteLater()
+
+
+def region_area(region: QRegion) -> int:
+    return sum(rect.width() * rect.height() for rect in region)
+
+
+def overlay_costs(
+    overlay, screens: List[Tuple[int, int, float]], boxes_per_screen: int, seed: int = 0
+) -> Dict[str, Dict[str, int]]:
+    """
+    Estimated client memory and per-frame compositing area for both overlay modes on a given layout.
+    screens are (logical width, logical height, device pixel ratio); each gets boxes_per_screen random boxes,
+    measured with the overlay's own renderer so label sizes match what would be drawn.
+
+    Full mode keeps, per screen, an ARGB backing store plus the retained box layer, and the compositor blends
+    the whole screen. Low-memory mode keeps one backing store per box sized to its bounds (the input layer
+    never paints), but the compositor still blends the full-screen input layer as well as the masked outline
+    strips and labels.
+    """
+    rng = random.Random(seed)
+    full = {"memory_bytes": 0, "blended_pixels": 0, "windows": 0}
+    low = {"memory_bytes": 0, "blended_pixels": 0, "windows": 0}
+    for width, height, dpr in screens:
+        screen_pixels = int(width * dpr) * int(height * dpr)
+        full["memory_bytes"] += 2 * screen_pixels * BYTES_PER_PIXEL
+        full["blended_pixels"] += screen_pixels
+        full["windows"] += 1
+        low["blended_pixels"] += screen_pixels  # the input layer
+        low["windows"] += 1 + boxes_per_screen
+        for _ in range(boxes_per_screen):
+            w, h = rng.randint(20, width // 4), rng.randint(20, height // 4)
+            rect = QRect(rng.randint(0, width - w), rng.randint(0, height - h), w, h)
+            bounds: QRect = overlay.renderer.box_bounds(rect)
+            low["memory_bytes"] += int(bounds.width() * dpr) * int(bounds.height() * dpr) * BYTES_PER_PIXEL
+            low["blended_pixels"] += int(region_area(overlay.renderer.box_region(rect)) * dpr * dpr)
+    return {"full": full, "low_memory": low}
+
+
+def format_overlay_costs(costs: Dict[str, Dict[str, int]], screens: List[Tuple[int, int, float]], boxes: int) -> str:
+    layout = " + ".join(f"{int(w * dpr)}x{int(h * dpr)}" for w, h, dpr in screens)
+    lines = [
+        f"Overlay cost estimate for {layout}, {boxes} boxes per screen",
+        f"  {'mode':<12}{'windows':>9}{'client MiB':>12}{'blended Mpx/frame':>20}",
+    ]
+    for mode, cost in costs.items():
+        lines.append(
+            f"  {mode:<12}{cost['windows']:>9}{cost['memory_bytes'] / 2**20:>12.1f}"
+            f"{cost['blended_pixels'] / 1e6:>20.2f}"
+        )
+    return "\n".join(lines)
@@ -16,16 +16,42 @@ You should have received a copy of the GNU General Public License
 along with this program.  If not, see <https://www.gnu.org/licenses/>.
 """
 
+# Imported first so the startup profile covers all of the imports below.
+from pixelbox.profiling import STARTUP
+
+import argparse
 import os
 import platform
 import sys
-from typing import Optional, List
-
-from pixelbox.linux_launcher import remove_linux_desktop_entry, linux_desktop_entry_exists, create_linux_desktop_entry
-from pixelbox.macos_launcher import macos_launcher_exists, create_macos_app_launcher, remove_macos_app_launcher
-from pixelbox.windows_launcher import windows_shortcut_exists, create_windows_shortcut, remove_windows_shortcut
-from pixelbox.resource import get_resource
-from pixelbox.version import __version__
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Dict, Optional, List, Set, Tuple
+
+from pixelbox.boxstore import ADD, CLEAR, REDO, UNDO, BoxStore
+from pixelbox.capture import CAPTURE_DELAY_MS, ScreenCapture, capture_screen
+from pixelbox.diagnostics import DIAGNOSTICS, TRACE, input_handler
+from pixelbox.frame_scheduler import FrameScheduler
+from pixelbox.guides import GUIDE_TOLERANCE, AlignmentGuides
+from pixelbox.imageops import numpy_available
+from pixelbox.label_layout import LabelLayout
+from pixelbox.launcher import remove_launcher, schedule_launcher_check, state_dir
+from pixelbox.render import OUTLINE_MARGIN, BoxRenderer
+from pixelbox.resident import RESIDENT_COMMANDS
+from pixelbox.resource import RESOURCES
+from pixelbox.spatial import GridIndex
+from pixelbox.version import get_version
+
+# Optional features (exports, diffs, edge snapping, element detection, the loupe, low-memory mode, the session
+#  journal) are imported where they're first used, so startup doesn't pay for the ones a session never touches.
+if TYPE_CHECKING:
+    from pixelbox.edges import EdgeSnapper
+    from pixelbox.diff import DiffSignals
+    from pixelbox.elements import ElementFinder
+    from pixelbox.export import ExportQueue
+    from pixelbox.journal import Session, SessionJournal
+    from pixelbox.loupe import Loupe
+    from pixelbox.low_memory import BoxSurfaces
+    from pixelbox.measurements import MeasurementSnapshot
 
 # This has to be set, I think, before importing QApplication
 if sys.platform.startswith("linux"):
@@ -42,11 +68,10 @@ from PySide6.QtWidgets import (
     QFileDialog,
     QMessageBox,
     QTextEdit,
+    QLabel,
 )
 from PySide6.QtGui import (
     QPainter,
-    QPen,
-    QColor,
     QScreen,
     QCursor,
     QPixmap,
@@ -58,53 +83,103 @@ from PySide6.QtGui import (
     QFont,
     QShowEvent,
     QAction,
-    QFontMetrics,
     QIcon,
+    QRegion,
+    QImage,
+    QKeySequence,
+    QPen,
+    QColor,
+    QResizeEvent,
 )
-from PySide6.QtCore import Qt, QRect, QEvent, QPoint
-
-
-def create_yellow_hand_cursor():
-    pixmap = QPixmap(get_resource("yellow_hand_cursor.png"))
-    if pixmap.isNull():
-        # Failed to load 'yellow_hand_cursor.png'. Using default cursor.
-        return QCursor(Qt.CursorShape.PointingHandCursor)
-    normal_size = 32
-    pixmap = pixmap.scaled(
-        normal_size,
-        normal_size,
-        Qt.AspectRatioMode.KeepAspectRatio,
-        Qt.TransformationMode.SmoothTransformation,
-    )
-    # Adjust cursor hotspot. Here we set it to location of index fingertip.
-    hotspot_x = 11
-    hotspot_y = 0
-    return QCursor(pixmap, hotspot_x, hotspot_y)
+from PySide6.QtCore import Qt, QRect, QRectF, QEvent, QPoint, QTimer
+
+STARTUP.mark("imports")
+
+
+def create_yellow_hand_cursor() -> QCursor:
+    # Hotspot is set to the location of the index fingertip. Falls back to the default
+    #  pointing hand cursor if 'yellow_hand_cursor.png' fails to load.
+    return RESOURCES.cursor("yellow_hand_cursor.png", 32, 11, 0)
 
 
 class OverlayWindow(QWidget):
-    def __init__(self, tool_window):
+    def __init__(self, tool_window, screen: Optional[QScreen] = None):
         super().__init__()
         self.tool_window: ToolWindow = tool_window
         self.tool_window_location: int = 1  # in (1,2,3,4)
         # Set up a frameless, transparent window that stays on top.
         self.setWindowFlags(Qt.WindowType.FramelessWindowHint | Qt.WindowType.WindowStaysOnTopHint | Qt.WindowType.Tool)
         self.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground)
-        # Initially, set geometry to the current screen's geometry.
-        self.current_screen: QScreen = QGuiApplication.screenAt(QCursor.pos())
-        if self.current_screen:
-            self.setGeometry(self.current_screen.geometry())
-        else:
-            self.setGeometry(QApplication.primaryScreen().geometry())
-        self.rectangles: list = []
+        # Each overlay covers exactly one screen (by default, the one under the cursor), and keeps its own pixel ratio.
+        self.current_screen: QScreen = screen or QGuiApplication.screenAt(QCursor.pos()) or QApplication.primaryScreen()
+        self.setScreen(self.current_screen)
+        self.setGeometry(self.current_screen.geometry())
+        # Finalized boxes (geometry and creation time), with undo/redo.
+        self.boxes: BoxStore = BoxStore()
+        # Paint bounds (outline + label) of each live box, keyed by its BoxStore key.
+        self.box_index: GridIndex = GridIndex()
+        # Set by the 'stress' command to report how long each paintEvent takes.
+        self.paint_timer = None
+        # Called once after the next paint (see after_paint).
+        self.paint_callbacks: List[Callable[[], None]] = []
+        # Retained image of all finalized boxes and labels, so a frame only blits it and draws the live box.
+        #  Built lazily on first paint, updated incrementally as boxes are added, and partially rebuilt on removal.
+        self.box_layer: Optional[QPixmap] = None
+        # Draws boxes and labels; also owns the pixel ratio their labels are measured in.
+        self.renderer: BoxRenderer = BoxRenderer(self.font())
+        # Where each finalized box's label goes, so dense boxes don't stack their labels on top of each other.
+        self.labels: LabelLayout = LabelLayout(self.renderer)
+        # Label spot for the in-progress box, chosen the same way as for finalized ones.
+        self.live_label: Optional[QRect] = None
+        # In low-memory mode this window is destroyed, and a full-screen input layer that never paints plus one
+        #  small window per box stand in for it (see pixelbox.low_memory).
+        self.surfaces: Optional["BoxSurfaces"] = None
+        # Retained capture of the screen under the overlay, shared by edge snapping, the loupe and element
+        #  detection. PixelBox's own windows are concealed while it's taken, so none of them see its drawings.
+        self.screen_capture = ScreenCapture(self.current_screen, self, self.set_concealed)
+        # Corners snap to edges in that capture (needs NumPy). Hold Shift to bypass. The snapper is created with
+        #  the first capture it's given.
+        self.snapper: Optional["EdgeSnapper"] = None
+        self.snap_to_edges: bool = numpy_available()
+        # With element detection on, hovering highlights the UI element under the pointer and a click (without
+        #  dragging) boxes it. Off by default, since it starts worker processes. Needs NumPy.
+        self.element_finder: Optional["ElementFinder"] = None
+        self.detect_elements: bool = False
+        self.hover_point: Optional[QPoint] = None
+        self.hover_element: Optional[QRect] = None
+        self.hover_brush = QColor(0, 160, 255, 50)
+        # Diff mode boxes every region that changed between two captures of this screen (see ToolWindow.begin_diff).
+        self.diff_signals: Optional["DiffSignals"] = None
+        # Lines shown while drawing when a corner lines up with an edge or center of an existing box; within
+        #  GUIDE_TOLERANCE the corner snaps onto them. Hold Shift to bypass.
+        self.guides: AlignmentGuides = AlignmentGuides()
+        self.show_guides: bool = True
+        self.snap_to_guides: bool = True
+        self.guide_x: Optional[int] = None
+        self.guide_y: Optional[int] = None
+        self.guide_pen = QPen(QColor("magenta"), 1, Qt.PenStyle.DashLine)
+        # Magnified view of the capture next to the pointer while drawing, created with the first capture.
+        self.show_loupe: bool = True
+        self.loupe: Optional["Loupe"] = None
+        self.loupe_rect: QRect = QRect()  # where the loupe is currently drawn, empty when hidden
+        self.screen_capture.captured.connect(self.on_screen_captured)
+        # zlib level used by Save To Image, once one is chosen in the PNG Compression menu (see png_compression_level).
+        self.png_compression: Optional[int] = None
         self.drawing: bool = False
         self.start_point: Optional[QPoint] = None
         self.current_point: Optional[QPoint] = None
-        self.displays: List[QScreen] = QScreen.virtualSiblings(self.screen())
-        self.display_number: int = 0
-        self.device_pixel_ratio = 1.0
+        # The latest pointer position and whether Shift was held, not yet snapped into current_point.
+        self.raw_point: Optional[QPoint] = None
+        self.raw_free: bool = False
+        # Area currently covered by the in-progress box, so the next move can invalidate just old + new.
+        self.live_region: QRegion = QRegion()
+        # Mouse moves only record raw_point; the scheduler repaints at most once per display refresh.
+        self.frame_scheduler: FrameScheduler = FrameScheduler(self.update_live_box, self)
 
         self.setMouseTracking(True)  # For mouseMoveEvents even when no buttons are pressed.
+        self.current_screen.geometryChanged.connect(self.on_screen_geometry_changed)
+        self.current_screen.logicalDotsPerInchChanged.connect(self.refresh_device_pixel_ratio)
+        self.refresh_device_pixel_ratio()
         self.show()
 
     @staticmethod
@@ -113,34 +188,167 @@ class OverlayWindow(QWidget):
 
     def showEvent(self, event: QShowEvent):
         super().showEvent(event)
-        self.tool_window.edit.setHtml(
-            f"""
-            <p style='text-align: center;'>
-              <large><b>PixelBox Ruler<b></large><br>
-              <small>v{__version__}</small><br>
-              <small><b>Travis L. Seymour, PhD</b></small><br>
-              <b>
-              Move This Window: 1, 2, 3, 4
-              </b>
-            </p>
-            """
-        )
-        screen = QGuiApplication.screenAt(QCursor.pos())
-        if screen:
-            self.device_pixel_ratio = screen.devicePixelRatio()
-            if not self.device_pixel_ratio:
-                print(
-                    "WARNING: In PixelBox, the command screen.devicePixelRatio() returned 0. "
-                    "Something unexpected is going on, and your box sizes are unlikely to be accurate.  "
-                    "Forcing the pixel ration to 1.0."
-                )
-                self.device_pixel_ratio = 1.0
+        STARTUP.mark("first showEvent")
+        self.refresh_device_pixel_ratio()
+        self.frame_scheduler.follow_screen(self.current_screen)
+        self.refresh_capture()
 
         self.showFullScreen()
 
+    def refresh_device_pixel_ratio(self):
+        """Re-reads this overlay's screen pixel ratio. Only this overlay is re-laid out and repainted if it changed."""
+        device_pixel_ratio = self.current_screen.devicePixelRatio()
+        if not device_pixel_ratio:
+            print(
+                "WARNING: In PixelBox, the command screen.devicePixelRatio() returned 0. "
+                "Something unexpected is going on, and your box sizes are unlikely to be accurate.  "
+                "Forcing the pixel ration to 1.0."
+            )
+            device_pixel_ratio = 1.0
+        if device_pixel_ratio == self.device_pixel_ratio:
+            return
+        self.device_pixel_ratio = device_pixel_ratio
+        # Label widths depend on the pixel ratio, so the stored paint bounds and box layer are stale.
+        self.reindex_boxes()
+        self.box_layer = None
+        self.update()
+
+    def set_low_memory(self, enabled: bool):
+        if enabled == (self.surfaces is not None):
+            return
+        if enabled:
+            from pixelbox.low_memory import BoxSurfaces
+
+            self.surfaces = BoxSurfaces(self)
+            self.surfaces.input_layer.setCursor(create_yellow_hand_cursor())
+            for key in self.boxes.keys():
+                self.surfaces.add(self.boxes.rect(key), self.labels.label(key))
+            # Release the full-screen backing store and the retained box layer.
+            self.box_layer = None
+            self.hide()
+            self.destroy()
+        else:
+            self.surfaces.close()
+            self.surfaces = None
+            self.show()
+
+    def on_screen_geometry_changed(self, geometry: QRect):
+        self.setGeometry(geometry)
+        self.refresh_device_pixel_ratio()
+        if self.snapper is not None:
+            self.snapper.invalidate()
+        if self.element_finder is not None:
+            self.element_finder.invalidate()
+        self.refresh_capture()
+
+    def refresh_capture(self):
+        """Asks for a fresh capture of the screen, if anything uses it. The edge map is only rebuilt if it changed."""
+        if self.snap_to_edges or self.show_loupe or self.detect_elements:
+            self.screen_capture.request()
+
+    def set_concealed(self, concealed: bool):
+        """Makes this overlay's boxes, and the title window if it's on this screen, transparent for a capture."""
+        opacity = 0.0 if concealed else 1.0
+        if self.surfaces is None:
+            self.setWindowOpacity(opacity)
+        else:
+            self.surfaces.set_opacity(opacity)
+        if self.tool_window.frameGeometry().intersects(self.current_screen.geometry()):
+            self.tool_window.setWindowOpacity(opacity)
+
+    def on_screen_captured(self, image: QImage):
+        if self.show_loupe and self.loupe is None:
+            from pixelbox.loupe import Loupe
+
+            self.loupe = Loupe()
+        if self.loupe is not None:
+            self.loupe.set_image(image)
+        if self.snap_to_edges:
+            if self.snapper is None:
+                from pixelbox.edges import EdgeSnapper
+
+                self.snapper = EdgeSnapper(self)
+            self.snapper.submit(image)
+        if self.detect_elements:
+            if self.element_finder is None:
+                from pixelbox.elements import ElementFinder
+
+                self.element_finder = ElementFinder(self)
+            self.element_finder.submit(image)
+
+    def on_diff_finished(self, regions: List[QRect], error: str):
+        if error:
+            self.tool_window.set_export_status(f"Diff failed: {error}")
+        else:
+            self.update(self.add_boxes(regions))
+            self.tool_window.set_export_status(f"Diff: boxed {len(regions)} changed region{'s' * (len(regions) != 1)}")
+        self.tool_window.export_status_timer.start()
+
+    def set_loupe(self, enabled: bool):
+        self.show_loupe = enabled
+        self.refresh_capture()
+
+    def loupe_visible(self) -> bool:
+        return self.show_loupe and self.loupe is not None
+
+    def set_snap_to_edges(self, enabled: bool):
+        if enabled and not numpy_available():
+            print("Snapping to edges needs NumPy: pip install 'pixelbox[snap]'")
+            return
+        self.snap_to_edges = enabled
+        self.refresh_capture()
+
+    def set_detect_elements(self, enabled: bool):
+        if enabled and not numpy_available():
+            print("Detecting UI elements needs NumPy: pip install 'pixelbox[snap]'")
+            return
+        self.detect_elements = enabled
+        if not enabled:
+            self.hover_point = None
+        self.refresh_capture()
+        self.update_live_box()
+
+    def set_guides(self, enabled: bool):
+        self.show_guides = enabled
+        self.guide_x = self.guide_y = None
+        self.update_live_box()
+
+    @staticmethod
+    def is_free(event: QMouseEvent) -> bool:
+        """Holding Shift places the point exactly where the pointer is."""
+        return bool(event.modifiers() & Qt.KeyboardModifier.ShiftModifier)
+
+    def snap_point(self, point: QPoint, free: bool) -> QPoint:
+        if self.snap_to_edges and self.snapper is not None and not free:
+            point = self.snapper.snap(point)
+        if self.show_guides:
+            # Without snapping, a guide only shows on exact alignment.
+            snap = self.snap_to_guides and not free
+            self.guide_x, self.guide_y = self.guides.align(point.x(), point.y(), GUIDE_TOLERANCE if snap else 0)
+            if snap:
+                point = QPoint(
+                    point.x() if self.guide_x is None else self.guide_x,
+                    point.y() if self.guide_y is None else self.guide_y,
+                )
+        return point
+
+    def guide_region(self) -> QRegion:
+        """Where the current guide lines are drawn: full-width/height strips, a pixel of slack on each side."""
+        region = QRegion()
+        if self.guide_x is not None:
+            region = region.united(QRect(self.guide_x - 1, 0, 3, self.height()))
+        if self.guide_y is not None:
+            region = region.united(QRect(0, self.guide_y - 1, self.width(), 3))
+        return region
+
+    def event(self, event: QEvent) -> bool:
+        if event.type() == QEvent.Type.DevicePixelRatioChange:
+            self.refresh_device_pixel_ratio()
+        return super().event(event)
+
     def move_tool_window(self, quadrant: int):
         if 1 <= quadrant <= 4:
-            display: QRect = self.displays[self.display_number].availableGeometry()
+            display: QRect = self.current_screen.availableGeometry()
             if quadrant == 1:
                 self.tool_window.move(display.left(), display.top())
             elif quadrant == 2:
@@ -149,52 +357,147 @@ class OverlayWindow(QWidget):
                 self.tool_window.move(display.left(), display.bottom())
             elif quadrant == 4:
                 self.tool_window.move(display.right() - self.tool_window.width(), display.bottom())
+            self.tool_window.show_info()
 
+    @input_handler
     def mousePressEvent(self, event: QMouseEvent):
         if event.button() != Qt.MouseButton.LeftButton:
             return
         # Start drawing immediately on left-button press.
-        point: QPoint = event.position().toPoint()
+        self.screen_capture.pause()
+        point: QPoint = self.snap_point(event.position().toPoint(), self.is_free(event))
+        self.raw_point = None
         self.start_point = point
         self.current_point = point
         self.drawing = True
-        self.update()
+        self.update_live_box()
 
+    @input_handler
     def mouseMoveEvent(self, event: QMouseEvent):
         if self.drawing:
-            # Update the current endpoint as the mouse moves.
-            self.current_point = event.position().toPoint()
-            self.update()
-
+            # Only the point is recorded; snapping happens once per frame, in update_live_box.
+            self.raw_point = event.position().toPoint()
+            self.raw_free = self.is_free(event)
+            self.frame_scheduler.request_frame()
+        elif self.detect_elements:
+            # Only the point is recorded; the lookup happens once per frame, in update_live_box.
+            self.hover_point = event.position().toPoint()
+            self.frame_scheduler.request_frame()
+
+    @input_handler
     def mouseReleaseEvent(self, event: QMouseEvent):
         if event.button() != Qt.MouseButton.LeftButton:
             return
         if self.drawing:
             # Finalize the rectangle when the left mouse button is released.
-            self.current_point = event.position().toPoint()
+            self.frame_scheduler.cancel()
+            self.raw_point = None
+            self.current_point = self.snap_point(event.position().toPoint(), self.is_free(event))
             rect: QRect = QRect(self.start_point, self.current_point).normalized()
+            if self.start_point == self.current_point and self.hover_element is not None:
+                # A click (no drag) boxes the highlighted element.
+                rect = QRect(self.hover_element)
+            dirty: QRegion = self.live_region.united(self.loupe_rect)
+            self.loupe_rect = QRect()
             if rect.width() > 0 and rect.height() > 0:
-                self.rectangles.append(rect)
+                dirty = dirty.united(self.add_box(rect))
             self.drawing = False
             self.start_point = None
             self.current_point = None
-            self.update()
+            self.hover_element = None  # the highlight went away on press; the next move brings it back
+            self.guide_x = self.guide_y = None
+            self.live_region = QRegion()
+            if self.surfaces is not None:
+                self.surfaces.set_live(None)
+            self.update(dirty)
+            # Only a capture that came due during the drag is taken now; drawing a box doesn't change the screen.
+            self.screen_capture.resume()
 
     def contextMenuEvent(self, event: QContextMenuEvent):
+        self.show_context_menu(event.globalPos())
+
+    def show_context_menu(self, global_pos: QPoint):
         menu: QMenu = QMenu(self)
         save_action: QAction = menu.addAction("Save To Image")
-        clear_last_action: QAction = menu.addAction("Clear Last Box")
+        export_action: QAction = menu.addAction("Export Measurements")
+        compression_menu: QMenu = menu.addMenu("PNG Compression")
+        compression_actions = []
+        from pixelbox.export import PNG_COMPRESSION_LEVELS
+
+        for name, level in PNG_COMPRESSION_LEVELS.items():
+            compression_action: QAction = compression_menu.addAction(f"{name} ({level})")
+            compression_action.setCheckable(True)
+            compression_action.setChecked(level == self.png_compression_level())
+            compression_actions.append((compression_action, level))
+        undo_action: QAction = menu.addAction("Undo")
+        undo_action.setShortcut(QKeySequence.StandardKey.Undo)
+        undo_action.setEnabled(self.boxes.can_undo)
+        redo_action: QAction = menu.addAction("Redo")
+        redo_action.setShortcut(QKeySequence.StandardKey.Redo)
+        redo_action.setEnabled(self.boxes.can_redo)
         clear_all_action: QAction = menu.addAction("Clear All Boxes")
+        refresh_action: QAction = menu.addAction("Refresh Screen Capture")
+        refresh_action.setEnabled(self.snap_to_edges or self.show_loupe or self.detect_elements)
+        diff_action: QAction = menu.addAction("Box Changes (Diff)")
+        diff_action.setEnabled(numpy_available())
+        snap_action: QAction = menu.addAction("Snap To Edges")
+        snap_action.setCheckable(True)
+        snap_action.setChecked(self.snap_to_edges)
+        snap_action.setEnabled(numpy_available())
+        guides_action: QAction = menu.addAction("Alignment Guides")
+        guides_action.setCheckable(True)
+        guides_action.setChecked(self.show_guides)
+        snap_guides_action: QAction = menu.addAction("Snap To Guides")
+        snap_guides_action.setCheckable(True)
+        snap_guides_action.setChecked(self.snap_to_guides)
+        snap_guides_action.setEnabled(self.show_guides)
+        elements_action: QAction = menu.addAction("Detect Elements")
+        elements_action.setCheckable(True)
+        elements_action.setChecked(self.detect_elements)
+        elements_action.setEnabled(numpy_available())
+        loupe_action: QAction = menu.addAction("Magnifier Loupe")
+        loupe_action.setCheckable(True)
+        loupe_action.setChecked(self.show_loupe)
+        low_memory_action: QAction = menu.addAction("Low-Memory Mode")
+        low_memory_action.setCheckable(True)
+        low_memory_action.setChecked(self.tool_window.low_memory)
+        hide_action: Optional[QAction] = menu.addAction("Hide") if self.tool_window.resident else None
         quit_action: QAction = menu.addAction("Quit")
-        action: QAction = menu.exec(event.globalPos())
+        action: QAction = menu.exec(global_pos)
         if action == save_action:
             self.save_to_image()
-        elif action == clear_last_action:
-            self.clear_last_box()
+        elif action == export_action:
+            self.export_measurements()
+        elif action == undo_action:
+            self.undo()
+        elif action == redo_action:
+            self.redo()
         elif action == clear_all_action:
             self.clear_all_boxes()
+        elif action == refresh_action:
+            self.refresh_capture()
+        elif action == diff_action:
+            self.tool_window.begin_diff(self)
+        elif action == snap_action:
+            self.set_snap_to_edges(snap_action.isChecked())
+        elif action == guides_action:
+            self.set_guides(guides_action.isChecked())
+        elif action == snap_guides_action:
+            self.snap_to_guides = snap_guides_action.isChecked()
+        elif action == elements_action:
+            self.set_detect_elements(elements_action.isChecked())
+        elif action == loupe_action:
+            self.set_loupe(loupe_action.isChecked())
+        elif action == low_memory_action:
+            self.tool_window.set_low_memory(low_memory_action.isChecked())
         elif action == quit_action:
             QApplication.quit()
+        elif action is not None and action == hide_action:
+            self.tool_window.set_dormant(True)
+        else:
+            for compression_action, level in compression_actions:
+                if action == compression_action:
+                    self.png_compression = level
 
     def save_to_image(self):
         # Open a file dialog defaulting to 'selected_regions.png'
@@ -202,108 +505,344 @@ class OverlayWindow(QWidget):
             self, "Save Overlay Image", "selected_regions.png", "PNG Files (*.png)"
         )
         if file_name:
-            pixmap = self.grab()
-            if not pixmap.save(file_name, "PNG"):
-                QMessageBox.critical(self, "Save Error", "Failed to save the image!")
+            # Grab once on the GUI thread; the PNG encode happens on the export thread so the overlay stays usable.
+            image = self.grab().toImage()
+            from pixelbox.export import ImageExportJob
 
-    def clear_all_boxes(self):
-        self.rectangles.clear()
-        self.update()
+            self.tool_window.export_queue.submit(ImageExportJob(image, file_name, self.png_compression_level()))
 
-    def clear_last_box(self):
-        if self.rectangles:
-            self.rectangles.pop()
-            self.update()
+    def png_compression_level(self) -> int:
+        from pixelbox.export import DEFAULT_PNG_COMPRESSION
 
-    def enterEvent(self, event: QEvent):
-        # Set our custom yellow hand cursor when the mouse enters the overlay.
-        self.setCursor(create_yellow_hand_cursor())
+        return DEFAULT_PNG_COMPRESSION if self.png_compression is None else self.png_compression
 
-    def leaveEvent(self, event: QEvent):
-        # Revert to the default cursor when the mouse leaves the overlay.
-        self.unsetCursor()
+    def export_measurements(self):
+        """Writes the box list as JSON, CSV or SVG (chosen by file type) on the export thread."""
+        from pixelbox.measurements import MEASUREMENT_WRITERS, MeasurementExportJob
 
-    def draw_dimension_text(self, painter: QPainter, rect: QRect, text: str):
-        """Draws text above the rectangle unless it's near the top, then places it below with correct spacing."""
-
-        # Get text size using QFontMetrics
-        font_metrics = QFontMetrics(painter.font())
-        text_width = font_metrics.horizontalAdvance(text)
-        text_height = font_metrics.height()
+        filters = {f"{fmt.upper()} Files (*.{fmt})": fmt for fmt in MEASUREMENT_WRITERS}
+        file_name, selected_filter = QFileDialog.getSaveFileName(
+            self, "Export Measurements", "measurements.json", ";;".join(filters)
+        )
+        if file_name:
+            if Path(file_name).suffix.lower().lstrip(".") not in MEASUREMENT_WRITERS:
+                file_name += f".{filters.get(selected_filter, 'json')}"
+            self.tool_window.export_queue.submit(MeasurementExportJob(self.measurement_snapshot(), file_name))
 
-        text_x = rect.left()
+    def measurement_snapshot(self) -> "MeasurementSnapshot":
+        from pixelbox.measurements import MeasurementSnapshot
 
-        # Adjusted spacing for top/bottom positioning
-        above_offset = text_height + 6  # Move text up (was 2px, now +2px more)
-        below_offset = text_height - 20  # Move text closer when below
+        screen: Optional[QScreen] = self.screen()
+        snapshot = MeasurementSnapshot(
+            screen.name() if screen else "", self.device_pixel_ratio, self.width(), self.height()
+        )
+        snapshot.x, snapshot.y, snapshot.w, snapshot.h, snapshot.created = self.boxes.live_columns()
+        return snapshot
+
+    def add_box(self, rect: QRect, created: Optional[float] = None) -> QRegion:
+        """Appends a finalized box, indexes its paint bounds and draws it into the box layer.
+        The caller is responsible for repainting the returned region."""
+        created = time.time() if created is None else created
+        key = self.boxes.append(rect, created)
+        self.journal(ADD, rect.x(), rect.y(), rect.width(), rect.height(), created)
+        return self.boxes_restored(range(key, key + 1))
+
+    def add_boxes(self, rects: List[QRect], created: Optional[float] = None) -> QRegion:
+        """Appends many finalized boxes in one pass (one undo step each). Returns the area to repaint."""
+        if not rects:
+            return QRegion()
+        created = time.time() if created is None else created
+        for rect in rects:
+            key = self.boxes.append(rect, created)
+            self.journal(ADD, rect.x(), rect.y(), rect.width(), rect.height(), created)
+        # Appending drops any redo tail first, so the new keys end at the last one.
+        return self.boxes_restored(range(key - len(rects) + 1, key + 1))
+
+    def journal(self, op: int, *args):
+        if self.tool_window.journal is not None:
+            self.tool_window.journal.record(op, self.current_screen.name(), *args)
+
+    def restore_boxes(self, boxes: BoxStore):
+        """Replaces this overlay's boxes, history included (used to resume a session)."""
+        self.boxes = boxes
+        self.box_layer = None
+        self.guides.clear()
+        self.guides.add_many(self.boxes.geometry(key) for key in self.boxes.keys())
+        if self.surfaces is not None:
+            from pixelbox.low_memory import MAX_BOX_SURFACES
+
+            if len(boxes) > MAX_BOX_SURFACES:
+                self.tool_window.set_low_memory(False)
+        self.reindex_boxes()
+        self.update()
 
-        # Determine text position
-        if rect.top() - above_offset < 0:  # If too close to the top
-            text_y = rect.bottom() + below_offset  # Draw below, but move it up slightly
+    def boxes_restored(self, keys: range) -> QRegion:
+        """
+        Indexes boxes that just became live (drawn, redone, or brought back by undoing a clear) and draws them
+        into the box layer. They're always the newest live boxes, so drawing them on top is exact.
+        Returns the area to repaint.
+        """
+        painter = self.renderer.painter(self.box_layer) if self.box_layer is not None else None
+        if len(keys) == 1:
+            self.guides.add(*self.boxes.geometry(keys[0]))
+        else:
+            self.guides.add_many(self.boxes.geometry(key) for key in keys)
+        bounds = QRect()
+        for key in keys:
+            rect = self.boxes.rect(key)
+            # Labels are laid out in drawing order, so each new one only has to avoid those already placed.
+            label = self.labels.add(key, rect)
+            self.box_index.insert(key, self.renderer.box_bounds(rect, label))
+            bounds = bounds.united(self.box_index.bounds(key))
+            if painter is not None:
+                self.renderer.draw_box(painter, rect, label)
+        if painter is not None:
+            painter.end()
+        # One box repaints just its outline and label; many repaint their bounding rect, which is cheaper to build
+        #  than the union of thousands of small regions.
+        if len(keys) == 1:
+            dirty = self.renderer.box_region(self.boxes.rect(keys[0]), self.labels.label(keys[0]))
         else:
-            text_y = rect.top() - above_offset  # Default: Draw above with extra padding
+            dirty = QRegion(bounds)
+        if self.surfaces is not None:
+            from pixelbox.low_memory import MAX_BOX_SURFACES
+
+            if len(self.boxes) > MAX_BOX_SURFACES:
+                print(f"More than {MAX_BOX_SURFACES} boxes on one screen; leaving low-memory mode.")
+                self.tool_window.set_low_memory(False)
+            else:
+                for key in keys:
+                    self.surfaces.add(self.boxes.rect(key), self.labels.label(key))
+        return dirty
+
+    def boxes_removed(self, keys: range) -> QRegion:
+        """
+        Unindexes boxes that stopped being live (undone or cleared) and erases them from the box layer.
+        That's either the newest box or all of them. Returns the area to repaint.
+        """
+        if len(keys) == 1:
+            dirty = self.renderer.box_region(self.boxes.rect(keys[0]), self.labels.label(keys[0]))
+        else:
+            bounds = QRect()
+            for key in keys:
+                bounds = bounds.united(self.box_index.bounds(key))
+            dirty = QRegion(bounds)
+        for key in keys:
+            self.box_index.remove(key)
+        if self.boxes:
+            self.guides.remove(*self.boxes.geometry(keys[0]))
+            # The newest label; no later label was placed around it, so nothing else moves.
+            self.labels.remove(keys[0])
+        else:
+            self.guides.clear()
+            self.labels.clear()
+        if self.box_layer is not None:
+            if self.boxes:
+                self.rebuild_box_layer(dirty)
+            else:
+                self.box_layer.fill(Qt.GlobalColor.transparent)
+        if self.surfaces is not None:
+            if self.boxes:
+                self.surfaces.pop()
+            else:
+                self.surfaces.clear()
+        return dirty
+
+    def reindex_boxes(self):
+        """Lays out every label again and re-indexes the boxes, e.g. after the label size or screen changed."""
+        self.box_index.clear()
+        self.labels.clear()
+        self.labels.bounds = self.rect()
+        for key in self.boxes.keys():
+            rect = self.boxes.rect(key)
+            self.box_index.insert(key, self.renderer.box_bounds(rect, self.labels.add(key, rect)))
+        if self.surfaces is not None:
+            self.surfaces.refresh((self.boxes.rect(key), self.labels.label(key)) for key in self.boxes.keys())
+
+    def apply_box_change(self, change: Optional[Tuple[range, range]], op: int):
+        if change is None:
+            return
+        self.journal(op)
+        removed, restored = change
+        dirty = QRegion()
+        if removed:
+            dirty = dirty.united(self.boxes_removed(removed))
+        if restored:
+            dirty = dirty.united(self.boxes_restored(restored))
+        self.update(dirty)
 
-        # Ensure background box aligns correctly behind text
-        background_rect = QRect(text_x - 3, text_y, text_width + 6, text_height + 2)  # Add padding
+    def clear_all_boxes(self):
+        if self.boxes:
+            self.apply_box_change((self.boxes.clear(), range(0)), CLEAR)
+
+    def undo(self):
+        self.apply_box_change(self.boxes.undo(), UNDO)
+
+    def redo(self):
+        self.apply_box_change(self.boxes.redo(), REDO)
+
+    def boxes_at(self, point: QPoint) -> List[int]:
+        """Keys of the boxes containing point, topmost (most recent) first."""
+        return [key for key in reversed(self.box_index.query_point(point)) if self.boxes.rect(key).contains(point)]
+
+    def box_edge_at(self, point: QPoint, tolerance: int = OUTLINE_MARGIN) -> Optional[int]:
+        """Key of the topmost box whose outline passes within tolerance of point."""
+        area = QRect(point.x() - tolerance, point.y() - tolerance, 2 * tolerance + 1, 2 * tolerance + 1)
+        for key in reversed(self.box_index.query(area)):
+            rect: QRect = self.boxes.rect(key)
+            outer = rect.adjusted(-tolerance, -tolerance, tolerance, tolerance)
+            inner = rect.adjusted(tolerance, tolerance, -tolerance, -tolerance)
+            if outer.contains(point) and not inner.contains(point):
+                return key
+        return None
 
-        # Save painter state to prevent carryover issues
-        painter.save()
+    def enterEvent(self, event: QEvent):
+        # Set our custom yellow hand cursor when the mouse enters the overlay.
+        self.setCursor(create_yellow_hand_cursor())
+        self.refresh_capture()
 
-        # Draw the yellow background for text
-        painter.setBrush(QColor("yellow"))
-        painter.setPen(Qt.PenStyle.NoPen)  # No border for background
-        painter.drawRect(background_rect)
+    def changeEvent(self, event: QEvent):
+        super().changeEvent(event)
+        # Coming back to the overlay (e.g. with Alt+Tab): the screen may have changed underneath it.
+        if event.type() == QEvent.Type.ActivationChange and self.isActiveWindow():
+            self.refresh_capture()
 
-        # Draw the black text on top
-        painter.setPen(QColor("black"))
-        painter.drawText(text_x, text_y + font_metrics.ascent(), text)
+    def leaveEvent(self, event: QEvent):
+        # Revert to the default cursor when the mouse leaves the overlay.
+        self.unsetCursor()
+        if self.hover_point is not None:
+            self.hover_point = None
+            self.update_live_box()
+
+    @property
+    def device_pixel_ratio(self) -> float:
+        return self.renderer.device_pixel_ratio
+
+    @device_pixel_ratio.setter
+    def device_pixel_ratio(self, device_pixel_ratio: float):
+        self.renderer.device_pixel_ratio = device_pixel_ratio
+
+    def rebuild_box_layer(self, region: Optional[QRegion] = None):
+        """Redraws the box layer, either entirely or only inside region (e.g. where a box was removed)."""
+        dpr = self.devicePixelRatioF()
+        if region is None:
+            if self.box_layer is None or self.box_layer.size() != self.size() * dpr:
+                self.box_layer = QPixmap(self.size() * dpr)
+                self.box_layer.setDevicePixelRatio(dpr)
+            self.box_layer.fill(Qt.GlobalColor.transparent)
+            painter = self.renderer.painter(self.box_layer)
+            # Only boxes whose paint bounds reach the overlay are turned into QRects and drawn.
+            for key in self.box_index.query(self.rect()):
+                self.renderer.draw_box(painter, self.boxes.rect(key), self.labels.label(key))
+            painter.end()
+            return
 
-        # Restore the painter state
-        painter.restore()
+        painter = self.renderer.painter(self.box_layer)
+        painter.setClipRegion(region)
+        painter.setCompositionMode(QPainter.CompositionMode.CompositionMode_Clear)
+        painter.fillRect(region.boundingRect(), Qt.GlobalColor.transparent)
+        painter.setCompositionMode(QPainter.CompositionMode.CompositionMode_SourceOver)
+        for key in self.box_index.query_region(region):
+            self.renderer.draw_box(painter, self.boxes.rect(key), self.labels.label(key))
+        painter.end()
+
+    def resizeEvent(self, event: QResizeEvent):
+        super().resizeEvent(event)
+        self.box_layer = None
+        if self.labels.bounds != self.rect():
+            # Labels are kept on screen, so a new size can move them.
+            self.reindex_boxes()
+
+    def update_live_box(self):
+        """Repaints only where the in-progress box (or hover highlight) and the loupe were and where they are now."""
+        new_region = QRegion()
+        loupe_rect = QRect()
+        if self.drawing and self.raw_point is not None:
+            self.current_point = self.snap_point(self.raw_point, self.raw_free)
+            self.raw_point = None
+        if self.drawing and self.start_point and self.current_point:
+            live_rect = QRect(self.start_point, self.current_point).normalized()
+            self.live_label = self.labels.place(live_rect)
+            new_region = self.renderer.box_region(live_rect, self.live_label).united(self.guide_region())
+            if self.surfaces is not None:
+                self.surfaces.set_live(live_rect, self.live_label)
+            if self.loupe_visible():
+                loupe_rect = self.loupe.place(self.current_point, self.rect())
+        else:
+            element = None
+            if self.detect_elements and self.element_finder is not None and self.hover_point is not None:
+                element = self.element_finder.element_at(self.hover_point)
+            if element == self.hover_element and self.loupe_rect.isEmpty():
+                return  # still over the same element (or none); nothing to repaint
+            self.hover_element = element
+            if element is not None:
+                self.live_label = self.labels.place(element)
+            if self.surfaces is not None:
+                self.surfaces.set_live(element, self.live_label)
+            if element is not None:
+                # The highlight is filled, so its whole rect (not just the outline) is repainted.
+                new_region = QRegion(self.renderer.box_bounds(element, self.live_label))
+        self.update(self.live_region.united(new_region).united(self.loupe_rect).united(loupe_rect))
+        self.live_region = new_region
+        self.loupe_rect = loupe_rect
 
     def paintEvent(self, event: QPaintEvent):
-        painter = QPainter(self)
-
-        # First, draw a solid black rectangle for visibility
-        black_pen = QPen(QColor("black"), 2)
-        black_pen.setStyle(Qt.PenStyle.SolidLine)
-
-        # Then, draw a dashed yellow rectangle on top
-        yellow_pen = QPen(QColor("yellow"), 2)
-        yellow_pen.setStyle(Qt.PenStyle.DashLine)
-
-        painter.setBrush(Qt.BrushStyle.NoBrush)
+        started = time.perf_counter()
+        with TRACE.span("paintEvent", "paint", {"rects": event.region().rectCount()} if TRACE.enabled else None):
+            if self.paint_timer is None:
+                self.paint_overlay(event)
+            else:
+                with self.paint_timer:
+                    self.paint_overlay(event)
+        DIAGNOSTICS.record_paint((time.perf_counter() - started) * 1000.0)
+        if not STARTUP.finished:
+            STARTUP.finish("first paint")
+        if self.paint_callbacks:
+            callbacks, self.paint_callbacks = self.paint_callbacks, []
+            for callback in callbacks:
+                callback()
+
+    def after_paint(self, callback: Callable[[], None]):
+        """Calls callback once this overlay has next been painted, i.e. once it's really on screen."""
+        self.paint_callbacks.append(callback)
+
+    def paint_overlay(self, event: QPaintEvent):
+        if self.box_layer is None or self.box_layer.devicePixelRatio() != self.devicePixelRatioF():
+            self.rebuild_box_layer()
 
-        # Draw finalized rectangles
-        for rect in self.rectangles:
-            # Draw black solid outline first
-            painter.setPen(black_pen)
-            painter.drawRect(rect)
-
-            # Draw yellow dashed outline on top
-            painter.setPen(yellow_pen)
-            painter.drawRect(rect)
-
-            text = f"{int(rect.width() * self.device_pixel_ratio)} x {int(rect.height() * self.device_pixel_ratio)}"
-            self.draw_dimension_text(painter, rect, text)
+        painter = QPainter(self)
+        # Qt clips painting to event.region(); copying just those rects of the layer keeps a frame's cost
+        #  proportional to the exposed area rather than to the number of boxes.
+        dpr = self.box_layer.devicePixelRatio()
+        painter.setCompositionMode(QPainter.CompositionMode.CompositionMode_Source)
+        for exposed in event.region():
+            source = QRectF(exposed.x() * dpr, exposed.y() * dpr, exposed.width() * dpr, exposed.height() * dpr)
+            painter.drawPixmap(QRectF(exposed), self.box_layer, source)
+        painter.setCompositionMode(QPainter.CompositionMode.CompositionMode_SourceOver)
 
         # Draw current rectangle if in progress
         if self.drawing and self.start_point and self.current_point:
-            rect = QRect(self.start_point, self.current_point).normalized()
-
-            # Draw black solid outline first
-            painter.setPen(black_pen)
-            painter.drawRect(rect)
-
-            # Draw yellow dashed outline on top
-            painter.setPen(yellow_pen)
-            painter.drawRect(rect)
-
-            text = f"{int(rect.width() * self.device_pixel_ratio)} x {int(rect.height() * self.device_pixel_ratio)}"
-            self.draw_dimension_text(painter, rect, text)
-
+            painter.setBrush(Qt.BrushStyle.NoBrush)
+            if self.guide_x is not None or self.guide_y is not None:
+                painter.setPen(self.guide_pen)
+                if self.guide_x is not None:
+                    painter.drawLine(self.guide_x, 0, self.guide_x, self.height())
+                if self.guide_y is not None:
+                    painter.drawLine(0, self.guide_y, self.width(), self.guide_y)
+            self.renderer.draw_box(painter, QRect(self.start_point, self.current_point).normalized(), self.live_label)
+        elif self.hover_element is not None:
+            painter.fillRect(self.hover_element, self.hover_brush)
+            self.renderer.draw_box(painter, self.hover_element, self.live_label)
+        if not self.loupe_rect.isEmpty() and event.region().intersects(self.loupe_rect):
+            self.loupe.draw(painter, self.current_point, self.loupe_rect)
+
+    @input_handler
     def keyPressEvent(self, event: QKeyEvent):
-        if event.key() in {Qt.Key.Key_1, Qt.KeyboardModifier.KeypadModifier | Qt.Key_1}:
+        if event.matches(QKeySequence.StandardKey.Undo):
+            self.undo()
+        elif event.matches(QKeySequence.StandardKey.Redo):
+            self.redo()
+        elif event.key() in {Qt.Key.Key_1, Qt.KeyboardModifier.KeypadModifier | Qt.Key_1}:
             self.move_tool_window(1)
         elif event.key() in {Qt.Key.Key_2, Qt.KeyboardModifier.KeypadModifier | Qt.Key_2}:
             self.move_tool_window(2)
@@ -311,6 +850,20 @@ class OverlayWindow(QWidget):
             self.move_tool_window(3)
         elif event.key() in {Qt.Key.Key_4, Qt.KeyboardModifier.KeypadModifier | Qt.Key_4}:
             self.move_tool_window(4)
+        elif event.key() == Qt.Key.Key_R:
+            self.refresh_capture()
+        elif event.key() == Qt.Key.Key_S:
+            self.set_snap_to_edges(not self.snap_to_edges)
+        elif event.key() == Qt.Key.Key_G:
+            self.set_guides(not self.show_guides)
+        elif event.key() == Qt.Key.Key_L:
+            self.set_loupe(not self.show_loupe)
+        elif event.key() == Qt.Key.Key_E:
+            self.set_detect_elements(not self.detect_elements)
+        elif event.key() == Qt.Key.Key_C:
+            self.tool_window.begin_diff(self)
+        elif event.key() == Qt.Key.Key_D:
+            self.tool_window.set_diagnostics_visible(not self.tool_window.diagnostics.isVisible())
         else:
             super().keyPressEvent(event)
 
@@ -324,44 +877,433 @@ class ToolWindow(QWidget):
         self.edit = QTextEdit()
         self.edit.setHtml("<p style='text-align: center;'><h3>PixelBox Ruler v1.0</h3></p>")
         self.edit.setReadOnly(True)
+        # One line of export (or diff mode) progress, hidden when nothing is going on.
+        self.export_status = QLabel()
+        self.export_status.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.export_status.hide()
+        # Live performance numbers (press D on the overlay, or use this window's context menu).
+        self.diagnostics = QLabel()
+        self.diagnostics.setFont(QFont("monospace", 10))
+        self.diagnostics.hide()
+        self.diagnostics_timer = QTimer(self)
+        self.diagnostics_timer.setInterval(250)
+        self.diagnostics_timer.timeout.connect(self.refresh_diagnostics)
         layout = QVBoxLayout()
         layout.addWidget(self.edit)
+        layout.addWidget(self.export_status)
+        layout.addWidget(self.diagnostics)
         self.setLayout(layout)
         self.setFixedSize(450, 150)
-        self.overlay_window = OverlayWindow(self)
-        QApplication.instance().installEventFilter(self)
+
+        # Started by the first export (see export_queue).
+        self._export_queue: Optional["ExportQueue"] = None
+        self.export_status_timer = QTimer(self)
+        self.export_status_timer.setSingleShot(True)
+        self.export_status_timer.setInterval(4000)
+        self.export_status_timer.timeout.connect(self.export_status.hide)
+        self.export_current: str = ""  # name of the file being written right now
+        # Diff mode in progress: the overlay whose screen is being compared, and its capture from before the change.
+        self.diff_overlay: Optional[OverlayWindow] = None
+        self.diff_before: Optional[QImage] = None
+
+        # Line-delimited JSON control channel for scripting and resident launches (see start_control).
+        self.control = None
+        # Hide instead of quitting, and wait for later `pixelbox --resident` launches (see start_resident).
+        self.resident: bool = False
+        # Exports requested over the control channel; their result goes to the client rather than a dialog.
+        self.scripted_exports: Set[int] = set()
+        # Records every box change so a crash doesn't lose the session (see start_journal).
+        self.journal: Optional["SessionJournal"] = None
+        # See OverlayWindow.set_low_memory; applies to every overlay, including ones for screens added later.
+        self.low_memory: bool = False
+        # Looked up once this window is on screen (see showEvent), since reading package metadata isn't free.
+        self.version: str = ""
+        # One overlay per screen, so each keeps its own pixel ratio and backing store, and repaints independently.
+        self.overlays: Dict[QScreen, OverlayWindow] = {}
+        for screen in QGuiApplication.screens():
+            self.add_overlay(screen)
+        # The overlay on the screen under the cursor at startup; also the target of commands like 'stress'.
+        self.overlay_window: OverlayWindow = self.overlays.get(
+            QGuiApplication.screenAt(QCursor.pos()), next(iter(self.overlays.values()))
+        )
+        app: QGuiApplication = QGuiApplication.instance()
+        app.screenAdded.connect(self.add_overlay)
+        app.screenRemoved.connect(self.remove_overlay)
+        self.show_info()
         self.show()
 
+    def showEvent(self, event: QShowEvent):
+        super().showEvent(event)
+        if not self.version:
+            QTimer.singleShot(0, self.show_version)
+
+    def show_version(self):
+        self.version = get_version()
+        self.show_info()
+
+    @property
+    def export_queue(self) -> "ExportQueue":
+        if self._export_queue is None:
+            from pixelbox.export import ExportQueue
+
+            self._export_queue = ExportQueue(self)
+            self._export_queue.signals.queued.connect(self.on_export_queued)
+            self._export_queue.signals.started.connect(self.on_export_started)
+            self._export_queue.signals.finished.connect(self.on_export_finished)
+        return self._export_queue
+
+    def add_overlay(self, screen: QScreen):
+        if screen not in self.overlays:
+            self.overlays[screen] = OverlayWindow(self, screen)
+            self.overlays[screen].set_low_memory(self.low_memory)
+            self.show_info()
+
+    def set_low_memory(self, enabled: bool):
+        if enabled:
+            from pixelbox.low_memory import MAX_BOX_SURFACES
+
+            if any(len(overlay.boxes) > MAX_BOX_SURFACES for overlay in self.overlays.values()):
+                print(f"Low-memory mode needs at most {MAX_BOX_SURFACES} boxes per screen.")
+                return
+        self.low_memory = enabled
+        for overlay in self.overlays.values():
+            overlay.set_low_memory(enabled)
+
+    def overlay_at_cursor(self) -> OverlayWindow:
+        return self.overlays.get(QGuiApplication.screenAt(QCursor.pos()), self.overlay_window)
+
+    def start_control(self) -> bool:
+        """Opens the control channel (pixelbox.control) on the per-user socket."""
+        if self.control is not None:
+            return True
+        from pixelbox.control import ControlServer
+
+        server = ControlServer(self)
+        if not server.listen():
+            return False
+        self.control = server
+        return True
+
+    def stop_control(self):
+        if self.control is not None:
+            self.control.close()
+            self.control = None
+
+    def start_resident(self) -> bool:
+        """
+        Keeps this instance running with its windows hidden instead of quitting, and listens for later
+        `pixelbox --resident` launches, which then only need to ask it to show the overlay again.
+        """
+        if not self.start_control():
+            return False
+        self.resident = True
+        QApplication.instance().setQuitOnLastWindowClosed(False)
+        return True
+
+    def set_dormant(self, dormant: bool):
+        """Hides the title window and every overlay (resident mode), or brings them back."""
+        self.set_overlays_visible(not dormant)
+        self.setVisible(not dormant)
+        if not dormant:
+            self.raise_()
+            self.overlay_at_cursor().activateWindow()
+
+    def set_overlays_visible(self, visible: bool):
+        for overlay in self.overlays.values():
+            if visible:
+                overlay.show()
+                overlay.set_low_memory(self.low_memory)
+            else:
+                overlay.set_low_memory(False)
+                overlay.hide()
+
+    def begin_diff(self, overlay: "OverlayWindow"):
+        """
+        Diff mode: hides the overlays and captures overlay's screen. The user then does whatever changes the
+        screen and chooses Capture After from this window's menu; every changed region gets a box.
+        """
+        if not numpy_available():
+            print("Diff mode needs NumPy: pip install 'pixelbox[snap]'")
+            return
+        self.diff_overlay = overlay
+        self.diff_before = None
+        self.set_overlays_visible(False)
+        self.set_export_status("Diff: make the change, then right-click here and choose Capture After.")
+        # Capture once the overlays are really off screen.
+        QTimer.singleShot(CAPTURE_DELAY_MS, self.capture_diff_before)
+
+    def capture_diff_before(self):
+        if self.diff_overlay is not None:
+            self.diff_before = capture_screen(self.diff_overlay.current_screen)
+
+    def capture_diff_after(self):
+        """Captures the screen again, brings the overlays back and compares the captures on a pool thread."""
+        overlay, before = self.diff_overlay, self.diff_before
+        if overlay is None or before is None:
+            return
+        after = capture_screen(overlay.current_screen)
+        self.diff_overlay = self.diff_before = None
+        self.set_overlays_visible(True)
+        self.set_export_status("Diff: comparing...")
+        # This window's status line changed between the captures; that isn't part of the diff.
+        ignore = [self.frameGeometry().translated(-overlay.current_screen.geometry().topLeft())]
+        from pixelbox.diff import DiffSignals, compare_captures
+
+        if overlay.diff_signals is None:
+            overlay.diff_signals = DiffSignals(overlay)
+            overlay.diff_signals.finished.connect(overlay.on_diff_finished)
+        compare_captures(before, after, ignore, overlay.diff_signals)
+
+    def cancel_diff(self):
+        self.diff_overlay = self.diff_before = None
+        self.set_overlays_visible(True)
+        self.export_status.hide()
+
+    def start_journal(self, resume: bool = False):
+        """Starts journaling box changes to state_dir(). With resume, first brings back the last session's boxes."""
+        from pixelbox.journal import SessionJournal
+
+        self.journal = SessionJournal(state_dir(), self.journal_state)
+        if resume:
+            started = time.perf_counter()
+            session = self.journal.load()
+            self.restore_session(session)
+            print(f"Resumed {sum(len(store) for _, store in session)} boxes in {time.perf_counter() - started:.3f}s.")
+            if session:
+                # Start the resumed session from a fresh snapshot, so the next resume is a single read too.
+                self.journal.compact()
+
+    def stop_journal(self):
+        if self.journal is not None:
+            self.journal.close()
+            self.journal = None
+
+    def journal_state(self) -> "Session":
+        return [(screen.name(), overlay.boxes.copy()) for screen, overlay in self.overlays.items()]
+
+    def restore_session(self, session: "Session"):
+        """Gives each screen its saved boxes. Boxes from screens that are gone go to the screens nobody claimed."""
+        overlays = {screen.name(): overlay for screen, overlay in self.overlays.items()}
+        saved = {name for name, _ in session}
+        unclaimed = [overlay for name, overlay in overlays.items() if name not in saved]
+        for name, store in session:
+            if not store and not store.can_undo:
+                continue
+            overlay = overlays.get(name) or (unclaimed.pop(0) if unclaimed else None)
+            if overlay is None:
+                print(f"Not restoring {len(store)} boxes from screen '{name}', which isn't connected.")
+                continue
+            overlay.restore_boxes(store)
+
+    def remove_overlay(self, screen: QScreen):
+        overlay: Optional[OverlayWindow] = self.overlays.pop(screen, None)
+        if overlay is None:
+            return
+        if overlay is self.diff_overlay:
+            self.cancel_diff()
+        overlay.set_low_memory(False)
+        overlay.close()
+        overlay.deleteLater()
+        if overlay is self.overlay_window and self.overlays:
+            self.overlay_window = self.overlays.get(QGuiApplication.primaryScreen(), next(iter(self.overlays.values())))
+        self.show_info()
+
+    def show_info(self):
+        screens: List[QScreen] = list(self.overlays)
+        current = QGuiApplication.screenAt(self.geometry().center())
+        displays = (
+            f"<small>{OverlayWindow.display_boxes(screens.index(current) if current in screens else 0, len(screens))}"
+            "</small><br>"
+            if len(screens) > 1
+            else ""
+        )
+        # Until showEvent has looked it up, a blank line keeps the layout from shifting when it arrives.
+        version = f"v{self.version}" if self.version else "&nbsp;"
+        self.edit.setHtml(
+            f"""
+            <p style='text-align: center;'>
+              <large><b>PixelBox Ruler<b></large><br>
+              <small>{version}</small><br>
+              <small><b>Travis L. Seymour, PhD</b></small><br>
+              {displays}<b>
+              Move This Window: 1, 2, 3, 4
+              </b>
+            </p>
+            """
+        )
+
+    def set_diagnostics_visible(self, visible: bool):
+        self.diagnostics.setVisible(visible)
+        if visible:
+            self.refresh_diagnostics()
+            self.diagnostics_timer.start()
+        else:
+            self.diagnostics_timer.stop()
+        self.setFixedSize(450, 150 + (self.diagnostics.sizeHint().height() if visible else 0))
+
+    def refresh_diagnostics(self):
+        box_count = sum(len(overlay.boxes) for overlay in self.overlays.values())
+        schedulers = [overlay.frame_scheduler for overlay in self.overlays.values()]
+        self.diagnostics.setText(
+            DIAGNOSTICS.summary(
+                box_count,
+                sum(scheduler.requests for scheduler in schedulers),
+                sum(scheduler.frames for scheduler in schedulers),
+            )
+        )
+
+    def set_export_status(self, text: str):
+        self.export_status_timer.stop()
+        self.export_status.setText(text)
+        self.export_status.show()
+
+    def show_export_progress(self):
+        queued = self.export_queue.pending - 1
+        self.set_export_status(f"Saving {self.export_current}..." + (f" ({queued} queued)" if queued > 0 else ""))
+
+    def on_export_queued(self, job_id: int, file_name: str):
+        if self.export_current:
+            self.show_export_progress()
+
+    def on_export_started(self, job_id: int, file_name: str):
+        self.export_current = Path(file_name).name
+        self.show_export_progress()
+
+    def on_export_finished(self, job_id: int, file_name: str, error: str):
+        self.export_current = ""
+        if error and job_id in self.scripted_exports:
+            self.export_status.hide()
+        elif error:
+            self.export_status.hide()
+            QMessageBox.critical(self, "Save Error", f"Failed to save {file_name}!\n{error}")
+        elif self.export_queue.pending == 0:
+            self.set_export_status(f"Saved {Path(file_name).name}")
+            self.export_status_timer.start()
+
     def contextMenuEvent(self, event):
         menu: QMenu = QMenu(self)
+        diff_after_action: Optional[QAction] = None
+        diff_cancel_action: Optional[QAction] = None
+        if self.diff_overlay is not None:
+            diff_after_action = menu.addAction("Capture After")
+            diff_after_action.setEnabled(self.diff_before is not None)
+            diff_cancel_action = menu.addAction("Cancel Diff")
+            menu.addSeparator()
+        diagnostics_action: QAction = menu.addAction("Show Diagnostics")
+        diagnostics_action.setCheckable(True)
+        diagnostics_action.setChecked(self.diagnostics.isVisible())
+        hide_action: Optional[QAction] = menu.addAction("Hide") if self.resident else None
         quit_action: QAction = menu.addAction("Quit")
         action: QAction = menu.exec(event.globalPos())
-        if action == quit_action:
+        if action == diagnostics_action:
+            self.set_diagnostics_visible(diagnostics_action.isChecked())
+        elif action == quit_action:
             QApplication.quit()
+        elif action is not None and action == hide_action:
+            self.set_dormant(True)
+        elif action is not None and action == diff_after_action:
+            # Capture once the menu has closed.
+            QTimer.singleShot(CAPTURE_DELAY_MS, self.capture_diff_after)
+        elif action is not None and action == diff_cancel_action:
+            self.cancel_diff()
 
     def closeEvent(self, event):
-        self.overlay_window.close()
+        if self.resident:
+            # A resident instance outlives its windows; `pixelbox --resident stop` (or Quit) ends it.
+            event.ignore()
+            self.set_dormant(True)
+            return
+        for overlay in self.overlays.values():
+            overlay.close()
         QApplication.quit()
 
 
+def parse_args(argv: List[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="pixelbox", description="Measure desktop objects by dragging dimension-labeled yellow rectangles."
+    )
+    # Not restricted with choices: like before, an unrecognized command (or a stray Qt option value) is ignored.
+    parser.add_argument(
+        "command",
+        nargs="?",
+        type=str.lower,
+        metavar="{cleanup,stress,memory-report,annotate}",
+        help="cleanup: remove the launcher before uninstalling. stress: fill the overlay with many boxes. "
+        "memory-report: estimate overlay memory use for both modes on three 4K screens. "
+        "annotate: draw boxes onto existing images without a display (see --input, --rects, --out).",
+    )
+    parser.add_argument("count", nargs="?", help="number of boxes for the stress and memory-report commands")
+    parser.add_argument(
+        "--profile-startup",
+        action="store_true",
+        help="print a breakdown of startup time, up to the first overlay paint",
+    )
+    parser.add_argument(
+        "--trace",
+        metavar="FILE",
+        help="record input, paint, label and export spans to FILE as Chrome trace-event JSON (see ui.perfetto.dev)",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="bring back the boxes (and undo history) of the last session, e.g. after a crash",
+    )
+    parser.add_argument(
+        "--resident",
+        nargs="?",
+        const="show",
+        type=str.lower,
+        choices=RESIDENT_COMMANDS,
+        help="keep running hidden after Hide or a window close, so later `pixelbox --resident` launches show "
+        "the overlay instantly; reset also clears the current screen's boxes, stop ends the resident instance",
+    )
+    parser.add_argument(
+        "--control",
+        action="store_true",
+        help="accept line-delimited JSON commands (add boxes, read measurements, export, ...) on a per-user "
+        "local socket, for scripting and test harnesses",
+    )
+    parser.add_argument(
+        "--low-memory",
+        action="store_true",
+        help="start in low-memory mode: unpainted input layers, with a small masked window per box",
+    )
+    annotate = parser.add_argument_group("annotate")
+    annotate.add_argument(
+        "--input", nargs="+", default=[], metavar="IMAGE", help="images (or glob patterns) to annotate"
+    )
+    annotate.add_argument(
+        "--rects",
+        metavar="JSON",
+        help="boxes to draw: a list of [x, y, w, h] or measurement records for every image, "
+        "or an object mapping image file names to such lists",
+    )
+    annotate.add_argument("--out", metavar="DIR", help="directory for the annotated images")
+    annotate.add_argument("--workers", type=int, metavar="N", help="worker processes (default: one per CPU)")
+    # Leave anything we don't recognize (e.g. Qt's own -platform option) for QApplication.
+    args, _ = parser.parse_known_args(argv[1:])
+    return args
+
+
 def main():
+    args = parse_args(sys.argv)
+    STARTUP.enabled = args.profile_startup
+    if args.trace:
+        TRACE.start(args.trace)
+
+    if args.command == "annotate":
+        # Headless: the workers create their own offscreen QGuiApplication, so this process needs no Qt app.
+        from pixelbox.annotate import annotate_images
+
+        if not (args.input and args.rects and args.out):
+            sys.exit("pixelbox annotate: --input, --rects and --out are required")
+        sys.exit(1 if annotate_images(args.input, args.rects, args.out, args.workers) else 0)
+
     app = QApplication(sys.argv)
+    STARTUP.mark("QApplication")
 
-    try:
-        cmd = sys.argv[1].lower()
-    except IndexError:
-        cmd = ""
-
-    if cmd == "cleanup":
-        if platform.system() == "Linux":
-            if linux_desktop_entry_exists("pixelbox"):
-                remove_linux_desktop_entry("pixelbox")
-        elif platform.system() == "Darwin":
-            if macos_launcher_exists("pixelbox"):
-                remove_macos_app_launcher("pixelbox")
-        elif platform.system() == "Linux":
-            if windows_shortcut_exists("pixelbox"):
-                remove_windows_shortcut("pixelbox")
+    if args.command == "cleanup":
+        remove_launcher("pixelbox")
         sys.exit()
 
     if platform.system() != "Linux":
@@ -372,24 +1314,69 @@ def main():
             QMessageBox.StandardButton.Ok,
         )
 
-    if platform.system() == "Linux":
-        if not linux_desktop_entry_exists("pixelbox"):
-            create_linux_desktop_entry("pixelbox", "PixelBox")
-    elif platform.system() == "Darwin":
-        if not macos_launcher_exists("pixelbox"):
-            create_macos_app_launcher("pixelbox", "PixelBox")
-    elif platform.system() == "Windows":
-        if not linux_desktop_entry_exists("pixelbox"):
-            create_windows_shortcut("pixelbox", "PixelBox")
-
     QApplication.instance().setFont(QFont("sans-serif", 14))
-    icon = QIcon(get_resource("pixel_box_icon.png"))
+    icon: QIcon = RESOURCES.icon("icon.png")
     app.setWindowIcon(icon)
+    STARTUP.mark("resources")
+
+    # Launcher registration is checked against a stamp file and, if needed, done after the windows are up.
+    schedule_launcher_check("pixelbox", "PixelBox")
+    STARTUP.mark("launcher checks")
+    STARTUP.extra.append(lambda: f"resource cache: {RESOURCES.stats()}")
 
     window = ToolWindow()
     window.setWindowIcon(icon)
 
-    sys.exit(app.exec())
+    if args.command == "stress":
+        # Fill the overlay with many boxes and report per-frame paint times while you drag.
+        from pixelbox.stress import DEFAULT_STRESS_BOXES, PaintTimer, populate_random_boxes
+
+        window.overlay_window.paint_timer = PaintTimer()
+        try:
+            count = int(args.count)
+        except (TypeError, ValueError):
+            count = DEFAULT_STRESS_BOXES
+        populate_random_boxes(window.overlay_window, count)
+
+    if args.command == "memory-report":
+        from pixelbox.low_memory import format_overlay_costs, overlay_costs
+
+        try:
+            count = int(args.count)
+        except (TypeError, ValueError):
+            count = 20
+        screens = [(3840, 2160, 1.0)] * 3
+        print(format_overlay_costs(overlay_costs(window.overlay_window, screens, count), screens, count))
+        window.close()
+        sys.exit()
+
+    if args.command != "stress":
+        # Journaled, so a crash or an accidental quit doesn't lose the boxes; --resume brings them back.
+        window.start_journal(resume=args.resume)
+
+    if args.low_memory:
+        window.set_low_memory(True)
+
+    if args.resident in ("show", "reset") and window.start_resident():
+        # Cold-start latency, for comparison with what warm launches report (see pixelbox.resident.launch).
+        window.overlay_window.after_paint(
+            lambda: print(f"PixelBox visible after {STARTUP.elapsed_ms():.1f} ms (cold start).", flush=True)
+        )
+
+    if args.control and not window.start_control():
+        window.stop_journal()
+        sys.exit(1)
+
+    exit_code = app.exec()
+    window.stop_control()
+    window.stop_journal()
+    if "pixelbox.elements" in sys.modules:
+        # Only element detection starts the segmentation workers.
+        from pixelbox.elements import shutdown_segmentation_pool
+
+        shutdown_segmentation_pool()
+    TRACE.save()
+    sys.exit(exit_code)
 
 
 if __name__ == "__main__":
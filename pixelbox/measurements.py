@@ -0,0 +1,155 @@
+"""
+PixelBox
+Copyright (C) 2025 Travis L. Seymour, PhD
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import csv
+import json
+from array import array
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, Iterator, TextIO
+
+from pixelbox.export import ExportJob
+
+MEASUREMENT_FIELDS = [
+    "index",
+    "x",
+    "y",
+    "width",
+    "height",
+    "device_x",
+    "device_y",
+    "device_width",
+    "device_height",
+    "device_pixel_ratio",
+    "screen",
+    "timestamp",
+]
+
+
+class MeasurementSnapshot:
+    """
+    Compact copy of a session's boxes for exporting off the GUI thread: four int arrays for the logical
+    geometry and a float array of creation times (seconds since the epoch), plus the screen they were drawn on.
+    """
+
+    def __init__(self, screen_name: str, device_pixel_ratio: float, width: int, height: int):
+        self.screen_name: str = screen_name
+        self.device_pixel_ratio: float = device_pixel_ratio
+        self.width: int = width  # logical size of the overlay the boxes were drawn on
+        self.height: int = height
+        self.x = array("i")
+        self.y = array("i")
+        self.w = array("i")
+        self.h = array("i")
+        self.created = array("d")
+
+    def __len__(self) -> int:
+        return len(self.x)
+
+    def append(self, x: int, y: int, w: int, h: int, created: float):
+        self.x.append(x)
+        self.y.append(y)
+        self.w.append(w)
+        self.h.append(h)
+        self.created.append(created)
+
+    def records(self) -> Iterator[Dict[str, object]]:
+        """One dict per box, generated on demand so writers never hold the whole session in memory."""
+        dpr = self.device_pixel_ratio
+        for i in range(len(self.x)):
+            x, y, w, h = self.x[i], self.y[i], self.w[i], self.h[i]
+            yield {
+                "index": i,
+                "x": x,
+                "y": y,
+                "width": w,
+                "height": h,
+                "device_x": int(x * dpr),
+                "device_y": int(y * dpr),
+                "device_width": int(w * dpr),
+                "device_height": int(h * dpr),
+                "device_pixel_ratio": dpr,
+                "screen": self.screen_name,
+                "timestamp": datetime.fromtimestamp(self.created[i], timezone.utc).isoformat(),
+            }
+
+
+def write_json(snapshot: MeasurementSnapshot, stream: TextIO):
+    stream.write("[")
+    for n, record in enumerate(snapshot.records()):
+        stream.write(",\n  " if n else "\n  ")
+        stream.write(json.dumps(record))
+    stream.write("\n]\n" if len(snapshot) else "]\n")
+
+
+def write_csv(snapshot: MeasurementSnapshot, stream: TextIO):
+    writer = csv.DictWriter(stream, fieldnames=MEASUREMENT_FIELDS)
+    writer.writeheader()
+    for record in snapshot.records():
+        writer.writerow(record)
+
+
+def write_svg(snapshot: MeasurementSnapshot, stream: TextIO):
+    """Boxes in the overlay's logical coordinates, styled like the overlay, with the device-pixel size as label."""
+    # Imported here: xml.sax pulls in urllib and email, which startup shouldn't pay for unless SVG is exported.
+    from xml.sax.saxutils import escape, quoteattr
+
+    stream.write(
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{snapshot.width}" height="{snapshot.height}" '
+        f'viewBox="0 0 {snapshot.width} {snapshot.height}" data-screen={quoteattr(snapshot.screen_name)} '
+        f'data-device-pixel-ratio="{snapshot.device_pixel_ratio}">\n'
+        "  <style>rect { fill: none; stroke-width: 2; } .solid { stroke: black; } "
+        ".dashed { stroke: yellow; stroke-dasharray: 6 3; } text { font: 14px sans-serif; }</style>\n"
+    )
+    for record in snapshot.records():
+        x, y, w, h = record["x"], record["y"], record["width"], record["height"]
+        label = f"{record['device_width']} x {record['device_height']}"
+        stream.write(
+            f'  <g id="box-{record["index"]}" data-timestamp="{record["timestamp"]}">'
+            f'<rect class="solid" x="{x}" y="{y}" width="{w}" height="{h}"/>'
+            f'<rect class="dashed" x="{x}" y="{y}" width="{w}" height="{h}"/>'
+            f'<text x="{x}" y="{max(14, y - 6)}">{escape(label)}</text></g>\n'
+        )
+    stream.write("</svg>\n")
+
+
+MEASUREMENT_WRITERS: Dict[str, Callable[[MeasurementSnapshot, TextIO], None]] = {
+    "json": write_json,
+    "csv": write_csv,
+    "svg": write_svg,
+}
+
+
+def measurement_format(file_name: str) -> str:
+    """The export format implied by file_name's suffix."""
+    suffix = Path(file_name).suffix.lower().lstrip(".")
+    if suffix not in MEASUREMENT_WRITERS:
+        raise ValueError(f"Unsupported measurement format '{suffix}'. Use one of: {', '.join(MEASUREMENT_WRITERS)}")
+    return suffix
+
+
+class MeasurementExportJob(ExportJob):
+    def __init__(self, snapshot: MeasurementSnapshot, file_name: str):
+        super().__init__(file_name)
+        self.snapshot: MeasurementSnapshot = snapshot
+        self.writer = MEASUREMENT_WRITERS[measurement_format(file_name)]
+
+    def write(self):
+        with open(self.file_name, "w", newline="", encoding="utf-8") as stream:
+            self.writer(self.snapshot, stream)
@@ -0,0 +1,69 @@
+"""
+PixelBox
+Copyright (C) 2025 Travis L. Seymour, PhD
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import time
+from typing import Callable, List, Optional, Tuple
+
+
+class StartupProfiler:
+    """
+    Records named startup phases as they complete. Each mark() closes the phase that began at the
+    previous mark (or when this module was imported, which main.py does before anything else).
+    Marking is always cheap; the breakdown is only printed when enabled (pixelbox --profile-startup).
+    """
+
+    def __init__(self):
+        self.started: float = time.perf_counter()
+        self.marks: List[Tuple[str, float]] = []
+        self.enabled: bool = False
+        self.finished: bool = False
+        # Extra lines appended to the report, e.g. resource cache statistics.
+        self.extra: List[Callable[[], str]] = []
+
+    def mark(self, phase: str):
+        """Records that phase just completed. Only the first mark of a given phase counts."""
+        if not self.finished and all(name != phase for name, _ in self.marks):
+            self.marks.append((phase, time.perf_counter()))
+
+    def elapsed_ms(self, phase: Optional[str] = None) -> float:
+        """Milliseconds from the start until phase was marked (or until now)."""
+        for name, stamp in self.marks:
+            if name == phase:
+                return (stamp - self.started) * 1000.0
+        return (time.perf_counter() - self.started) * 1000.0
+
+    def report(self) -> str:
+        lines = ["PixelBox startup profile", f"  {'phase':<24}{'ms':>10}{'total ms':>12}"]
+        previous = self.started
+        for name, stamp in self.marks:
+            lines.append(f"  {name:<24}{(stamp - previous) * 1000.0:>10.1f}{(stamp - self.started) * 1000.0:>12.1f}")
+            previous = stamp
+        lines.extend(f"  {line()}" for line in self.extra)
+        return "\n".join(lines)
+
+    def finish(self, phase: str):
+        """Marks the final phase and prints the breakdown once, if enabled."""
+        if self.finished:
+            return
+        self.mark(phase)
+        self.finished = True
+        if self.enabled:
+            print(self.report(), flush=True)
+
+
+STARTUP = StartupProfiler()
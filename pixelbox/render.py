@@ -0,0 +1,129 @@
+"""
+PixelBox
+Copyright (C) 2025 Travis L. Seymour, PhD
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+from typing import Optional
+
+from PySide6.QtCore import QRect, Qt
+from PySide6.QtGui import QColor, QFont, QFontMetrics, QPainter, QPaintDevice, QPen, QPixmap, QRegion
+
+from pixelbox.diagnostics import TRACE
+from pixelbox.labels import LABEL_CACHE, LabelCache, dimension_text
+
+PEN_WIDTH = 2
+# How far a box's stroked outline can reach outside its rect (half the pen, rounded up, plus antialiasing).
+OUTLINE_MARGIN = PEN_WIDTH + 1
+
+
+class BoxRenderer:
+    """
+    Draws PixelBox boxes (black solid outline, yellow dashed outline on top, and a "W x H" label) onto any
+    QPaintDevice: the overlay's box layer, a low-memory box surface, or an image being annotated.
+    Labels show a box's size in device pixels, i.e. its logical size times device_pixel_ratio.
+    """
+
+    def __init__(self, font: QFont, label_cache: LabelCache = LABEL_CACHE):
+        self.font: QFont = font
+        self.label_cache: LabelCache = label_cache
+        self.device_pixel_ratio: float = 1.0
+
+        # First, draw a solid black rectangle for visibility
+        self.black_pen = QPen(QColor("black"), PEN_WIDTH)
+        self.black_pen.setStyle(Qt.PenStyle.SolidLine)
+
+        # Then, draw a dashed yellow rectangle on top
+        self.yellow_pen = QPen(QColor("yellow"), PEN_WIDTH)
+        self.yellow_pen.setStyle(Qt.PenStyle.DashLine)
+
+    def painter(self, device: QPaintDevice) -> QPainter:
+        """A painter on device set up for draw_box."""
+        painter = QPainter(device)
+        painter.setFont(self.font)
+        painter.setBrush(Qt.BrushStyle.NoBrush)
+        return painter
+
+    def dimension_text(self, rect: QRect) -> str:
+        return dimension_text(rect.width(), rect.height(), self.device_pixel_ratio)
+
+    @staticmethod
+    def dimension_label_rect(font_metrics: QFontMetrics, rect: QRect, text: str) -> QRect:
+        """Returns the background box that draw_dimension_text paints for this rectangle and label text."""
+        text_width = font_metrics.horizontalAdvance(text)
+        text_height = font_metrics.height()
+
+        text_x = rect.left()
+
+        # Adjusted spacing for top/bottom positioning
+        above_offset = text_height + 6  # Move text up (was 2px, now +2px more)
+        below_offset = text_height - 20  # Move text closer when below
+
+        # Determine text position
+        if rect.top() - above_offset < 0:  # If too close to the top
+            text_y = rect.bottom() + below_offset  # Draw below, but move it up slightly
+        else:
+            text_y = rect.top() - above_offset  # Default: Draw above with extra padding
+
+        # Ensure background box aligns correctly behind text
+        return QRect(text_x - 3, text_y, text_width + 6, text_height + 2)  # Add padding
+
+    def label_rect(self, rect: QRect) -> QRect:
+        return self.dimension_label_rect(self.label_cache.metrics(self.font), rect, self.dimension_text(rect))
+
+    def box_bounds(self, rect: QRect, label: Optional[QRect] = None) -> QRect:
+        """
+        Bounding rect of everything painted for a box: its stroked outline plus its dimension label (at label, if
+        it was placed by a LabelLayout, else where label_rect puts it).
+        """
+        outline = rect.adjusted(-OUTLINE_MARGIN, -OUTLINE_MARGIN, OUTLINE_MARGIN, OUTLINE_MARGIN)
+        return outline.united(self.label_rect(rect) if label is None else label)
+
+    def box_region(self, rect: QRect, label: Optional[QRect] = None) -> QRegion:
+        """
+        Region actually painted for a box: four thin strips along its outline plus its label box.
+        The transparent interior is left out, so moving a large box only repaints its edges.
+        """
+        m = OUTLINE_MARGIN
+        region = QRegion(self.label_rect(rect) if label is None else label)
+        region = region.united(QRect(rect.left() - m, rect.top() - m, rect.width() + 2 * m, 2 * m + 1))
+        region = region.united(QRect(rect.left() - m, rect.bottom() - m, rect.width() + 2 * m, 2 * m + 1))
+        region = region.united(QRect(rect.left() - m, rect.top() - m, 2 * m + 1, rect.height() + 2 * m))
+        region = region.united(QRect(rect.right() - m, rect.top() - m, 2 * m + 1, rect.height() + 2 * m))
+        return region
+
+    def draw_dimension_text(self, painter: QPainter, rect: QRect, text: str, background_rect: Optional[QRect] = None):
+        """
+        Draws text above the rectangle unless it's near the top, then places it below with correct spacing.
+        A background_rect placed by a LabelLayout overrides that rule.
+        """
+
+        # The label (background box and text) is pre-rendered once per text/font/pixel ratio, so this is a blit.
+        with TRACE.span("draw_dimension_text", "paint"):
+            if background_rect is None:
+                background_rect = self.dimension_label_rect(self.label_cache.metrics(self.font), rect, text)
+            label: QPixmap = self.label_cache.label(text, self.font, painter.device().devicePixelRatioF())
+            painter.drawPixmap(background_rect.topLeft(), label)
+
+    def draw_box(self, painter: QPainter, rect: QRect, label: Optional[QRect] = None):
+        # Draw black solid outline first
+        painter.setPen(self.black_pen)
+        painter.drawRect(rect)
+
+        # Draw yellow dashed outline on top
+        painter.setPen(self.yellow_pen)
+        painter.drawRect(rect)
+
+        self.draw_dimension_text(painter, rect, self.dimension_text(rect), label)
@@ -0,0 +1,124 @@
+"""
+PixelBox
+Copyright (C) 2025 Travis L. Seymour, PhD
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+# This module is the console entry point. It stays importable without Qt, so the warm path never loads PySide6.
+# STARTUP is imported first so cold-start times are measured from here, as when pixelbox.main is the entry point.
+from pixelbox.profiling import STARTUP
+
+import json
+import os
+import socket
+import sys
+import tempfile
+from typing import Dict, List, Optional
+
+# Commands a resident instance accepts (pixelbox --resident [COMMAND]).
+RESIDENT_COMMANDS = ("show", "reset", "stop")
+# How long a client waits for the resident instance to confirm the overlay is visible.
+REPLY_TIMEOUT = 3.0
+
+
+def socket_path() -> str:
+    """Per-user socket the resident instance listens on ($XDG_RUNTIME_DIR/pixelbox.sock where available)."""
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir and os.path.isdir(runtime_dir):
+        return os.path.join(runtime_dir, "pixelbox.sock")
+    uid = os.getuid() if hasattr(os, "getuid") else os.getlogin()
+    return os.path.join(tempfile.gettempdir(), f"pixelbox-{uid}.sock")
+
+
+def encode_message(message: Dict) -> bytes:
+    """Messages are one JSON object per line, in both directions."""
+    return json.dumps(message, separators=(",", ":")).encode("utf-8") + b"\n"
+
+
+def send_request(message: Dict, timeout: float = REPLY_TIMEOUT) -> Optional[Dict]:
+    """
+    Sends one request to the running instance and returns its reply, or None if there isn't one running.
+    Streamed records (e.g. from "measurements") are collected into the reply's "records" list.
+    """
+    if not hasattr(socket, "AF_UNIX"):
+        return None
+    records = []
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+            connection.settimeout(timeout)
+            connection.connect(socket_path())
+            connection.sendall(encode_message(message))
+            with connection.makefile("rb") as stream:
+                for line in stream:
+                    reply = json.loads(line)
+                    if "record" not in reply:
+                        break
+                    records.append(reply["record"])
+                else:
+                    return None
+    except socket.timeout:
+        # The request was delivered; only the confirmation is missing.
+        return {"ok": True, "warning": "no confirmation from the running instance"}
+    except (OSError, ValueError):
+        return None
+    if records:
+        reply["records"] = records
+    return reply
+
+
+def resident_command(argv: List[str]) -> Optional[str]:
+    """
+    The command after --resident (default "show"), or None if resident mode wasn't asked for. Reads argv the way
+    main's argparse parser does, without importing argparse; a value that isn't one of RESIDENT_COMMANDS also
+    gives None, so the launch goes on to that parser, which reports it.
+    """
+    for i, arg in enumerate(argv):
+        if arg == "--resident":
+            following = argv[i + 1] if i + 1 < len(argv) else ""
+            value = "show" if not following or following.startswith("-") else following.lower()
+        elif arg.startswith("--resident="):
+            value = arg.split("=", 1)[1].lower()
+        else:
+            continue
+        return value if value in RESIDENT_COMMANDS else None
+    return None
+
+
+def launch():
+    """
+    Console entry point. With --resident, first asks an already running instance to show the overlay (or reset
+    or stop it) and exits as soon as it confirms, skipping the PySide6 import and QApplication entirely.
+    Otherwise, or when no instance answers, starts PixelBox normally, which then becomes the resident instance.
+    """
+    command = resident_command(sys.argv)
+    if command is not None:
+        reply = send_request({"command": command})
+        if reply is not None:
+            if not reply.get("ok"):
+                sys.exit(f"pixelbox: {reply.get('error', 'request failed')}")
+            if reply.get("warning"):
+                print(f"pixelbox: {reply['warning']}")
+            elif command != "stop":
+                print(
+                    f"PixelBox visible after {STARTUP.elapsed_ms():.1f} ms (warm start; "
+                    f"{reply.get('server_ms', 0.0):.1f} ms in the resident instance)."
+                )
+            sys.exit()
+        if command == "stop":
+            sys.exit("pixelbox: no resident instance is running")
+
+    from pixelbox.main import main
+
+    main()
@@ -16,11 +16,13 @@ You should have received a copy of the GNU General Public License
 along with this program.  If not, see <https://www.gnu.org/licenses/>.
 """
 
+from collections import OrderedDict
 from importlib.resources import as_file, files
 from pathlib import Path
+from typing import Dict, Hashable, Optional, Tuple
 
 from PySide6.QtCore import Qt
-from PySide6.QtGui import QCursor
+from PySide6.QtGui import QCursor, QIcon, QPixmap
 from PySide6.QtWidgets import QApplication
 
 
@@ -50,17 +52,105 @@ def get_resource(*args: str) -> str:
         FileNotFoundError: If the resource does not exist.
         RuntimeError: If an error occurs while resolving the resource path.
     """
-    try:
-        # Base directory for resources in the package
-        base = files("pixelbox").joinpath("resources")
-
-        # Construct the resource path relative to the base
-        resource_path = base.joinpath(*args)
-
-        # Ensure the resource path is accessible as a file
-        with as_file(resource_path) as resolved_path:
-            return str(Path(resolved_path).resolve())  # Ensure the path is absolute
-    except FileNotFoundError:
-        raise FileNotFoundError(f"Resource not found: {'/'.join(args)}")
-    except Exception as e:
-        raise RuntimeError(f"Error accessing resource: {e}")
+    return RESOURCES.path(*args)
+
+
+class ResourceRegistry:
+    """
+    Resolves paths within 'pixelbox/resources' once, and decodes QPixmap/QIcon/QCursor objects lazily on
+    first use. Decoded objects are kept in a bounded LRU cache so repeated requests (e.g. the overlay
+    cursor on every enterEvent) never touch the disk. Hit/miss counts are kept to confirm that.
+    """
+
+    def __init__(self, max_entries: int = 32):
+        self.max_entries: int = max_entries
+        self._base: Optional[Path] = None
+        self._paths: Dict[Tuple[str, ...], str] = {}
+        self._objects: OrderedDict[Hashable, object] = OrderedDict()
+        self.hits: int = 0
+        self.misses: int = 0
+        self.disk_loads: int = 0
+
+    def _resolve_base(self) -> Path:
+        try:
+            # Base directory for resources in the package
+            base = files("pixelbox").joinpath("resources")
+
+            # Ensure the resource path is accessible as a file
+            with as_file(base) as resolved_path:
+                return Path(resolved_path).resolve()  # Ensure the path is absolute
+        except FileNotFoundError:
+            raise FileNotFoundError("Resource directory not found: pixelbox/resources")
+        except Exception as e:
+            raise RuntimeError(f"Error accessing resource: {e}")
+
+    def path(self, *args: str) -> str:
+        resolved = self._paths.get(args)
+        if resolved is None:
+            if self._base is None:
+                self._base = self._resolve_base()
+            resolved = str(self._base.joinpath(*args))
+            self._paths[args] = resolved
+        return resolved
+
+    def _cached(self, key: Hashable):
+        obj = self._objects.get(key)
+        if obj is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._objects.move_to_end(key)
+        return obj
+
+    def _store(self, key: Hashable, obj):
+        self._objects[key] = obj
+        if len(self._objects) > self.max_entries:
+            self._objects.popitem(last=False)
+        return obj
+
+    def pixmap(self, name: str) -> QPixmap:
+        key = ("pixmap", name)
+        pixmap = self._cached(key)
+        if pixmap is None:
+            self.disk_loads += 1
+            pixmap = self._store(key, QPixmap(self.path(name)))
+        return pixmap
+
+    def icon(self, name: str) -> QIcon:
+        key = ("icon", name)
+        icon = self._cached(key)
+        if icon is None:
+            icon = self._store(key, QIcon(self.pixmap(name)))
+        return icon
+
+    def cursor(
+        self,
+        name: str,
+        size: int,
+        hotspot_x: int,
+        hotspot_y: int,
+        fallback: Qt.CursorShape = Qt.CursorShape.PointingHandCursor,
+    ) -> QCursor:
+        """A cursor made from an image scaled to size x size, or the fallback shape if the image fails to load."""
+        key = ("cursor", name, size, hotspot_x, hotspot_y)
+        cursor = self._cached(key)
+        if cursor is None:
+            pixmap = self.pixmap(name)
+            if pixmap.isNull():
+                cursor = QCursor(fallback)
+            else:
+                pixmap = pixmap.scaled(
+                    size,
+                    size,
+                    Qt.AspectRatioMode.KeepAspectRatio,
+                    Qt.TransformationMode.SmoothTransformation,
+                )
+                cursor = QCursor(pixmap, hotspot_x, hotspot_y)
+            self._store(key, cursor)
+        return cursor
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "disk_loads": self.disk_loads, "cached": len(self._objects)}
+
+
+RESOURCES = ResourceRegistry()
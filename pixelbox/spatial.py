@@ -0,0 +1,128 @@
+"""
+PixelBox
+Copyright (C) 2025 Travis L. Seymour, PhD
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+from typing import Dict, Iterator, List, Set, Tuple
+
+from PySide6.QtCore import QPoint, QRect
+from PySide6.QtGui import QRegion
+
+Bounds = Tuple[int, int, int, int]  # left, top, right, bottom (inclusive, like QRect)
+
+
+class GridIndex:
+    """
+    Uniform-grid spatial index mapping integer keys to bounding rects.
+
+    Each key is stored in every cell its bounds overlap, so area and point queries only look at
+    the few cells under the query instead of every stored rect. Query results are returned in
+    ascending key order, which for the overlay is the order boxes were drawn in.
+    """
+
+    def __init__(self, cell_size: int = 128):
+        self.cell_size: int = cell_size
+        self._bounds: Dict[int, Bounds] = {}
+        self._cells: Dict[Tuple[int, int], Set[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._bounds)
+
+    def __contains__(self, key: int) -> bool:
+        return key in self._bounds
+
+    def _cell_range(self, bounds: Bounds) -> Iterator[Tuple[int, int]]:
+        left, top, right, bottom = bounds
+        size = self.cell_size
+        for cx in range(left // size, right // size + 1):
+            for cy in range(top // size, bottom // size + 1):
+                yield cx, cy
+
+    def insert(self, key: int, rect: QRect):
+        if key in self._bounds:
+            self.remove(key)
+        bounds = (rect.left(), rect.top(), rect.right(), rect.bottom())
+        self._bounds[key] = bounds
+        for cell in self._cell_range(bounds):
+            self._cells.setdefault(cell, set()).add(key)
+
+    def remove(self, key: int):
+        bounds = self._bounds.pop(key, None)
+        if bounds is None:
+            return
+        for cell in self._cell_range(bounds):
+            keys = self._cells.get(cell)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._cells[cell]
+
+    def clear(self):
+        self._bounds.clear()
+        self._cells.clear()
+
+    def bounds(self, key: int) -> QRect:
+        left, top, right, bottom = self._bounds[key]
+        return QRect(QPoint(left, top), QPoint(right, bottom))
+
+    def _candidates(self, bounds: Bounds) -> Set[int]:
+        found: Set[int] = set()
+        for cell in self._cell_range(bounds):
+            keys = self._cells.get(cell)
+            if keys:
+                found.update(keys)
+        return found
+
+    def crowded(self, rect: QRect, limit: int) -> bool:
+        """Whether the cells under rect hold more than limit entries in total; counts only, no keys are visited."""
+        left, top, right, bottom = rect.left(), rect.top(), rect.right(), rect.bottom()
+        cells = self._cells
+        total = 0
+        for cell in self._cell_range((left, top, right, bottom)):
+            keys = cells.get(cell)
+            if keys:
+                total += len(keys)
+                if total > limit:
+                    return True
+        return False
+
+    def query(self, rect: QRect) -> List[int]:
+        """Returns the keys whose bounds intersect rect, in ascending key order."""
+        if rect.isEmpty():
+            return []
+        left, top, right, bottom = rect.left(), rect.top(), rect.right(), rect.bottom()
+        stored = self._bounds
+        hits = [
+            key
+            for key in self._candidates((left, top, right, bottom))
+            if (b := stored[key])[0] <= right and b[2] >= left and b[1] <= bottom and b[3] >= top
+        ]
+        hits.sort()
+        return hits
+
+    def query_region(self, region: QRegion) -> List[int]:
+        """Returns the keys whose bounds intersect any rect of region, in ascending key order."""
+        rects = list(region)
+        if len(rects) == 1:
+            return self.query(rects[0])
+        found: Set[int] = set()
+        for rect in rects:
+            found.update(self.query(rect))
+        return sorted(found)
+
+    def query_point(self, point: QPoint) -> List[int]:
+        """Returns the keys whose bounds contain point, in ascending key order."""
+        return self.query(QRect(point.x(), point.y(), 1, 1))
@@ -0,0 +1,64 @@
+"""
+PixelBox
+Copyright (C) 2025 Travis L. Seymour, PhD
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import random
+import time
+from typing import List
+
+from PySide6.QtCore import QRect
+
+DEFAULT_STRESS_BOXES = 20_000
+
+
+class PaintTimer:
+    """Context manager wrapped around each paintEvent; prints a summary every `report_every` frames."""
+
+    def __init__(self, report_every: int = 60):
+        self.report_every: int = report_every
+        self.samples: List[float] = []
+        self._started: float = 0.0
+
+    def __enter__(self):
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.samples.append((time.perf_counter() - self._started) * 1000.0)
+        if len(self.samples) >= self.report_every:
+            self.report()
+            self.samples.clear()
+        return False
+
+    def report(self):
+        samples = sorted(self.samples)
+        median = samples[len(samples) // 2]
+        p95 = samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+        print(f"paint: {len(samples)} frames, median {median:.2f} ms, p95 {p95:.2f} ms, max {samples[-1]:.2f} ms")
+
+
+def populate_random_boxes(overlay, count: int = DEFAULT_STRESS_BOXES, seed: int = 0):
+    """Fills the overlay with `count` randomly placed small boxes, keeping the paint index in sync."""
+    rng = random.Random(seed)
+    area: QRect = overlay.rect()
+    for _ in range(count):
+        width = rng.randint(8, 160)
+        height = rng.randint(8, 120)
+        x = rng.randint(area.left(), max(area.left(), area.right() - width))
+        y = rng.randint(area.top(), max(area.top(), area.bottom() - height))
+        overlay.add_box(QRect(x, y, width, height))
+    overlay.update()
@@ -17,20 +17,34 @@ along with this program.  If not, see <https://www.gnu.org/licenses/>.
 """
 
 import os
-from importlib.metadata import version
-import tomli
+from functools import lru_cache
 
 
 def get_version_from_pyproject():
+    # tomli is only needed when running from a source checkout, so it's not imported at startup.
+    import tomli
+
     pyproject_path = os.path.join(os.path.dirname(__file__), "..", "pyproject.toml")
     with open(pyproject_path, "rb") as f:
         pyproject_data = tomli.load(f)
         return pyproject_data.get("project", {}).get("version", "Unknown")
 
 
-try:
-    # Try to get version from installed package
-    __version__ = version("pixelbox")
-except:
-    # Fallback: Read version from pyproject.toml during development
-    __version__ = get_version_from_pyproject()
+@lru_cache(maxsize=None)
+def get_version() -> str:
+    """Resolved on first use rather than at import, since the package metadata lookup is not free."""
+    from importlib.metadata import version
+
+    try:
+        # Try to get version from installed package
+        return version("pixelbox")
+    except:
+        # Fallback: Read version from pyproject.toml during development
+        return get_version_from_pyproject()
+
+
+def __getattr__(name: str):
+    # Keeps `from pixelbox.version import __version__` working, while resolving it lazily.
+    if name == "__version__":
+        return get_version()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
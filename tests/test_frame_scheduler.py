@@ -0,0 +1,45 @@
+"""
+PixelBox
+Copyright (C) 2025 Travis L. Seymour, PhD
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+from pixelbox.frame_scheduler import FrameScheduler
+
+
+def test_requests_between_ticks_make_one_frame(qapp):
+    frames = []
+    scheduler = FrameScheduler(lambda: frames.append(None))
+    for _ in range(100):
+        scheduler.request_frame()
+    # The first request is served at once; the rest wait for the next tick.
+    assert (scheduler.requests, scheduler.frames, len(frames)) == (100, 1, 1)
+    scheduler._tick()
+    assert (scheduler.frames, scheduler.coalesced) == (2, 98)
+    scheduler._tick()
+    assert scheduler.frames == 2
+    scheduler.cancel()
+
+
+def test_follows_the_screens_refresh_rate(qapp):
+    screen = qapp.primaryScreen()
+    scheduler = FrameScheduler(lambda: None)
+    scheduler.follow_screen(screen)
+    screen.refreshRateChanged.emit(120.0)
+    assert scheduler.refresh_rate == 120.0
+    assert scheduler._timer.interval() == 8
+    scheduler.follow_screen(None)
+    screen.refreshRateChanged.emit(30.0)
+    assert scheduler.refresh_rate == 120.0
@@ -0,0 +1,65 @@
+"""
+PixelBox
+Copyright (C) 2025 Travis L. Seymour, PhD
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+from collections import deque
+
+import pytest
+
+from pixelbox.imageops import component_boxes
+
+np = pytest.importorskip("numpy")
+
+
+def flood_fill_boxes(mask, diagonal: bool):
+    """Reference implementation: one breadth-first flood fill per region, in row-major order of first pixels."""
+    height, width = mask.shape
+    seen = np.zeros_like(mask)
+    neighbours = [(dy, dx) for dy in (-1, 0, 1) for dx in (-1, 0, 1) if (dy or dx) and (diagonal or not (dy and dx))]
+    boxes = []
+    for y in range(height):
+        for x in range(width):
+            if not mask[y, x] or seen[y, x]:
+                continue
+            seen[y, x] = True
+            pending = deque([(y, x)])
+            ys, xs = [], []
+            while pending:
+                cy, cx = pending.popleft()
+                ys.append(cy)
+                xs.append(cx)
+                for dy, dx in neighbours:
+                    ny, nx = cy + dy, cx + dx
+                    if 0 <= ny < height and 0 <= nx < width and mask[ny, nx] and not seen[ny, nx]:
+                        seen[ny, nx] = True
+                        pending.append((ny, nx))
+            boxes.append((min(xs), min(ys), max(xs) - min(xs) + 1, max(ys) - min(ys) + 1))
+    return boxes
+
+
+@pytest.mark.parametrize("diagonal", [True, False])
+def test_component_boxes_match_flood_fill(diagonal):
+    rng = np.random.default_rng(1)
+    for _ in range(300):
+        height, width = rng.integers(1, 30, 2)
+        mask = rng.random((height, width)) < rng.random()
+        boxes = [tuple(box) for box in component_boxes(mask, diagonal).tolist()]
+        assert boxes == flood_fill_boxes(mask, diagonal)
+
+
+def test_component_boxes_of_an_empty_mask():
+    assert component_boxes(np.zeros((5, 7), dtype=bool)).shape == (0, 4)
@@ -0,0 +1,147 @@
+"""
+PixelBox
+Copyright (C) 2025 Travis L. Seymour, PhD
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import io
+import random
+
+from pixelbox.boxstore import BoxStore
+from pixelbox.journal import ADD, CLEAR, JOURNAL_FILE, REDO, UNDO, SessionJournal
+
+
+def contents(store: BoxStore):
+    """Everything a store holds, history included, in comparable form."""
+    columns = (store.x, store.y, store.w, store.h, store.created, store._undo, store._redo)
+    return store.start, store.end, [list(column) for column in columns]
+
+
+def apply(store: BoxStore, op: int, x: int = 0, y: int = 0, w: int = 0, h: int = 0, created: float = 0):
+    if op == ADD:
+        store.append_geometry(x, y, w, h, created)
+    elif op == UNDO:
+        store.undo()
+    elif op == REDO:
+        store.redo()
+    elif op == CLEAR:
+        store.clear()
+
+
+def random_edits(rng: random.Random, count: int):
+    for _ in range(count):
+        op = rng.choice((ADD, ADD, ADD, UNDO, UNDO, REDO, CLEAR))
+        yield op, rng.randint(-50, 3000), rng.randint(-50, 2000), rng.randint(1, 400), rng.randint(1, 400), rng.random()
+
+
+class Session:
+    """Boxes per screen, edited the way the overlays do it: each change is applied and then journaled."""
+
+    def __init__(self, directory):
+        self.stores = {}
+        self.journal = SessionJournal(directory, self.state)
+
+    def state(self):
+        return [(name, store.copy()) for name, store in self.stores.items()]
+
+    def edit(self, screen_name: str, op: int, *args):
+        apply(self.stores.setdefault(screen_name, BoxStore()), op, *args)
+        self.journal.record(op, screen_name, *args)
+
+    def crash(self):
+        """Stops the writer without the final compaction a clean exit does."""
+        self.journal.queue.put(None)
+        self.journal.thread.join()
+
+
+def loaded(directory):
+    return {name: contents(store) for name, store in SessionJournal(directory, list).load()}
+
+
+def test_boxstore_roundtrip_keeps_undo_and_redo_history():
+    rng = random.Random(0)
+    for _ in range(50):
+        store = BoxStore()
+        for edit in random_edits(rng, rng.randint(0, 60)):
+            apply(store, *edit)
+        stream = io.BytesIO()
+        store.write_to(stream)
+        stream.write(b"trailing")
+        copy, offset = BoxStore.read_from(memoryview(stream.getvalue()))
+        assert offset == len(stream.getvalue()) - len(b"trailing")
+        assert contents(copy) == contents(store)
+        # The copy undoes and redoes exactly like the original.
+        while store.can_undo:
+            assert copy.undo() == store.undo()
+        while store.can_redo:
+            assert copy.redo() == store.redo()
+        assert contents(copy) == contents(store)
+
+
+def test_snapshot_plus_journal_roundtrip(tmp_path):
+    rng = random.Random(1)
+    session = Session(tmp_path)
+    for index, edit in enumerate(random_edits(rng, 400)):
+        session.edit(rng.choice(("HDMI-1", "DP-1")), *edit)
+        if index == 250:
+            session.journal.compact()
+    session.crash()
+    assert loaded(tmp_path) == {name: contents(store) for name, store in session.stores.items()}
+
+    # A clean exit folds everything into the snapshot.
+    resumed = Session(tmp_path)
+    resumed.stores = dict(resumed.journal.load())
+    for edit in random_edits(rng, 100):
+        resumed.edit("DP-1", *edit)
+    resumed.journal.close()
+    assert loaded(tmp_path) == {name: contents(store) for name, store in resumed.stores.items()}
+
+
+def test_boxes_resumed_onto_another_screen_survive_compaction(tmp_path):
+    session = Session(tmp_path)
+    for x in range(3):
+        session.edit("HDMI-1", ADD, x * 50, 10, 40, 40, 1.0)
+    session.journal.close()
+
+    # Resumed on a machine where HDMI-1 is gone: its boxes now belong to DP-1, which hasn't journaled anything.
+    resumed = Session(tmp_path)
+    ((_, store),) = resumed.journal.load()
+    resumed.stores = {"DP-1": store}
+    resumed.journal.compact()
+    resumed.journal.close()
+
+    session = SessionJournal(tmp_path, list).load()
+    assert [(name, len(store)) for name, store in session] == [("HDMI-1", 0), ("DP-1", 3)]
+
+
+def test_long_screen_names_survive_the_journal(tmp_path):
+    # Longer than a record, multi-byte throughout, and identical for their first 63 bytes.
+    names = ["Écran intégré — " + "Δ" * 20 + " (gauche)", "Écran intégré — " + "Δ" * 20 + " (droite)"]
+    session = Session(tmp_path)
+    for index, name in enumerate(names):
+        session.edit(name, ADD, 10 * index, 20, 30, 40, 1.0)
+        session.edit(name, ADD, 10 * index, 80, 30, 40, 2.0)
+        session.edit(name, UNDO)
+    session.edit(names[1], REDO)
+    session.crash()
+    expected = {name: contents(store) for name, store in session.stores.items()}
+    assert loaded(tmp_path) == expected
+
+    # A crash while the second name was being written loses that screen, not the session.
+    journal = tmp_path / JOURNAL_FILE
+    data = journal.read_bytes()
+    second = data.rindex(names[1].encode("utf-8"))
+    journal.write_bytes(data[: second + 10])
+    assert loaded(tmp_path) == {names[0]: expected[names[0]]}
@@ -0,0 +1,78 @@
+"""
+PixelBox
+Copyright (C) 2025 Travis L. Seymour, PhD
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import random
+
+import pytest
+from PySide6.QtCore import QRect
+from PySide6.QtGui import QFont
+
+from pixelbox import label_layout
+from pixelbox.label_layout import CROWDED_LABELS, MAX_LAID_OUT, LabelLayout
+from pixelbox.render import BoxRenderer
+from pixelbox.spatial import GridIndex
+
+
+@pytest.fixture
+def layout_factory(qapp):
+    def make() -> LabelLayout:
+        layout = LabelLayout(BoxRenderer(QFont()))
+        layout.bounds = QRect(0, 0, 1920, 1080)
+        return layout
+
+    return make
+
+
+def random_boxes(count: int, seed: int = 0):
+    rng = random.Random(seed)
+    for _ in range(count):
+        w, h = rng.randint(8, 160), rng.randint(8, 120)
+        yield QRect(rng.randint(0, 1920 - w), rng.randint(0, 1080 - h), w, h)
+
+
+def test_labels_avoid_each_other(layout_factory):
+    layout = layout_factory()
+    first = layout.add(0, QRect(100, 100, 200, 100))
+    # Same size, a few pixels lower: the usual spot would cover the first label.
+    second = layout.add(1, QRect(100, 104, 200, 100))
+    assert not first.intersects(second)
+
+
+def test_layout_work_is_bounded_per_label(layout_factory, monkeypatch):
+    """Placing a label examines a bounded number of placed labels, however many boxes there are."""
+    examined = [0]
+    candidates = GridIndex._candidates
+
+    def counting(index, bounds):
+        found = candidates(index, bounds)
+        examined[0] += len(found)
+        return found
+
+    monkeypatch.setattr(label_layout.GridIndex, "_candidates", counting)
+    costs = {}
+    for count in (MAX_LAID_OUT // 2, MAX_LAID_OUT, 20 * MAX_LAID_OUT):
+        layout = layout_factory()
+        examined[0] = 0
+        for key, rect in enumerate(random_boxes(count)):
+            layout.add(key, rect)
+        assert len(layout.labels) == count
+        costs[count] = examined[0]
+    # Each query is skipped once its cells hold more than CROWDED_LABELS labels, and a label tries about a dozen spots.
+    assert costs[MAX_LAID_OUT] <= MAX_LAID_OUT * 12 * CROWDED_LABELS
+    # Beyond MAX_LAID_OUT, new labels cost nothing to place.
+    assert costs[20 * MAX_LAID_OUT] == costs[MAX_LAID_OUT]
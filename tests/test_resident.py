@@ -0,0 +1,46 @@
+"""
+PixelBox
+Copyright (C) 2025 Travis L. Seymour, PhD
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import pytest
+
+from pixelbox.main import parse_args
+from pixelbox.resident import resident_command
+
+
+@pytest.mark.parametrize(
+    "arguments",
+    [
+        [],
+        ["--resident"],
+        ["--resident", "--control"],
+        ["stress", "--resident"],
+        ["--resident", "STOP"],
+        ["--resident=Reset"],
+        ["--resident", "foo"],
+        ["--resident", "stress"],
+        ["--resident=foo"],
+        ["--resident="],
+    ],
+)
+def test_warm_launch_reads_resident_like_the_full_parser(arguments):
+    argv = ["pixelbox", *arguments]
+    try:
+        expected = parse_args(argv).resident
+    except SystemExit:
+        expected = None  # The full parser rejects it, so the warm path must leave it to that parser.
+    assert resident_command(argv) == expected